@@ -1,2 +1,12 @@
 # Phase III Backend Package
 # Contains: models, repositories, mcp tools, agent layer
+#
+# Phase II is imported as the top-level "app" package (READ-ONLY usage).
+# Its path is added here, once, so every Phase III module can import it.
+
+import sys
+from pathlib import Path
+
+_phase2_path = Path(__file__).resolve().parent.parent.parent / "phase2" / "backend"
+if str(_phase2_path) not in sys.path:
+    sys.path.insert(0, str(_phase2_path))
@@ -4,14 +4,33 @@
 # AI agent for natural language task management.
 # Stateless execution with MCP tools ONLY.
 
+from .admission import ModelAdmission, ModelOverloadedError, TokenBucket, MODEL_ADMISSION
 from .config import AGENT_CONFIG, SYSTEM_PROMPT
+from .context import ContextBuilder, ContextWindow, estimate_tokens
 from .executor import AgentExecutor
+from .intent_router import IntentRouter, Intent, FAST_PATH_METRICS
+from .prompt import HistoryContentCache, HISTORY_CONTENT_CACHE
+from .response_cache import ResponseCache, RESPONSE_CACHE
 from .result import AgentResult, ToolCallRecord
 
 __all__ = [
+    "ModelAdmission",
+    "ModelOverloadedError",
+    "TokenBucket",
+    "MODEL_ADMISSION",
     "AGENT_CONFIG",
     "SYSTEM_PROMPT",
+    "ContextBuilder",
+    "ContextWindow",
+    "estimate_tokens",
     "AgentExecutor",
+    "IntentRouter",
+    "Intent",
+    "FAST_PATH_METRICS",
+    "HistoryContentCache",
+    "HISTORY_CONTENT_CACHE",
+    "ResponseCache",
+    "RESPONSE_CACHE",
     "AgentResult",
     "ToolCallRecord",
 ]
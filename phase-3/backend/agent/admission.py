@@ -0,0 +1,314 @@
+# Model Admission Control
+# Spec: agent.spec.md Section 10
+#
+# Every Gemini call goes through MODEL_ADMISSION:
+#   1. Single-flight: identical in-flight prompts share one call
+#   2. Concurrency: at most MODEL_MAX_CONCURRENCY calls per process
+#   3. Rate: a token bucket of MODEL_RATE_PER_SECOND (burst MODEL_RATE_BURST)
+#   4. Retries: 429/5xx/connection errors are retried with full-jitter
+#      exponential backoff, honouring Retry-After
+#
+# A call that cannot get a slot and a token within the queue timeout is
+# rejected with ModelOverloadedError (the router answers 503 + Retry-After)
+# instead of piling more load onto the provider. The blocking SDK call runs
+# in a worker thread so waiting requests never stall the event loop.
+
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, List
+
+from .config import (
+    MODEL_RATE_PER_SECOND,
+    MODEL_RATE_BURST,
+    MODEL_MAX_CONCURRENCY,
+    MODEL_QUEUE_TIMEOUT_SECONDS,
+    MODEL_MAX_RETRIES,
+    MODEL_RETRY_BASE_SECONDS,
+    MODEL_RETRY_MAX_SECONDS,
+)
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Wait-time samples kept for percentiles
+_WAIT_SAMPLES = 1024
+
+
+class ModelOverloadedError(Exception):
+    """A model call was not admitted within the queue timeout."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limiting, transient server errors and connection failures."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+
+    import requests  # Transport used by the Gemini SDK
+
+    return isinstance(
+        error,
+        (
+            ConnectionError,
+            TimeoutError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ),
+    )
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read a Retry-After header (seconds) from an SDK error, if present."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def prompt_key(model: str, contents: List[Any], config: Any) -> str:
+    """Hash a model request; identical requests get identical keys."""
+    digest = hashlib.sha256(model.encode("utf-8"))
+    digest.update(str(id(config)).encode("ascii"))
+    for content in contents:
+        digest.update(content.model_dump_json(exclude_none=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    reserve() always takes a token and returns how long the caller must
+    wait for it (the balance may go negative), so concurrent callers are
+    served in arrival order without polling.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self._rate = rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token; return seconds until it is available."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def release(self) -> None:
+        """Give back a reserved token that will not be used."""
+        with self._lock:
+            self._tokens = min(self._capacity, self._tokens + 1)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class ModelAdmission:
+    """
+    Admission control for blocking model-client calls.
+
+    Per-process: with several workers, the provider sees up to
+    workers x rate_per_second.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = MODEL_RATE_PER_SECOND,
+        burst: int = MODEL_RATE_BURST,
+        max_concurrency: int = MODEL_MAX_CONCURRENCY,
+        queue_timeout: float = MODEL_QUEUE_TIMEOUT_SECONDS,
+        max_retries: int = MODEL_MAX_RETRIES,
+        retry_base_seconds: float = MODEL_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = MODEL_RETRY_MAX_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize admission control.
+
+        Args:
+            rate_per_second: Sustained model calls per second
+            burst: Calls allowed back-to-back before rate limiting applies
+            max_concurrency: Model calls in flight at once
+            queue_timeout: Longest a call waits for a slot and a token
+            max_retries: Retries after the first attempt
+            retry_base_seconds: Backoff cap for the first retry (doubles per retry)
+            retry_max_seconds: Upper bound for any single backoff
+            clock: Monotonic time source (injectable for benchmarks)
+        """
+        self._bucket = TokenBucket(rate_per_second, burst, clock)
+        self._max_concurrency = max_concurrency
+        self._queue_timeout = queue_timeout
+        self._max_retries = max_retries
+        self._retry_base = retry_base_seconds
+        self._retry_max = retry_max_seconds
+        self._clock = clock
+
+        # asyncio primitives are bound to the loop that first uses them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+        self._waits: "deque[float]" = deque(maxlen=_WAIT_SAMPLES)
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._inflight = {}
+
+    async def generate_content(self, client: Any, model: str, contents: List[Any], config: Any) -> Any:
+        """
+        Admit and run client.models.generate_content.
+
+        Raises:
+            ModelOverloadedError: If not admitted within the queue timeout
+            Exception: The SDK error once retries are exhausted
+        """
+        return await self.call(
+            lambda: client.models.generate_content(model=model, contents=contents, config=config),
+            key=prompt_key(model, contents, config),
+        )
+
+    async def call(self, fn: Callable[[], Any], key: Optional[str] = None) -> Any:
+        """
+        Run a blocking call under admission control.
+
+        Args:
+            fn: Zero-argument blocking callable
+            key: Coalescing key; concurrent calls with the same key share
+                one execution (None disables coalescing)
+
+        Returns:
+            fn's return value
+        """
+        self._bind_loop()
+
+        if key is not None:
+            leader = self._inflight.get(key)
+            if leader is not None:
+                self.coalesced += 1
+                return await asyncio.shield(leader)
+
+        task = asyncio.ensure_future(self._run(fn))
+        if key is not None:
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one cancelled waiter does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def _run(self, fn: Callable[[], Any]) -> Any:
+        enqueued = self._clock()
+        deadline = enqueued + self._queue_timeout
+
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self._queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise ModelOverloadedError(
+                    "No model capacity within the queue timeout",
+                    retry_after=self._queue_timeout,
+                )
+            try:
+                await self._take_token(deadline)
+            except ModelOverloadedError:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        self._waits.append(self._clock() - enqueued)
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                try:
+                    return await asyncio.to_thread(fn)
+                except Exception as error:
+                    if attempt >= self._max_retries or not is_retryable(error):
+                        self.failures += 1
+                        raise
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt, error))
+                    attempt += 1
+                    await self._take_token(None)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _take_token(self, deadline: Optional[float]) -> None:
+        """Wait for a rate-limit token, giving up at deadline."""
+        wait = self._bucket.reserve()
+        if wait <= 0:
+            return
+        if deadline is not None and self._clock() + wait > deadline:
+            self._bucket.release()
+            self.rejected += 1
+            raise ModelOverloadedError("Model rate limit reached", retry_after=wait)
+        await asyncio.sleep(wait)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, at least the server's Retry-After."""
+        delay = random.random() * min(self._retry_max, self._retry_base * (2 ** attempt))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._retry_max))
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return queue depth, wait-time percentiles and counters."""
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p / 100 * len(waits)))] * 1000, 2)
+
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "failures": self.failures,
+            "tokens_available": round(self._bucket.available, 2),
+            "wait_ms": {"p50": pct(50), "p95": pct(95), "max": pct(100)},
+        }
+
+
+MODEL_ADMISSION = ModelAdmission()
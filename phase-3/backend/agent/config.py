@@ -4,6 +4,8 @@
 # Agent identity, model settings, and system prompt.
 # Updated for Google Gemini API
 
+import os
+
 # Agent Configuration
 AGENT_CONFIG = {
     "name": "TodoAssistant",
@@ -18,9 +20,11 @@ SYSTEM_PROMPT = """You are TodoAssistant, a helpful AI that manages the user's t
 ## Your Capabilities (via tools)
 - add_task: Create new tasks
 - list_tasks: View tasks (all, pending, or completed)
+- search_tasks: Find the tasks that best match a description
 - complete_task: Mark tasks as done
 - delete_task: Remove tasks
 - update_task: Modify task title or description
+- complete_tasks, delete_tasks, update_tasks: The same actions for several tasks in one call
 
 ## Behavioral Rules
 1. ALWAYS use tools to access or modify tasks. Never guess task data.
@@ -33,14 +37,17 @@ SYSTEM_PROMPT = """You are TodoAssistant, a helpful AI that manages the user's t
 
 ## Tool Chaining Rules
 When the user's request requires multiple operations:
-1. First use list_tasks to find the relevant task(s)
+1. First find the relevant task(s): search_tasks when the user describes a task
+   ("my grocery task"), list_tasks (compact=true) when they mean a whole group
 2. Then perform the requested action (complete, delete, update)
+   - When more than one task is affected, use the batch tool once
+     (complete_tasks, delete_tasks, update_tasks) instead of one call per task
 3. Confirm what was done with specific task details
 
 Examples of chained operations:
-- "Delete my grocery task" → list_tasks → find task → delete_task
-- "Complete all my tasks" → list_tasks → complete_task for each
-- "What tasks do I have about shopping?" → list_tasks → filter and report
+- "Delete my grocery task" → search_tasks with query="grocery" → delete_task
+- "Complete all my tasks" → list_tasks → complete_tasks with every ID
+- "What tasks do I have about shopping?" → list_tasks with query="shopping" → report
 
 ## Response Style
 - Be concise but friendly
@@ -63,7 +70,7 @@ Response: "Here are your tasks:
 3. Finish report (pending) - #45"
 
 User: "Mark the milk task as done"
-Assistant: [calls list_tasks to find task, then complete_task]
+Assistant: [calls search_tasks with query="milk", then complete_task]
 Response: "Got it! I've marked 'Buy milk' (#42) as complete."
 
 User: "Delete task 45"
@@ -71,8 +78,63 @@ Assistant: [calls delete_task with task_id=45]
 Response: "Done! I've removed 'Finish report' (#45) from your list."
 """
 
-# Maximum conversation history to include in context
-MAX_HISTORY_MESSAGES = 20
+# Context window management per agent.spec.md Section 8.2
+# History is packed newest-to-oldest until the token budget is spent.
+CONTEXT_TOKEN_BUDGET = 3000
+
+# Tokens reserved inside the budget for the rolling conversation summary
+SUMMARY_MAX_TOKENS = 256
+
+# Minimum number of evicted messages before a new summary is generated.
+# Batching evictions keeps summarization off most turns; until enough
+# have accumulated they stay in the context window.
+SUMMARY_MIN_EVICTED_MESSAGES = 6
+
+# Newest unsummarized messages loaded per turn (live rows, then archive
+# blocks). Bounds hydration for long conversations without a summary;
+# anything older is never loaded or summarized.
+HISTORY_MAX_MESSAGES = 200
+
+# Prompt used to fold evicted turns into the rolling summary
+SUMMARY_PROMPT = """Summarize the conversation below between a user and TodoAssistant.
+Keep task IDs, task titles, and any user preferences or pending questions.
+Write at most a few short sentences. Do not invent details.
+
+Previous summary:
+{previous_summary}
+
+Conversation:
+{transcript}
+"""
+
+# Tools that never modify tasks. Turns that only call these tools are
+# eligible for the response cache.
+READ_ONLY_TOOLS = frozenset({"list_tasks", "search_tasks"})
+
+# Response cache for idempotent read-only turns
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+RESPONSE_CACHE_TTL_SECONDS = 300
+
+# Conversations whose converted history Contents are kept per process
+PROMPT_CACHE_MAX_CONVERSATIONS = 1024
+
+# Admission control for model calls (per worker process)
+# Token bucket: sustained calls per second and burst size
+MODEL_RATE_PER_SECOND = 10.0
+MODEL_RATE_BURST = 20
+
+# Concurrent model calls, and how long a call may wait for a slot/token
+MODEL_MAX_CONCURRENCY = 8
+MODEL_QUEUE_TIMEOUT_SECONDS = 10.0
+
+# Retries on 429/5xx/connection errors: full-jitter exponential backoff
+MODEL_MAX_RETRIES = 3
+MODEL_RETRY_BASE_SECONDS = 0.5
+MODEL_RETRY_MAX_SECONDS = 8.0
+
+# Build the Gemini client and prompt config in a background thread at
+# startup instead of on the first chat request (AGENT_WARM_UP=0 disables)
+AGENT_WARM_UP = os.environ.get("AGENT_WARM_UP", "1") != "0"
 
 # Tool definitions for Gemini format (function declarations)
 TOOL_DEFINITIONS = [
@@ -101,7 +163,11 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "list_tasks",
-            "description": "List tasks for the user, optionally filtered by status",
+            "description": (
+                "List tasks for the user, optionally filtered by status or text. "
+                "Use compact=true when only IDs and titles are needed "
+                "(e.g. to find a task before completing or deleting it)"
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -111,6 +177,44 @@ TOOL_DEFINITIONS = [
                         "default": "all",
                         "description": "Filter by task status",
                     },
+                    "query": {
+                        "type": "string",
+                        "description": "Only tasks whose title or description contains this text",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of tasks to return (1-100), newest first",
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Return only id, title and completed for each task",
+                    },
+                },
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_tasks",
+            "description": (
+                "Find the user's tasks that best match some words, best match first. "
+                "Use this to locate a task the user describes instead of listing every task"
+            ),
+            "parameters": {
+                "type": "object",
+                "required": ["query"],
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Words describing the task, e.g. 'grocery'",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "default": 5,
+                        "description": "Maximum number of matches (1-20)",
+                    },
                 },
             },
         },
@@ -174,4 +278,75 @@ TOOL_DEFINITIONS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "complete_tasks",
+            "description": "Mark several tasks as complete in one call",
+            "parameters": {
+                "type": "object",
+                "required": ["task_ids"],
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "IDs of the tasks to mark as complete (up to 100)",
+                    },
+                },
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "delete_tasks",
+            "description": "Delete several tasks in one call",
+            "parameters": {
+                "type": "object",
+                "required": ["task_ids"],
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "IDs of the tasks to delete (up to 100)",
+                    },
+                },
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "update_tasks",
+            "description": "Update the title or description of several tasks in one call",
+            "parameters": {
+                "type": "object",
+                "required": ["updates"],
+                "properties": {
+                    "updates": {
+                        "type": "array",
+                        "description": "One entry per task to update (up to 100)",
+                        "items": {
+                            "type": "object",
+                            "required": ["task_id"],
+                            "properties": {
+                                "task_id": {
+                                    "type": "integer",
+                                    "description": "ID of the task to update",
+                                },
+                                "title": {
+                                    "type": "string",
+                                    "description": "New task title",
+                                },
+                                "description": {
+                                    "type": "string",
+                                    "description": "New task description",
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
 ]
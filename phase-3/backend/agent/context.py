@@ -0,0 +1,140 @@
+# Context Window Builder
+# Spec: agent.spec.md Section 8.2
+#
+# Packs conversation history into a token budget, newest to oldest.
+# Messages that no longer fit are reported as evicted so the executor
+# can fold them into the conversation's rolling summary.
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Sequence
+
+from .config import CONTEXT_TOKEN_BUDGET, SUMMARY_MAX_TOKENS, SUMMARY_MIN_EVICTED_MESSAGES
+
+# Word runs and single punctuation marks, roughly how BPE tokenizers split text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Average characters per token for long word runs
+_CHARS_PER_TOKEN = 4
+
+# Fixed cost of a message turn (role marker and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimate the token count of a text without calling the model.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate number of tokens
+    """
+    if not text:
+        return 0
+    return sum(
+        max(1, math.ceil(len(piece) / _CHARS_PER_TOKEN))
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def estimate_message_tokens(content: Optional[str]) -> int:
+    """Estimate the token count of one message, including turn overhead."""
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class ContextWindow:
+    """
+    Result of packing history into the token budget.
+
+    Transient, single request only (agent.spec.md Section 4.3).
+    """
+
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    """History messages that fit, in chronological order."""
+
+    evicted: List[Any] = field(default_factory=list)
+    """Older history rows that did not fit, in chronological order."""
+
+    tokens: int = 0
+    """Estimated tokens used by the packed messages."""
+
+
+class ContextBuilder:
+    """
+    Builds a token-budgeted context window from conversation history.
+
+    Fills the budget from the newest message backwards and stops at the
+    first message that does not fit, so the window is always a
+    contiguous suffix of the conversation. Fewer evictions than a
+    summary needs are carried in the window instead, over budget, so no
+    message leaves the context before it is summarized.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+        summary_reserve: int = SUMMARY_MAX_TOKENS,
+        min_evicted: int = SUMMARY_MIN_EVICTED_MESSAGES,
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            token_budget: Total tokens available for history and summary
+            summary_reserve: Tokens held back for the rolling summary
+            min_evicted: Fewest messages evicted at once (the summary batch)
+        """
+        self._token_budget = token_budget
+        self._summary_reserve = summary_reserve
+        self._min_evicted = min_evicted
+
+    def build(
+        self,
+        history: Sequence[Any],
+        summary: Optional[str] = None,
+    ) -> ContextWindow:
+        """
+        Pack history into the budget.
+
+        Args:
+            history: MessageDB rows in chronological order
+            summary: Existing rolling summary, if any
+
+        Returns:
+            ContextWindow with the packed messages and evicted rows
+        """
+        window = self._fill(history, self._token_budget)
+
+        # Room for the summary is only needed once something is left out
+        if summary or window.evicted:
+            window = self._fill(history, self._token_budget - self._summary_reserve)
+
+        # Too few to summarize yet: keep them until the batch is full
+        if 0 < len(window.evicted) < self._min_evicted:
+            window = self._fill(history, None)
+
+        return window
+
+    def _fill(self, history: Sequence[Any], budget: Optional[int]) -> ContextWindow:
+        used = 0
+        start = len(history)
+
+        for index in range(len(history) - 1, -1, -1):
+            cost = estimate_message_tokens(history[index].content)
+            if budget is not None and used + cost > budget:
+                break
+            used += cost
+            start = index
+
+        return ContextWindow(
+            messages=[
+                {"id": msg.id, "role": msg.role, "content": msg.content}
+                for msg in history[start:]
+            ],
+            evicted=list(history[:start]),
+            tokens=used,
+        )
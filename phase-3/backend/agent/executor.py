@@ -3,78 +3,102 @@
 
 import logging
 import os
+import threading
+from dataclasses import replace
+from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 
-from google import genai
-from google.genai import types
-from google.genai.types import FunctionDeclaration
 from sqlmodel import Session
 
 from .config import (
     AGENT_CONFIG,
+    HISTORY_MAX_MESSAGES,
     SYSTEM_PROMPT,
-    TOOL_DEFINITIONS,
-    MAX_HISTORY_MESSAGES,
+    SUMMARY_MIN_EVICTED_MESSAGES,
+    SUMMARY_PROMPT,
+    READ_ONLY_TOOLS,
 )
+from .admission import MODEL_ADMISSION, ModelOverloadedError
+from .context import ContextBuilder
+from .intent_router import IntentRouter, FAST_PATH_METRICS
+from .prompt import get_generate_config, get_summary_config, HISTORY_CONTENT_CACHE
+from .response_cache import RESPONSE_CACHE
 from .result import AgentResult, ToolCallRecord
 from ..repositories.conversation_repository import ConversationRepository
 from ..repositories.message_repository import MessageRepository
+from ..repositories.tool_result_repository import ToolResultRepository
 
 # MCP tools
 from ..mcp_tools.tools import (
     add_task,
     list_tasks,
+    search_tasks,
     complete_task,
     delete_task,
     update_task,
+    complete_tasks,
+    delete_tasks,
+    update_tasks,
 )
+from ..mcp_tools.tools._adapter import get_task_collection_version
+from ..observability import start_trace, span
 
 logger = logging.getLogger(__name__)
 
-# Gemini client
-_client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+# Gemini client, created on first use (benchmarks may assign a fake)
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Any:
+    """Return the process-wide Gemini client, importing the SDK on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+
+                _client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+    return _client
+
+
+def warm_up() -> None:
+    """
+    Import the SDK and build the client and static prompt config.
+
+    Run in a background thread at startup so the first chat request
+    does not pay for it; everything is also built lazily on demand.
+    """
+    get_client()
+    get_generate_config()
+    get_summary_config()
+    logger.info("Agent warm-up complete")
 
 # Tool name → function map
 _TOOL_FUNCTIONS: Dict[str, Any] = {
     "add_task": add_task,
     "list_tasks": list_tasks,
+    "search_tasks": search_tasks,
     "complete_task": complete_task,
     "delete_task": delete_task,
     "update_task": update_task,
+    "complete_tasks": complete_tasks,
+    "delete_tasks": delete_tasks,
+    "update_tasks": update_tasks,
 }
 
 
-def _convert_to_gemini_tools() -> List[FunctionDeclaration]:
-    """Convert MCP tool definitions into Gemini FunctionDeclarations"""
-    tools: List[FunctionDeclaration] = []
-
-    for i, tool in enumerate(TOOL_DEFINITIONS):
-        if not isinstance(tool, dict):
-            logger.warning(f"Skipping invalid tool at index {i}: not a dict")
-            continue
-        if "name" not in tool:
-            logger.warning(f"Skipping tool at index {i}: missing 'name' key")
-            continue
-        if "description" not in tool:
-            logger.warning(f"Tool '{tool['name']}' missing 'description'; defaulting to empty string")
-            tool["description"] = ""
-        if "parameters" not in tool:
-            logger.warning(f"Tool '{tool['name']}' missing 'parameters'; defaulting to empty dict")
-            tool["parameters"] = {}
-
-        tools.append(
-            FunctionDeclaration(
-                name=tool["name"],
-                description=tool["description"],
-                parameters=tool["parameters"],
-            )
+def _record_usage(model_span: Any, response: Any) -> None:
+    """Copy token usage from a model response onto its trace span."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        model_span.set(
+            prompt_tokens=usage.prompt_token_count,
+            response_tokens=usage.candidates_token_count,
         )
 
-    logger.info(f"Loaded {len(tools)} Gemini tools")
-    return tools
-
-
-GEMINI_TOOLS = _convert_to_gemini_tools()
+# Reply used when the tool-calling loop hits its round limit
+_ROUND_LIMIT_REPLY = "I’ve completed several actions but had to stop. Please continue."
 
 
 class AgentExecutor:
@@ -90,24 +114,48 @@ class AgentExecutor:
         self._user_id = user_id
         self._conversation_repo = ConversationRepository(session, user_id)
         self._message_repo = MessageRepository(session, user_id)
+        self._tool_result_repo = ToolResultRepository(session, user_id)
         self._model_name = AGENT_CONFIG.get("model", "default-model")
+        self._context_builder = ContextBuilder()
+        self._intent_router = IntentRouter()
 
     async def execute(
         self,
         message: str,
         conversation_id: Optional[int] = None,
+    ) -> AgentResult:
+        with start_trace("chat") as trace:
+            result = await self._execute(message, conversation_id)
+        return replace(result, trace=trace.to_dict())
+
+    async def _execute(
+        self,
+        message: str,
+        conversation_id: Optional[int],
     ) -> AgentResult:
         try:
-            conversation_id, messages = await self._hydrate(conversation_id)
-            messages = await self._append_user_message(
-                conversation_id, message, messages
-            )
+            with span("agent.hydrate"):
+                conversation_id, messages = await self._hydrate(conversation_id)
 
-            response_text, tool_records = await self._invoke(messages)
+            with span("agent.append_user_message"):
+                messages = await self._append_user_message(message, messages)
 
-            await self._persist_assistant_message(
-                conversation_id, response_text, tool_records
-            )
+            with span("agent.route") as route_span:
+                routed = await self._route(message)
+                route_span.set(hit=routed is not None)
+
+            if routed is not None:
+                response_text, tool_records = routed
+            else:
+                with span("agent.invoke"):
+                    response_text, tool_records = await self._invoke_cached(
+                        conversation_id, message, messages
+                    )
+
+            with span("agent.persist_turn"):
+                conversation_id = await self._persist_turn(
+                    conversation_id, messages[-1], response_text, tool_records
+                )
 
             return AgentResult(
                 conversation_id=conversation_id,
@@ -115,90 +163,223 @@ class AgentExecutor:
                 tool_calls=tool_records,
             )
 
+        except ModelOverloadedError:
+            # Surfaced to the router as 503 + Retry-After
+            self._session.rollback()
+            raise
+
         except Exception:
             logger.exception("Agent execution failed")
+            self._session.rollback()
             return AgentResult.error(
-                conversation_id=conversation_id or 0,
+                conversation_id=self._persist_failed_turn(conversation_id, message),
                 message="Something went wrong. Please try again.",
             )
 
+    def _persist_failed_turn(
+        self, conversation_id: Optional[int], message: str
+    ) -> Optional[int]:
+        """
+        Keep the user's message of a failed (rolled back) turn.
+
+        A new conversation is created for it, so the client gets an ID it
+        can continue. The router commits it like any other turn.
+
+        Returns:
+            ID of the conversation, or None if even this write failed
+        """
+        try:
+            if conversation_id is None:
+                conversation_id = self._conversation_repo.create().id
+            else:
+                self._conversation_repo.touch(conversation_id)
+            self._message_repo.add(
+                conversation_id=conversation_id,
+                role="user",
+                content=message,
+                tool_calls=None,
+            )
+            return conversation_id
+        except Exception:
+            logger.exception("Could not save the message of a failed turn")
+            self._session.rollback()
+            return None
+
     async def _hydrate(
         self, conversation_id: Optional[int]
-    ) -> Tuple[int, List[Dict[str, Any]]]:
+    ) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+        """
+        Load the conversation context. Read-only: a new conversation
+        is only created in the write phase (_persist_turn), so the
+        returned ID is None for one.
+        """
+        conversation = None
+        if conversation_id is not None:
+            conversation = self._conversation_repo.get_by_id(conversation_id)
 
-        if conversation_id is None:
-            conversation = self._conversation_repo.create()
-            conversation_id = conversation.id
+        if conversation is None:
+            conversation_id = None
             history = []
+            summary = None
         else:
-            conversation = self._conversation_repo.get_by_id(conversation_id)
-            if conversation is None:
-                conversation = self._conversation_repo.create()
-                conversation_id = conversation.id
-                history = []
-            else:
-                history = self._message_repo.get_history(conversation_id)
+            # Turns already folded into the summary are not reloaded
+            history = self._message_repo.get_history(
+                conversation_id,
+                after_id=conversation.summary_through_id,
+                archived_through_id=conversation.archived_through_id,
+                limit=HISTORY_MAX_MESSAGES,
+            )
+            summary = conversation.summary
+
+        window = self._context_builder.build(history, summary=summary)
+
+        if len(window.evicted) >= SUMMARY_MIN_EVICTED_MESSAGES:
+            summary = await self._summarize(
+                conversation_id, summary, window.evicted
+            )
 
         messages: List[Dict[str, Any]] = [
             {"role": "system", "content": SYSTEM_PROMPT}
         ]
 
-        for msg in history[-MAX_HISTORY_MESSAGES:]:
-            messages.append(
-                {"role": msg.role, "content": msg.content}
-            )
+        if summary:
+            messages.append({"role": "summary", "content": summary})
+
+        messages.extend(window.messages)
 
         return conversation_id, messages
 
-    async def _append_user_message(
+    async def _summarize(
         self,
         conversation_id: int,
+        previous_summary: Optional[str],
+        evicted: List[Any],
+    ) -> Optional[str]:
+        """
+        Fold evicted turns into the conversation's rolling summary.
+
+        Falls back to the previous summary if the model call fails;
+        the evicted turns are then retried on a later request.
+        """
+        from google.genai import types
+
+        transcript = "\n".join(f"{msg.role}: {msg.content}" for msg in evicted)
+        prompt = SUMMARY_PROMPT.format(
+            previous_summary=previous_summary or "(none)",
+            transcript=transcript,
+        )
+
+        try:
+            with span("model.summarize") as model_span:
+                response = await MODEL_ADMISSION.generate_content(
+                    get_client(),
+                    model=self._model_name,
+                    contents=[
+                        types.Content(role="user", parts=[types.Part(text=prompt)])
+                    ],
+                    config=get_summary_config(),
+                )
+                _record_usage(model_span, response)
+            summary = (response.text or "").strip()
+        except Exception:
+            logger.exception("Conversation summarization failed")
+            return previous_summary
+
+        if not summary:
+            return previous_summary
+
+        self._conversation_repo.update_summary(
+            conversation_id, summary, through_message_id=evicted[-1].id
+        )
+        return summary
+
+    async def _append_user_message(
+        self,
         message: str,
         messages: List[Dict[str, Any]],
     ) -> List[Dict[str, Any]]:
+        """Add the user's message to the context; it is persisted with the reply."""
+        messages.append({
+            "role": "user",
+            "content": message,
+            "created_at": datetime.utcnow(),
+        })
+        return messages
 
-        self._message_repo.add(
-            conversation_id=conversation_id,
-            role="user",
-            content=message,
-            tool_calls=None,
-        )
+    async def _route(
+        self, message: str
+    ) -> Optional[Tuple[str, List[ToolCallRecord]]]:
+        """
+        Serve simple commands without the model.
+
+        Returns None when the message is not a high-confidence command.
+        Once the tool has run, the turn is always answered here (errors
+        included), so its tool call is persisted and never repeated.
+        """
+        intent = self._intent_router.match(message)
+        FAST_PATH_METRICS.record(hit=intent is not None)
+        if intent is None:
+            return None
+
+        result, record = await self._execute_tool(intent.tool, dict(intent.arguments))
+        return self._intent_router.render(intent, result), [record]
+
+    async def _invoke_cached(
+        self, conversation_id: int, message: str, messages: List[Dict[str, Any]]
+    ) -> Tuple[str, List[ToolCallRecord]]:
+        """
+        Invoke the model unless an identical read-only turn is cached.
+
+        The key includes the user's task-collection version, so a reply
+        is never served after any of the user's tasks changed.
+        """
+        summary = next((m["content"] for m in messages if m["role"] == "summary"), None)
+        with span("cache.lookup") as cache_span:
+            key = RESPONSE_CACHE.make_key(
+                self._user_id,
+                message,
+                summary,
+                get_task_collection_version(self._session, self._user_id),
+            )
+            cached = RESPONSE_CACHE.get(key)
+            cache_span.set(hit=cached is not None)
 
-        self._conversation_repo.update_timestamp(conversation_id)
-        messages.append({"role": "user", "content": message})
-        return messages
+        if cached is not None:
+            return cached.response, list(cached.tool_calls)
+
+        response_text, tool_records = await self._invoke(messages, conversation_id)
+
+        if (
+            response_text
+            and response_text != _ROUND_LIMIT_REPLY
+            and all(r.tool in READ_ONLY_TOOLS for r in tool_records)
+        ):
+            RESPONSE_CACHE.put(key, self._user_id, response_text, tool_records)
+
+        return response_text, tool_records
 
     async def _invoke(
-        self, messages: List[Dict[str, Any]]
+        self, messages: List[Dict[str, Any]], conversation_id: Optional[int] = None
     ) -> Tuple[str, List[ToolCallRecord]]:
+        from google.genai import types
 
         tool_records: List[ToolCallRecord] = []
-        contents: List[types.Content] = []
 
-        for msg in messages:
-            if msg["role"] == "system":
-                continue
-            role = "user" if msg["role"] == "user" else "model"
-            contents.append(
-                types.Content(
-                    role=role,
-                    parts=[types.Part(text=msg["content"])],
-                )
+        # Persisted history is converted once per conversation and reused
+        with span("agent.prompt_assembly"):
+            contents = HISTORY_CONTENT_CACHE.contents(
+                self._user_id, conversation_id, messages
             )
 
-        config = types.GenerateContentConfig(
-            system_instruction=SYSTEM_PROMPT,
-            temperature=AGENT_CONFIG.get("temperature", 0.7),
-            max_output_tokens=AGENT_CONFIG.get("max_tokens", 512),
-            tools=GEMINI_TOOLS,
-        )
-
-        for _ in range(10):
-            response = _client.models.generate_content(
-                model=self._model_name,
-                contents=contents,
-                config=config,
-            )
+        for round_index in range(10):
+            with span("model.generate", round=round_index) as model_span:
+                response = await MODEL_ADMISSION.generate_content(
+                    get_client(),
+                    model=self._model_name,
+                    contents=contents,
+                    config=get_generate_config(),
+                )
+                _record_usage(model_span, response)
 
             candidate = response.candidates[0]
             content = candidate.content
@@ -235,10 +416,7 @@ class AgentExecutor:
                 types.Content(role="user", parts=response_parts)
             )
 
-        return (
-            "I’ve completed several actions but had to stop. Please continue.",
-            tool_records,
-        )
+        return _ROUND_LIMIT_REPLY, tool_records
 
     async def _execute_tool(
         self, tool_name: str, arguments: Dict[str, Any]
@@ -251,11 +429,15 @@ class AgentExecutor:
             result = {"error": "unknown_tool"}
         else:
             try:
-                result = await tool(**arguments)
+                with span(f"tool.{tool_name}"):
+                    result = await tool(**arguments)
             except Exception:
                 logger.exception("Tool failed")
                 result = {"error": "tool_execution_failed"}
 
+            if tool_name not in READ_ONLY_TOOLS:
+                RESPONSE_CACHE.invalidate_user(self._user_id)
+
         record = ToolCallRecord(
             tool=tool_name,
             arguments={k: v for k, v in arguments.items() if k != "user_id"},
@@ -264,29 +446,56 @@ class AgentExecutor:
 
         return result, record
 
-    async def _persist_assistant_message(
+    async def _persist_turn(
         self,
-        conversation_id: int,
+        conversation_id: Optional[int],
+        user_message: Dict[str, Any],
         response_text: str,
         tool_records: List[ToolCallRecord],
-    ) -> None:
-
+    ) -> int:
+        """
+        Write phase: persist the whole turn in as few statements as possible.
+
+        Inserts the user message and the assistant reply with one
+        multi-row INSERT and bumps the conversation's updated_at with one
+        UPDATE (a new conversation is inserted here instead). The router
+        commits both in a single transaction, so a failed turn leaves
+        nothing behind. Large tool results are stored compactly (one
+        extra INSERT into tool_result); the caller still returns the
+        full results for this turn.
+
+        Returns:
+            ID of the conversation the turn was written to
+        """
         tool_calls = None
         if tool_records:
-            tool_calls = [
+            tool_calls = self._tool_result_repo.compact([
                 {
                     "tool": r.tool,
                     "arguments": r.arguments,
                     "result": r.result,
                 }
                 for r in tool_records
-            ]
+            ])
 
-        self._message_repo.add(
-            conversation_id=conversation_id,
-            role="assistant",
-            content=response_text,
-            tool_calls=tool_calls,
-        )
+        if conversation_id is None:
+            conversation_id = self._conversation_repo.create().id
+        else:
+            self._conversation_repo.touch(conversation_id)
 
-        self._conversation_repo.update_timestamp(conversation_id)
+        self._message_repo.add_many(
+            conversation_id,
+            [
+                {
+                    "role": "user",
+                    "content": user_message["content"],
+                    "created_at": user_message.get("created_at"),
+                },
+                {
+                    "role": "assistant",
+                    "content": response_text,
+                    "tool_calls": tool_calls,
+                },
+            ],
+        )
+        return conversation_id
@@ -0,0 +1,263 @@
+# Fast-Path Intent Router
+# Spec: agent.spec.md Sections 4.1, 5.1
+#
+# Deterministic parser for trivially structured chat commands
+# ("show my tasks", "delete task 45", "complete 12").
+# Matched commands go straight to the MCP tools with a templated reply,
+# skipping both model round trips. Anything else falls back to the model;
+# once a matched tool has run, its result (errors included) is always
+# rendered here, so the change is recorded and never repeated by the model.
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Pattern, Callable
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A high-confidence mapping from a chat message to one MCP tool call."""
+
+    tool: str
+    """Name of the MCP tool to call."""
+
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    """Tool arguments (user_id is injected by the executor)."""
+
+
+@dataclass
+class FastPathMetrics:
+    """
+    Process-wide fast-path counters.
+
+    Counts only, never message content, so this is not conversation
+    state (agent.spec.md Section 4.2).
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool) -> None:
+        """Count one routed message."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of messages served without the model."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters as a JSON-serializable dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+FAST_PATH_METRICS = FastPathMetrics()
+
+
+_STATUS_WORDS = {
+    None: "all",
+    "all": "all",
+    "pending": "pending",
+    "open": "pending",
+    "incomplete": "pending",
+    "unfinished": "pending",
+    "completed": "completed",
+    "complete": "completed",
+    "done": "completed",
+    "finished": "completed",
+}
+
+# Action phrase per tool, for error replies
+_ACTIONS = {
+    "list_tasks": "list your tasks",
+    "add_task": "add that task",
+    "complete_task": "complete task #{task_id}",
+    "delete_task": "delete task #{task_id}",
+}
+
+_TASK_ID = r"(?:task\s+)?(?:number\s+|no\.?\s*)?#?(?P<task_id>\d+)"
+_DONE = r"(?:done|complete|completed|finished)"
+
+# Each pattern must match the WHOLE normalized message
+_PATTERNS: List[tuple] = [
+    (
+        re.compile(
+            r"^(?:show|list|view|display|get|see|what are)(?:\s+me)?(?:\s+all)?"
+            r"(?:\s+of)?(?:\s+my|\s+the)?"
+            r"(?:\s+(?P<status>all|pending|open|incomplete|unfinished"
+            r"|completed|complete|done|finished))?"
+            r"\s+(?:tasks|todos|to-dos)$",
+            re.IGNORECASE,
+        ),
+        lambda m: Intent(
+            "list_tasks",
+            {"status": _STATUS_WORDS[_lower(m.group("status"))], "compact": True},
+        ),
+    ),
+    (
+        re.compile(r"^(?:my\s+tasks|what\s+tasks\s+do\s+i\s+have)$", re.IGNORECASE),
+        lambda m: Intent("list_tasks", {"status": "all", "compact": True}),
+    ),
+    (
+        re.compile(rf"^(?:complete|finish|check\s+off|close)\s+{_TASK_ID}$", re.IGNORECASE),
+        lambda m: Intent("complete_task", {"task_id": int(m.group("task_id"))}),
+    ),
+    (
+        re.compile(rf"^mark\s+{_TASK_ID}\s+(?:as\s+)?{_DONE}$", re.IGNORECASE),
+        lambda m: Intent("complete_task", {"task_id": int(m.group("task_id"))}),
+    ),
+    (
+        re.compile(rf"^{_TASK_ID}\s+(?:is\s+)?{_DONE}$", re.IGNORECASE),
+        lambda m: Intent("complete_task", {"task_id": int(m.group("task_id"))}),
+    ),
+    (
+        re.compile(rf"^(?:delete|remove)\s+{_TASK_ID}$", re.IGNORECASE),
+        lambda m: Intent("delete_task", {"task_id": int(m.group("task_id"))}),
+    ),
+    (
+        re.compile(
+            r"^add\s+(?:a\s+)?(?:new\s+)?task(?:\s+to|\s+called|\s+named|:)?\s+(?P<title>.+)$",
+            re.IGNORECASE,
+        ),
+        lambda m: _add_intent(m.group("title")),
+    ),
+]
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if value else None
+
+
+def _add_intent(raw: str) -> Optional[Intent]:
+    title = raw.strip().strip("\"'").strip()
+    # Lists of items ("milk, eggs and bread") may mean several tasks
+    if not title or re.search(r",|;|\band\b", title, re.IGNORECASE):
+        return None
+    return Intent("add_task", {"title": title[:1].upper() + title[1:]})
+
+
+def _normalize(message: str) -> str:
+    """Collapse whitespace, drop trailing punctuation and politeness."""
+    text = " ".join(message.split())
+    text = text.rstrip(".!?").strip()
+    text = re.sub(r"^(?:please|pls|can you|could you)\s+", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\s+please$", "", text, flags=re.IGNORECASE)
+    return text
+
+
+class IntentRouter:
+    """
+    Rule-based parser that maps simple commands to MCP tool calls.
+
+    Stateless: holds only compiled patterns.
+    """
+
+    def __init__(self, patterns: Optional[List[tuple]] = None):
+        """
+        Initialize router.
+
+        Args:
+            patterns: (compiled regex, intent factory) pairs; defaults
+                to the built-in command grammar
+        """
+        self._patterns: List[tuple[Pattern, Callable]] = patterns or _PATTERNS
+
+    def match(self, message: str) -> Optional[Intent]:
+        """
+        Parse a message into a high-confidence intent.
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            Intent if the whole message matches a known command, None otherwise
+        """
+        text = _normalize(message)
+        if not text or "\n" in message.strip():
+            return None
+
+        for pattern, factory in self._patterns:
+            found = pattern.match(text)
+            if found:
+                intent = factory(found)
+                if intent is not None:
+                    return intent
+        return None
+
+    def render(self, intent: Intent, result: Any) -> str:
+        """
+        Render a templated reply for a tool result.
+
+        The tool has already run, so every result gets a reply: handing
+        it to the model instead would drop its tool call record and let
+        the model repeat the change.
+
+        Args:
+            intent: The intent that was executed
+            result: Result returned by the MCP tool
+
+        Returns:
+            Reply text
+        """
+        if not isinstance(result, dict):
+            return _render_error(intent, None)
+
+        error = result.get("error")
+        if error == "not_found":
+            return (
+                f"I couldn't find task #{result.get('task_id')} on your list. "
+                "Say \"show my tasks\" to see your task IDs."
+            )
+        if error:
+            return _render_error(intent, result)
+
+        try:
+            if intent.tool == "list_tasks":
+                status = intent.arguments.get("status", "all")
+                return _render_task_list(result.get("tasks", []), status)
+            if intent.tool == "add_task":
+                return (
+                    f"Done! I've added '{result['title']}' to your list "
+                    f"(Task #{result['task_id']})."
+                )
+            if intent.tool == "complete_task":
+                return (
+                    f"Got it! I've marked '{result['title']}' (#{result['task_id']}) "
+                    "as complete."
+                )
+            if intent.tool == "delete_task":
+                return (
+                    f"Done! I've removed '{result['title']}' (#{result['task_id']}) "
+                    "from your list."
+                )
+        except (KeyError, TypeError):
+            pass
+        return _render_error(intent, None)
+
+
+def _render_error(intent: Intent, result: Optional[Dict[str, Any]]) -> str:
+    action = _ACTIONS.get(intent.tool, "do that").format(**intent.arguments)
+    if result is not None and result.get("error") == "validation" and result.get("message"):
+        return f"I couldn't {action}: {result['message']}."
+    return f"Sorry, I couldn't {action} just now. Please try again."
+
+
+def _render_task_list(tasks: List[Dict[str, Any]], status: str) -> str:
+    if not tasks:
+        if status == "all":
+            return "You don't have any tasks yet."
+        return f"You don't have any {status} tasks."
+
+    heading = "Here are your tasks:" if status == "all" else f"Here are your {status} tasks:"
+    lines = [
+        f"{i}. {task['title']} ({'completed' if task['completed'] else 'pending'}) - #{task['id']}"
+        for i, task in enumerate(tasks, start=1)
+    ]
+    return "\n".join([heading, *lines])
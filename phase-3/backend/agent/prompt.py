@@ -0,0 +1,245 @@
+# Prompt Assembly
+# Spec: agent.spec.md Section 8.2
+#
+# Builds the Gemini request pieces for the agent.
+#
+# Static parts (tool declarations, system instruction, generation config)
+# are built once per process, on first use. Persisted history messages are
+# immutable, so their converted types.Content objects are cached per
+# conversation and each turn only converts messages it has not seen before.
+#
+# google.genai is imported lazily: its types module dominates app import
+# time and is only needed once a chat request reaches the model.
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+from .config import (
+    AGENT_CONFIG,
+    SYSTEM_PROMPT,
+    TOOL_DEFINITIONS,
+    SUMMARY_MAX_TOKENS,
+    PROMPT_CACHE_MAX_CONVERSATIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# JSON Schema keys understood by the Gemini Schema type
+_SCHEMA_KEYS = ("type", "description", "enum", "items", "properties", "required", "nullable", "format")
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def _to_gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a JSON Schema into Gemini form (upper-case types, known keys only)."""
+    converted: Dict[str, Any] = {}
+    for key in _SCHEMA_KEYS:
+        if key not in schema:
+            continue
+        value = schema[key]
+        if key == "type":
+            value = str(value).upper()
+        elif key == "items":
+            value = _to_gemini_schema(value)
+        elif key == "properties":
+            value = {name: _to_gemini_schema(prop) for name, prop in value.items()}
+        else:
+            value = copy.deepcopy(value)
+        converted[key] = value
+    return converted
+
+
+def build_function_declarations(
+    definitions: Iterable[Any] = TOOL_DEFINITIONS,
+) -> List[types.FunctionDeclaration]:
+    """
+    Convert tool definitions into Gemini FunctionDeclarations.
+
+    Accepts both the OpenAI-style {"type": "function", "function": {...}}
+    wrapper used in config.py and bare {name, description, parameters}
+    dicts. The definitions are never modified.
+
+    Args:
+        definitions: Tool definitions
+
+    Returns:
+        One FunctionDeclaration per valid definition
+    """
+    from google.genai import types
+
+    declarations: List[types.FunctionDeclaration] = []
+
+    for i, tool in enumerate(definitions):
+        if isinstance(tool, dict) and isinstance(tool.get("function"), dict):
+            tool = tool["function"]
+        if not isinstance(tool, dict) or "name" not in tool:
+            logger.warning(f"Skipping tool at index {i}: missing 'name' key")
+            continue
+
+        parameters = tool.get("parameters") or {}
+        declarations.append(
+            types.FunctionDeclaration(
+                name=tool["name"],
+                description=tool.get("description", ""),
+                parameters=_to_gemini_schema(parameters) if parameters.get("properties") else None,
+            )
+        )
+
+    logger.info(f"Loaded {len(declarations)} Gemini tools")
+    return declarations
+
+
+def build_generate_config(
+    declarations: List[types.FunctionDeclaration],
+) -> types.GenerateContentConfig:
+    """Build the GenerateContentConfig shared by every agent turn."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        system_instruction=SYSTEM_PROMPT,
+        temperature=AGENT_CONFIG.get("temperature", 0.7),
+        max_output_tokens=AGENT_CONFIG.get("max_tokens", 512),
+        tools=[types.Tool(function_declarations=declarations)] if declarations else None,
+    )
+
+
+def to_content(message: Dict[str, Any]) -> types.Content:
+    """
+    Convert one history message dict into a types.Content.
+
+    The rolling summary is sent as a user turn with a short preface;
+    assistant messages become "model" turns.
+    """
+    from google.genai import types
+
+    if message["role"] == "summary":
+        return types.Content(
+            role="user",
+            parts=[types.Part(text=SUMMARY_PREFIX + message["content"])],
+        )
+    role = "user" if message["role"] == "user" else "model"
+    return types.Content(role=role, parts=[types.Part(text=message["content"])])
+
+
+class HistoryContentCache:
+    """
+    Per-process cache of converted history, keyed by conversation.
+
+    Messages carrying an "id" are persisted and never change, so their
+    Content is reused across turns. Each conversation keeps only the
+    messages in its latest window; least recently used conversations
+    are dropped beyond max_conversations.
+    """
+
+    def __init__(self, max_conversations: int = PROMPT_CACHE_MAX_CONVERSATIONS):
+        self._max_conversations = max_conversations
+        self._entries: "OrderedDict[tuple, Dict[Any, types.Content]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def contents(
+        self,
+        user_id: str,
+        conversation_id: Optional[int],
+        messages: List[Dict[str, Any]],
+    ) -> List[types.Content]:
+        """
+        Convert messages to Contents, reusing cached conversions.
+
+        Args:
+            user_id: Conversation owner
+            conversation_id: Conversation the messages belong to (None disables caching)
+            messages: Hydrated message dicts (system messages are skipped)
+
+        Returns:
+            Contents in message order
+        """
+        if conversation_id is None:
+            return [to_content(msg) for msg in messages if msg["role"] != "system"]
+
+        key = (user_id, conversation_id)
+        with self._lock:
+            previous = self._entries.get(key, {})
+
+        current: Dict[Any, types.Content] = {}
+        contents: List[types.Content] = []
+        hits = misses = 0
+
+        for msg in messages:
+            if msg["role"] == "system":
+                continue
+            cache_key = ("summary", msg["content"]) if msg["role"] == "summary" else msg.get("id")
+            if cache_key is None:
+                contents.append(to_content(msg))
+                continue
+
+            content = previous.get(cache_key)
+            if content is None:
+                content = to_content(msg)
+                misses += 1
+            else:
+                hits += 1
+            current[cache_key] = content
+            contents.append(content)
+
+        with self._lock:
+            self._entries[key] = current
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_conversations:
+                self._entries.popitem(last=False)
+            self.hits += hits
+            self.misses += misses
+
+        return contents
+
+    def invalidate(self, user_id: str, conversation_id: int) -> None:
+        """Forget a conversation's cached contents."""
+        with self._lock:
+            self._entries.pop((user_id, conversation_id), None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "conversations": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_function_declarations() -> List[types.FunctionDeclaration]:
+    """Tool declarations, built once per process."""
+    return build_function_declarations()
+
+
+@lru_cache(maxsize=None)
+def get_generate_config() -> types.GenerateContentConfig:
+    """Config for agent turns, built once per process."""
+    return build_generate_config(get_function_declarations())
+
+
+@lru_cache(maxsize=None)
+def get_summary_config() -> types.GenerateContentConfig:
+    """Config for rolling-summary calls, built once per process."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        temperature=0.2,
+        max_output_tokens=SUMMARY_MAX_TOKENS,
+    )
+
+
+HISTORY_CONTENT_CACHE = HistoryContentCache()
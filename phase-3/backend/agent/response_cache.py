@@ -0,0 +1,160 @@
+# Agent Response Cache
+# Spec: agent.spec.md Sections 4.3, 5.3
+#
+# Process-local LRU + TTL cache of final assistant replies for turns whose
+# tool calls were all read-only. Keys combine the user, the normalized
+# message, the conversation summary and the user's task-collection version,
+# so any task mutation makes earlier entries unreachable. Recent turns are
+# deliberately left out: they change on every turn, so a key that included
+# them would never repeat within a conversation.
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Callable, Tuple
+
+from .config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from .result import ToolCallRecord
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation."""
+    return " ".join(message.casefold().split()).rstrip(".!? ")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A cached assistant turn."""
+
+    response: str
+    """Final assistant text."""
+
+    tool_calls: Tuple[ToolCallRecord, ...]
+    """Read-only tool calls made when the reply was generated."""
+
+
+class ResponseCache:
+    """
+    LRU cache with TTL for idempotent agent replies.
+
+    Entries are user-scoped; invalidate_user() drops every entry for a
+    user as soon as one of their tasks is mutated in this process.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum entries before least-recently-used eviction
+            ttl_seconds: Lifetime of an entry
+            clock: Monotonic time source (injectable for benchmarks)
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float, CachedResponse]]" = OrderedDict()
+        self._keys_by_user: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        user_id: str,
+        message: str,
+        summary: Optional[str],
+        task_version: Any,
+    ) -> str:
+        """
+        Build a cache key.
+
+        A repeated question hits as long as the tasks and the rolling
+        summary are unchanged, whatever was said in between.
+
+        Args:
+            user_id: Owner of the conversation
+            message: Raw user message
+            summary: Rolling summary of the conversation, if any
+            task_version: Fingerprint of the user's task collection
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [user_id, normalize_message(message), summary, task_version],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a live entry and mark it recently used."""
+        with self._lock:
+            found = self._entries.get(key)
+            if found is None:
+                self.misses += 1
+                return None
+
+            user_id, expires_at, entry = found
+            if expires_at <= self._clock():
+                self._remove(key, user_id)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: str,
+        user_id: str,
+        response: str,
+        tool_calls: List[ToolCallRecord],
+    ) -> None:
+        """Store a reply, evicting least-recently-used entries if full."""
+        entry = CachedResponse(response=response, tool_calls=tuple(tool_calls))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][0])
+            self._entries[key] = (user_id, self._clock() + self._ttl_seconds, entry)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+
+            while len(self._entries) > self._max_entries:
+                old_key, (old_user, _, _) = next(iter(self._entries.items()))
+                self._remove(old_key, old_user)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached reply for a user."""
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters as a JSON-serializable dict."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _remove(self, key: str, user_id: str) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+RESPONSE_CACHE = ResponseCache()
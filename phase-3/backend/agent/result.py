@@ -4,7 +4,7 @@
 # Immutable result objects for agent execution.
 
 from dataclasses import dataclass, field
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Dict
 
 
 @dataclass(frozen=True)
@@ -37,8 +37,8 @@ class AgentResult:
     - tool_calls: Transparency record of all tools invoked
     """
 
-    conversation_id: int
-    """ID of the conversation (new or existing)."""
+    conversation_id: Optional[int]
+    """ID of the conversation (new or existing; None if none was saved)."""
 
     response: str
     """Assistant's text response to the user."""
@@ -46,13 +46,16 @@ class AgentResult:
     tool_calls: List[ToolCallRecord] = field(default_factory=list)
     """List of tools invoked during this request."""
 
+    trace: Optional[Dict[str, Any]] = None
+    """Per-phase timing trace for debug responses."""
+
     @classmethod
-    def error(cls, conversation_id: int, message: str) -> "AgentResult":
+    def error(cls, conversation_id: Optional[int], message: str) -> "AgentResult":
         """
         Create an error result.
 
         Args:
-            conversation_id: Conversation ID (0 if not created)
+            conversation_id: Conversation ID (None if not created)
             message: Error message to show user
 
         Returns:
@@ -9,25 +9,18 @@
 #   or
 #   python -m phase-3.backend.api.main
 
-import sys
+import asyncio
 import logging
-from pathlib import Path
-
-# Add phase2 to path BEFORE importing
-_phase2_path = Path(__file__).parent.parent.parent.parent / "phase2" / "backend"
-if str(_phase2_path) not in sys.path:
-    sys.path.insert(0, str(_phase2_path))
-
-# Add phase3 backend to path for absolute imports (e.g., "from agent import ...")
-_phase3_backend_path = Path(__file__).parent.parent
-if str(_phase3_backend_path) not in sys.path:
-    sys.path.insert(0, str(_phase3_backend_path))
 
 # Phase II app import (existing FastAPI application)
 from app.main import app
 
 # Phase III router import
 from .router import chat_router
+from ..agent.config import AGENT_WARM_UP
+from ..agent.executor import warm_up
+from ..retention import archive_periodically
+from ..retention.config import MESSAGE_ARCHIVE_INTERVAL_SECONDS
 
 # Configure logging
 logging.basicConfig(
@@ -39,10 +32,32 @@ logger = logging.getLogger(__name__)
 # Mount Phase III chat router onto Phase II app
 # Spec Section 7.2: Register Phase III routes onto Phase II app
 # Route: POST /api/{user_id}/chat
-app.include_router(chat_router, prefix="/api", tags=["chat"])
+app.include_router(chat_router)
 
 logger.info("Phase III chat router mounted at /api/{user_id}/chat")
 
+# Load the Gemini SDK, client and prompt config off the startup path
+if AGENT_WARM_UP:
+
+    @app.on_event("startup")
+    async def start_agent_warm_up():
+        """Warm up the agent in a worker thread without delaying startup."""
+        app.state.agent_warm_up = asyncio.get_running_loop().run_in_executor(None, warm_up)
+
+# Optional in-process message retention job (conversation.spec.md Section 11)
+if MESSAGE_ARCHIVE_INTERVAL_SECONDS > 0:
+
+    @app.on_event("startup")
+    async def start_message_retention():
+        """Schedule the periodic prune/archive job."""
+        # Keep a reference so the task is not garbage collected
+        app.state.message_retention_task = asyncio.get_running_loop().create_task(
+            archive_periodically(MESSAGE_ARCHIVE_INTERVAL_SECONDS)
+        )
+        logger.info(
+            f"Message retention job every {MESSAGE_ARCHIVE_INTERVAL_SECONDS:g}s"
+        )
+
 
 # Re-export app for uvicorn
 __all__ = ["app"]
@@ -0,0 +1,54 @@
+# Keyset Pagination Cursors
+# Spec: chat-api.spec.md Section 13
+#
+# Opaque cursors for the history endpoints. A cursor encodes the sort
+# key (timestamp, id) of the last item on a page; the next page starts
+# strictly after it.
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(timestamp: datetime, item_id: int) -> str:
+    """
+    Encode a (timestamp, id) sort key as an opaque URL-safe cursor.
+
+    Args:
+        timestamp: Sort timestamp of the last item on the page
+        item_id: ID of the last item on the page (tie-breaker)
+
+    Returns:
+        Cursor string
+    """
+    raw = json.dumps([timestamp.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page, or None
+
+    Returns:
+        (timestamp, id) or None for the first page
+
+    Raises:
+        HTTPException 400: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
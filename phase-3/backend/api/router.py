@@ -1,36 +1,54 @@
 # T-342: Chat Router
-# Spec: chat-api.spec.md Sections 2, 6, 10
+# Spec: chat-api.spec.md Sections 2, 6, 10, 13
 #
-# POST /api/{user_id}/chat endpoint.
-# Uses Phase II auth and database dependencies.
+# POST /api/{user_id}/chat endpoint, plus the conversation history
+# endpoints (chat-api.spec.md Section 13).
+# Uses Phase II auth and database dependencies (chat tables are not
+# sharded, so sessions always use shard 0).
 # Invokes Phase III agent for AI responses.
 
-import sys
 import logging
-from pathlib import Path
+import math
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session
 
-# Add phase2 to path for imports
-_phase2_path = Path(__file__).parent.parent.parent.parent / "phase2" / "backend"
-if str(_phase2_path) not in sys.path:
-    sys.path.insert(0, str(_phase2_path))
-
 # Phase II imports (READ-ONLY usage)
 from app.auth import get_current_user
-from app.database import get_session
+from app.database import get_unsharded_session
+from app.instrumentation import InstrumentedRoute
 
 # Phase III imports
-from .schemas import ChatRequest, ChatResponse, ToolCallResponse
-from ..agent import AgentExecutor
-from ..repositories import ConversationRepository
+from .pagination import encode_cursor, decode_cursor
+from .schemas import (
+    ChatRequest,
+    ChatResponse,
+    ToolCallResponse,
+    ConversationListResponse,
+    ConversationSummary,
+    MessagePreview,
+    MessageListResponse,
+    MessageResponse,
+)
+from ..agent import (
+    AgentExecutor,
+    FAST_PATH_METRICS,
+    RESPONSE_CACHE,
+    HISTORY_CONTENT_CACHE,
+    MODEL_ADMISSION,
+    ModelOverloadedError,
+)
+from ..repositories import ConversationRepository, MessageRepository, ToolResultRepository
 
 
 logger = logging.getLogger(__name__)
 
 # Create router for chat endpoints
-chat_router = APIRouter(tags=["chat"])
+chat_router = APIRouter(prefix="/api", tags=["chat"], route_class=InstrumentedRoute)
+
+# Characters of the latest message shown in the conversation list
+PREVIEW_LENGTH = 120
 
 
 @chat_router.post(
@@ -55,7 +73,7 @@ async def chat(
     user_id: str,
     request: ChatRequest,
     auth_user_id: str = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_unsharded_session),
 ) -> ChatResponse:
     """
     Send a message to the AI assistant.
@@ -113,6 +131,14 @@ async def chat(
             message=request.message,
             conversation_id=request.conversation_id,
         )
+    except ModelOverloadedError as e:
+        # Admission control shed the request: tell the client when to retry
+        logger.warning(f"Chat request shed by model admission control: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI service is busy, please retry shortly",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
     except Exception as e:
         logger.exception("Agent execution failed")
         raise HTTPException(
@@ -135,4 +161,152 @@ async def chat(
             )
             for tc in result.tool_calls
         ],
+        trace=result.trace if request.debug else None,
+    )
+
+
+@chat_router.get(
+    "/chat/metrics",
+    summary="Chat pipeline metrics",
+    description="Process-level counters for the chat pipeline (no authentication required).",
+)
+async def chat_metrics() -> dict:
+    """
+    Report chat pipeline counters for this worker process.
+
+    Returns:
+        Dict with fast-path, response cache, prompt cache and model
+        admission (queue depth, wait times) counters
+    """
+    return {
+        "fast_path": FAST_PATH_METRICS.snapshot(),
+        "response_cache": RESPONSE_CACHE.snapshot(),
+        "prompt_cache": HISTORY_CONTENT_CACHE.snapshot(),
+        "model_admission": MODEL_ADMISSION.snapshot(),
+    }
+
+
+def _authorize(user_id: str, auth_user_id: str) -> None:
+    """Reject requests whose path user_id differs from the JWT user."""
+    if user_id != auth_user_id:
+        logger.warning(
+            f"User ID mismatch: path={user_id}, auth={auth_user_id}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+
+@chat_router.get(
+    "/{user_id}/conversations",
+    response_model=ConversationListResponse,
+    summary="List conversations",
+    description="Page through the user's conversations, most recently "
+    "active first, each with a preview of its latest message.",
+    responses={
+        400: {"description": "Invalid cursor"},
+        401: {"description": "Not authenticated - missing or invalid JWT"},
+        403: {"description": "Access denied - user_id mismatch"},
+    },
+)
+async def list_conversations(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    auth_user_id: str = Depends(get_current_user),
+    session: Session = Depends(get_unsharded_session),
+) -> ConversationListResponse:
+    """
+    List conversations with keyset pagination.
+
+    Spec: chat-api.spec.md Section 13.2
+    """
+    _authorize(user_id, auth_user_id)
+
+    repo = ConversationRepository(session, auth_user_id)
+    rows = repo.list_page(limit=limit + 1, before=decode_cursor(cursor))
+
+    page = rows[:limit]
+    items = [
+        ConversationSummary(
+            id=conversation.id,
+            created_at=conversation.created_at,
+            updated_at=conversation.updated_at,
+            last_message=MessagePreview(
+                role=message.role,
+                content=message.content[:PREVIEW_LENGTH],
+                created_at=message.created_at,
+            ) if message is not None else None,
+        )
+        for conversation, message in page
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+
+    return ConversationListResponse(items=items, next_cursor=next_cursor)
+
+
+@chat_router.get(
+    "/{user_id}/conversations/{conversation_id}/messages",
+    response_model=MessageListResponse,
+    summary="List conversation messages",
+    description="Page backwards through a conversation's messages, newest first.",
+    responses={
+        400: {"description": "Invalid cursor"},
+        401: {"description": "Not authenticated - missing or invalid JWT"},
+        403: {"description": "Access denied - user_id mismatch"},
+        404: {"description": "Conversation not found"},
+    },
+)
+async def list_messages(
+    user_id: str,
+    conversation_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    expand_results: bool = Query(False, description="Replace stored result references with full tool results"),
+    auth_user_id: str = Depends(get_current_user),
+    session: Session = Depends(get_unsharded_session),
+) -> MessageListResponse:
+    """
+    List a conversation's messages with keyset pagination.
+
+    Spec: chat-api.spec.md Section 13.3
+    """
+    _authorize(user_id, auth_user_id)
+
+    if ConversationRepository(session, auth_user_id).get_by_id(conversation_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found",
+        )
+
+    repo = MessageRepository(session, auth_user_id)
+    rows = repo.list_page(conversation_id, limit=limit + 1, before=decode_cursor(cursor))
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+    if expand_results:
+        ToolResultRepository(session, auth_user_id).expand(
+            message.tool_calls for message in page
+        )
+
+    return MessageListResponse(
+        items=[
+            MessageResponse(
+                id=message.id,
+                role=message.role,
+                content=message.content,
+                tool_calls=message.tool_calls,
+                created_at=message.created_at,
+            )
+            for message in page
+        ],
+        next_cursor=next_cursor,
     )
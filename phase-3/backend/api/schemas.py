@@ -1,9 +1,10 @@
 # T-341: Chat Request/Response Schemas
-# Spec: chat-api.spec.md Sections 3, 4
+# Spec: chat-api.spec.md Sections 3, 4, 13
 #
 # Pydantic models for chat endpoint validation and serialization.
 
-from typing import Optional, List, Any
+from datetime import datetime
+from typing import Optional, List, Any, Dict
 
 from pydantic import BaseModel, Field
 
@@ -25,6 +26,10 @@ class ChatRequest(BaseModel):
         max_length=4000,
         description="User's message to the assistant",
     )
+    debug: bool = Field(
+        default=False,
+        description="Include the per-phase timing trace in the response",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -61,9 +66,9 @@ class ChatResponse(BaseModel):
     Spec: chat-api.spec.md Section 4.3
     """
 
-    conversation_id: int = Field(
+    conversation_id: Optional[int] = Field(
         ...,
-        description="ID of the conversation (new or existing)",
+        description="ID of the conversation (new or existing; null if nothing was saved)",
     )
     response: str = Field(
         ...,
@@ -73,6 +78,10 @@ class ChatResponse(BaseModel):
         default_factory=list,
         description="List of tools invoked during this request",
     )
+    trace: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Per-phase timing trace (only when debug=true)",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -95,3 +104,82 @@ class ChatResponse(BaseModel):
             ]
         }
     }
+
+
+class MessagePreview(BaseModel):
+    """
+    Latest message of a conversation, shortened for list views.
+
+    Spec: chat-api.spec.md Section 13.2
+    """
+
+    role: str = Field(..., description="'user' or 'assistant'")
+    content: str = Field(..., description="Message text (truncated)")
+    created_at: datetime = Field(..., description="Message timestamp")
+
+
+class ConversationSummary(BaseModel):
+    """
+    One entry of GET /api/{user_id}/conversations.
+
+    Spec: chat-api.spec.md Section 13.2
+    """
+
+    id: int = Field(..., description="Conversation ID")
+    created_at: datetime = Field(..., description="When the conversation started")
+    updated_at: datetime = Field(..., description="Last activity timestamp")
+    last_message: Optional[MessagePreview] = Field(
+        default=None,
+        description="Latest message, if any",
+    )
+
+
+class ConversationListResponse(BaseModel):
+    """
+    Response body for GET /api/{user_id}/conversations.
+
+    Spec: chat-api.spec.md Section 13.2
+    """
+
+    items: List[ConversationSummary] = Field(
+        default_factory=list,
+        description="Conversations, most recently active first",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as ?cursor= for the next page; null on the last page",
+    )
+
+
+class MessageResponse(BaseModel):
+    """
+    One message of a conversation.
+
+    Spec: chat-api.spec.md Section 13.3
+    """
+
+    id: int = Field(..., description="Message ID")
+    role: str = Field(..., description="'user' or 'assistant'")
+    content: str = Field(..., description="Message text")
+    tool_calls: Optional[Any] = Field(
+        default=None,
+        description="Tool invocations (assistant messages only)",
+    )
+    created_at: datetime = Field(..., description="Message timestamp")
+
+
+class MessageListResponse(BaseModel):
+    """
+    Response body for GET /api/{user_id}/conversations/{id}/messages.
+
+    Spec: chat-api.spec.md Section 13.3
+    """
+
+    items: List[MessageResponse] = Field(
+        default_factory=list,
+        description="Messages, newest first",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as ?cursor= for older messages; null when none remain",
+    )
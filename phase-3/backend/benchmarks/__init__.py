@@ -0,0 +1,15 @@
+# Phase III Benchmarks
+#
+# Offline measurement scripts for the chat pipeline.
+# Run as modules, e.g.:
+#   python -m phase-3.backend.benchmarks.context_window recorded.jsonl
+#   python -m phase-3.backend.benchmarks.chat_load --requests 500 --concurrency 16
+#   python -m phase-3.backend.benchmarks.prompt_assembly --sizes 20 200
+#   python -m phase-3.backend.benchmarks.message_retention --conversations 100 --turns 40
+#   python -m phase-3.backend.benchmarks.tool_call_storage --conversations 50 --turns 20
+#   python -m phase-3.backend.benchmarks.model_admission --requests 200 --error-rate 0.1
+#   python -m phase-3.backend.benchmarks.startup_time --budget-ms 1300
+#   python -m phase-3.backend.benchmarks.task_events --database-url postgresql://localhost/todo_bench --subscribers 1000
+#   python -m phase-3.backend.benchmarks.shard_throughput --shards 1 2 4 --workers 8
+#   python -m phase-3.backend.benchmarks.partition_pruning --database-url postgresql://localhost/todo_bench
+#   python -m phase-3.backend.benchmarks.worker_boot --runs 5 --round-trip-ms 2
@@ -0,0 +1,208 @@
+# Chat Load Harness
+# Spec: agent.spec.md Section 8.2
+#
+# Drives the full FastAPI app (Phase II app + Phase III chat router)
+# in-process under concurrent load, with the Gemini client swapped for
+# a scripted fake (benchmarks/fake_model.py). No network access or API
+# key is needed.
+#
+# Each virtual user owns one conversation and cycles through the
+# scripted messages. Reports throughput, latency percentiles, database
+# statements per request and model rounds per request.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.chat_load \
+#       --requests 500 --concurrency 16 --latency-ms 400 --jitter-ms 150
+#   python -m phase-3.backend.benchmarks.chat_load \
+#       --database-url postgresql://localhost/todo_bench --script turns.json
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import time
+from typing import Dict, List, Any, Optional
+
+DEFAULT_DATABASE_URL = "sqlite:///./chat_load.db"
+
+# Recorded function-call sequences, keyed by user message.
+# Phrased so the intent router does not take the fast path.
+DEFAULT_SCRIPT: Dict[str, List[Dict[str, Any]]] = {
+    "Can you remind me to buy groceries tomorrow?": [
+        {"function_calls": [{"name": "add_task", "args": {
+            "title": "Buy groceries",
+            "description": "Tomorrow",
+        }}]},
+        {"text": "I've added 'Buy groceries' to your tasks."},
+    ],
+    "What's still on my plate?": [
+        {"function_calls": [{"name": "list_tasks", "args": {"status": "pending"}}]},
+        {"text": "Here are your pending tasks."},
+    ],
+    "Give me an overview of everything I've got": [
+        {"function_calls": [{"name": "list_tasks", "args": {"status": "all"}}]},
+        {"text": "Here's everything on your list."},
+    ],
+    "How does this app work?": [
+        {"text": "You can ask me to add, list, update, complete or delete tasks."},
+    ],
+}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _load_modules(database_url: str) -> Dict[str, Any]:
+    """Import the app after DATABASE_URL is set (settings are read at import)."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+    package = __package__.rsplit(".", 1)[0]
+    main = importlib.import_module(f"{package}.api.main")
+    return {
+        "app": main.app,
+        "executor": importlib.import_module(f"{package}.agent.executor"),
+        "fake_model": importlib.import_module(f"{__package__}.fake_model"),
+    }
+
+
+def _prepare_database(users: List[str]) -> None:
+    from sqlalchemy import select
+    from sqlmodel import SQLModel, Session
+    from app.database import engine
+    from app.infrastructure.models import UserDB
+
+    # Import registers the Phase III tables on the shared metadata
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        existing = set(session.exec(select(UserDB.id).where(UserDB.id.in_(users))).scalars())
+        for user_id in users:
+            if user_id not in existing:
+                session.add(UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id))
+        session.commit()
+
+
+class StatementCounter:
+    """Counts SQL statements executed on the shared engine."""
+
+    def __init__(self, engine: Any):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    import jwt
+
+    modules = _load_modules(args.database_url)
+    from app.config import get_settings
+    from app.database import engine
+
+    script = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script, encoding="utf-8") as handle:
+            script = json.load(handle)
+    if not script:
+        raise SystemExit("No scripted turns to replay")
+
+    fake = modules["fake_model"].FakeModelClient(
+        script, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed
+    )
+    modules["executor"]._client = fake
+
+    run_id = f"{int(time.time())}"
+    users = [f"bench-{run_id}-{i}" for i in range(args.concurrency)]
+    _prepare_database(users)
+
+    secret = get_settings().better_auth_secret
+    tokens = {user: jwt.encode({"sub": user}, secret, algorithm="HS256") for user in users}
+    messages = list(script)
+
+    counter = StatementCounter(engine)
+    latencies: List[float] = []
+    errors = 0
+    remaining = args.requests
+
+    transport = httpx.ASGITransport(app=modules["app"])
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def virtual_user(user_id: str) -> None:
+            nonlocal remaining, errors
+            conversation_id: Optional[int] = None
+            turn = 0
+            while remaining > 0:
+                remaining -= 1
+                body = {"message": messages[turn % len(messages)], "conversation_id": conversation_id}
+                turn += 1
+                start = time.perf_counter()
+                response = await client.post(
+                    f"/api/{user_id}/chat",
+                    json=body,
+                    headers={"Authorization": f"Bearer {tokens[user_id]}"},
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                conversation_id = response.json()["conversation_id"]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(user) for user in users))
+        elapsed = time.perf_counter() - started
+
+    completed = len(latencies)
+    return {
+        "backend": engine.dialect.name,
+        "requests": completed,
+        "errors": errors,
+        "concurrency": args.concurrency,
+        "model_latency_ms": args.latency_ms,
+        "model_jitter_ms": args.jitter_ms,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        },
+        "db_statements_per_request": round(counter.count / completed, 2) if completed else 0.0,
+        "model_rounds_per_request": round(fake.models.calls / completed, 2) if completed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the chat endpoint offline with a scripted model."
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Total chat requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Mean model latency per round")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform +/- latency jitter")
+    parser.add_argument("--seed", type=int, default=None, help="Jitter RNG seed")
+    parser.add_argument("--script", help="JSON file of recorded turns (see fake_model.py)")
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL),
+        help="SQLite or Postgres URL (tables are created if missing)",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# Context Window Report
+# Spec: agent.spec.md Section 8.2
+#
+# Replays recorded conversations turn by turn and compares the prompt
+# size of the legacy "last 20 messages" window against the token-budget
+# window with rolling summaries.
+#
+# Input is JSONL, one conversation per line:
+#   {"messages": [{"role": "user", "content": "..."}, ...]}
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.context_window recorded.jsonl
+
+import argparse
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from typing import List, Dict, Any
+
+from ..agent.config import (
+    SYSTEM_PROMPT,
+    SUMMARY_MAX_TOKENS,
+    SUMMARY_MIN_EVICTED_MESSAGES,
+)
+from ..agent.context import ContextBuilder, estimate_tokens, estimate_message_tokens
+
+# Window size used before the token-budget builder
+LEGACY_HISTORY_MESSAGES = 20
+
+
+def _load(path: str) -> List[List[SimpleNamespace]]:
+    conversations = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            conversations.append([
+                SimpleNamespace(id=i + 1, role=m["role"], content=m["content"])
+                for i, m in enumerate(record["messages"])
+            ])
+    return conversations
+
+
+def _replay(conversation: List[SimpleNamespace], builder: ContextBuilder) -> Dict[str, Any]:
+    system_tokens = estimate_tokens(SYSTEM_PROMPT)
+    legacy_tokens = 0
+    budget_tokens = 0
+    legacy_times: List[float] = []
+    budget_times: List[float] = []
+    summaries = 0
+    turns = 0
+
+    summary = None
+    summary_through_id = 0
+
+    for index, message in enumerate(conversation):
+        if message.role != "user":
+            continue
+        turns += 1
+        history = conversation[:index]
+        new_tokens = estimate_message_tokens(message.content)
+
+        start = time.perf_counter()
+        legacy = history[-LEGACY_HISTORY_MESSAGES:]
+        legacy_cost = sum(estimate_message_tokens(m.content) for m in legacy)
+        legacy_times.append(time.perf_counter() - start)
+        legacy_tokens += system_tokens + legacy_cost + new_tokens
+
+        start = time.perf_counter()
+        pending = [m for m in history if m.id > summary_through_id]
+        window = builder.build(pending, summary=summary)
+        budget_times.append(time.perf_counter() - start)
+
+        if len(window.evicted) >= SUMMARY_MIN_EVICTED_MESSAGES:
+            # Offline stand-in: the summary is costed at its full reserve
+            summary = "<summary>"
+            summary_through_id = window.evicted[-1].id
+            summaries += 1
+
+        summary_cost = SUMMARY_MAX_TOKENS if summary else 0
+        budget_tokens += system_tokens + summary_cost + window.tokens + new_tokens
+
+    return {
+        "turns": turns,
+        "legacy_tokens": legacy_tokens,
+        "budget_tokens": budget_tokens,
+        "legacy_times": legacy_times,
+        "budget_times": budget_times,
+        "summaries": summaries,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Context window report")
+    parser.add_argument("path", help="JSONL file of recorded conversations")
+    args = parser.parse_args()
+
+    builder = ContextBuilder()
+    totals = {"turns": 0, "legacy_tokens": 0, "budget_tokens": 0, "summaries": 0}
+    legacy_times: List[float] = []
+    budget_times: List[float] = []
+
+    for conversation in _load(args.path):
+        result = _replay(conversation, builder)
+        for key in totals:
+            totals[key] += result[key]
+        legacy_times.extend(result["legacy_times"])
+        budget_times.extend(result["budget_times"])
+
+    if not totals["turns"]:
+        print("No user turns found")
+        return
+
+    reduction = 1 - totals["budget_tokens"] / totals["legacy_tokens"]
+    print(f"turns:                     {totals['turns']}")
+    print(f"prompt tokens (legacy):    {totals['legacy_tokens']}")
+    print(f"prompt tokens (budget):    {totals['budget_tokens']}")
+    print(f"prompt token reduction:    {reduction:.1%}")
+    print(f"summaries per 100 turns:   {100 * totals['summaries'] / totals['turns']:.1f}")
+    print(f"build p50 legacy (us):     {statistics.median(legacy_times) * 1e6:.1f}")
+    print(f"build p50 budget (us):     {statistics.median(budget_times) * 1e6:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Fake Model Client
+#
+# Scriptable stand-in for google.genai.Client used by the offline benchmarks.
+# Replays recorded function-call sequences keyed by the user's message, with
+# configurable latency and jitter, and returns real google.genai response
+# types so the executor runs its normal code paths.
+#
+# Script format (JSON):
+#   {
+#     "Anything due today?": [
+#       {"function_calls": [{"name": "list_tasks", "args": {"status": "pending"}}]},
+#       {"text": "You have 2 pending tasks."}
+#     ]
+#   }
+# Each entry is one model round. Unknown messages get a single text reply.
+
+import random
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from google.genai import types
+
+from ..agent.context import estimate_tokens
+
+DEFAULT_REPLY = "Sure! Let me know if there's anything else I can help with."
+
+
+class FakeModels:
+    """Implements the models.generate_content surface used by the agent."""
+
+    def __init__(
+        self,
+        script: Dict[str, List[Dict[str, Any]]],
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self._script = script
+        self._latency_ms = latency_ms
+        self._jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(
+        self,
+        model: str,
+        contents: List[types.Content],
+        config: Optional[types.GenerateContentConfig] = None,
+    ) -> types.GenerateContentResponse:
+        with self._lock:
+            self.calls += 1
+            delay = self._latency_ms + self._random.uniform(-self._jitter_ms, self._jitter_ms)
+
+        if delay > 0:
+            # Blocking, like the real synchronous client
+            time.sleep(delay / 1000)
+
+        message, round_index = _current_turn(contents)
+        rounds = self._script.get(message or "", [])
+        step = rounds[round_index] if round_index < len(rounds) else {"text": DEFAULT_REPLY}
+
+        if step.get("function_calls"):
+            parts = [
+                types.Part(function_call=types.FunctionCall(name=c["name"], args=c.get("args", {})))
+                for c in step["function_calls"]
+            ]
+            reply_text = ""
+        else:
+            reply_text = step.get("text", DEFAULT_REPLY)
+            parts = [types.Part(text=reply_text)]
+
+        prompt_tokens = sum(
+            estimate_tokens(part.text) for content in contents for part in content.parts if part.text
+        )
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=parts))],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=estimate_tokens(reply_text) or len(parts),
+            ),
+        )
+
+
+class FakeModelClient:
+    """Drop-in replacement for the module-level genai client."""
+
+    def __init__(self, script: Dict[str, List[Dict[str, Any]]], **options: Any):
+        self.models = FakeModels(script, **options)
+
+
+def _current_turn(contents: List[types.Content]) -> tuple:
+    """
+    Find the user's message and how many model rounds followed it.
+
+    The last user content carrying plain text is the current message;
+    every model content after it is one completed round.
+    """
+    for index in range(len(contents) - 1, -1, -1):
+        content = contents[index]
+        if content.role == "user" and any(part.text for part in content.parts):
+            rounds = sum(1 for later in contents[index + 1:] if later.role == "model")
+            text = "".join(part.text for part in content.parts if part.text)
+            return text, rounds
+    return None, 0
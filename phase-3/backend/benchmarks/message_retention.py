@@ -0,0 +1,209 @@
+# Message Retention Benchmark
+# Spec: conversation.spec.md Section 11
+#
+# Seeds conversations whose assistant turns carry full list_tasks
+# results, then reports message-table size and history query latency
+# before and after one retention run (prune + archive).
+#
+#   hydrate   get_history after the rolling summary (what a chat turn loads)
+#   full      get_history of the whole conversation (reads the archive)
+#   page      first page of GET .../messages
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.message_retention
+#   python -m phase-3.backend.benchmarks.message_retention \
+#       --conversations 500 --turns 60 --database-url postgresql://localhost/todo_bench
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any
+
+
+def _load_modules(database_url: str) -> Dict[str, Any]:
+    """Import the app modules after DATABASE_URL is set."""
+    os.environ["DATABASE_URL"] = database_url
+    package = __package__.rsplit(".", 1)[0]
+    modules = {
+        "models": importlib.import_module(f"{package}.models"),
+        "repositories": importlib.import_module(f"{package}.repositories"),
+        "retention": importlib.import_module(f"{package}.retention"),
+    }
+    from app.database import engine
+    modules["engine"] = engine
+    return modules
+
+
+def _task_list(size: int, offset: int) -> Dict[str, Any]:
+    return {
+        "tasks": [
+            {
+                "id": offset + i,
+                "title": f"Task number {offset + i} with a reasonably descriptive title",
+                "description": "Some notes about what needs to happen for this task",
+                "completed": i % 3 == 0,
+                "created_at": "2026-09-01T10:00:00",
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def _seed(modules: Dict[str, Any], conversations: int, turns: int, tasks: int, days: int) -> str:
+    from sqlmodel import SQLModel, Session
+    from app.infrastructure.models import UserDB
+
+    models = modules["models"]
+    engine = modules["engine"]
+    SQLModel.metadata.create_all(engine)
+
+    user_id = f"retention-{int(time.time())}"
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.add(UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id))
+        session.commit()
+
+        for c in range(conversations):
+            conversation = models.ConversationDB(user_id=user_id, created_at=now, updated_at=now)
+            session.add(conversation)
+            session.flush()
+            rows = []
+            for t in range(turns):
+                # Spread each conversation's turns over the last `days` days
+                created_at = now - timedelta(days=days * (1 - t / turns), minutes=c)
+                rows.append({"role": "user", "content": f"Show me my tasks ({t})", "created_at": created_at})
+                rows.append({
+                    "role": "assistant",
+                    "content": "Here are your tasks.",
+                    "tool_calls": [{
+                        "tool": "list_tasks",
+                        "arguments": {"status": "all"},
+                        "result": _task_list(tasks, t),
+                    }],
+                    "created_at": created_at + timedelta(seconds=2),
+                })
+            modules["repositories"].MessageRepository(session, user_id).add_many(conversation.id, rows)
+            session.commit()
+
+    return user_id
+
+
+def _table_bytes(engine: Any, table: str) -> int:
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            return connection.execute(text(f"SELECT pg_total_relation_size('{table}')")).scalar()
+        try:
+            return connection.execute(
+                text("SELECT SUM(pgsize) FROM dbstat WHERE name = :table"), {"table": table}
+            ).scalar() or 0
+        except Exception:
+            # dbstat not compiled in: fall back to payload bytes
+            return connection.execute(
+                text(f"SELECT SUM(LENGTH(content) + COALESCE(LENGTH(tool_calls), 0)) FROM {table}")
+            ).scalar() or 0
+
+
+def _vacuum(engine: Any) -> None:
+    """Rebuild the SQLite file so freed pages are not counted."""
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+
+
+def _measure(modules: Dict[str, Any], user_id: str, summary_keep: int, iterations: int) -> Dict[str, Any]:
+    from sqlmodel import Session, select
+
+    models = modules["models"]
+    engine = modules["engine"]
+    _vacuum(engine)
+
+    timings: Dict[str, List[float]] = {"hydrate": [], "full": [], "page": []}
+    with Session(engine) as session:
+        conversations = session.exec(
+            select(models.ConversationDB).where(models.ConversationDB.user_id == user_id)
+        ).all()
+        repo = modules["repositories"].MessageRepository(session, user_id)
+
+        # Pretend everything but the last summary_keep messages is summarized
+        latest = {
+            c.id: [m.id for m in repo.list_page(c.id, limit=summary_keep + 1)]
+            for c in conversations
+        }
+
+        for i in range(iterations):
+            conversation = conversations[i % len(conversations)]
+            ids = latest[conversation.id]
+            summary_through_id = ids[-1] if len(ids) > summary_keep else None
+
+            def timed(name: str, fn) -> None:
+                start = time.perf_counter()
+                fn()
+                timings[name].append((time.perf_counter() - start) * 1000)
+
+            timed("hydrate", lambda: repo.get_history(
+                conversation.id, after_id=summary_through_id,
+                archived_through_id=conversation.archived_through_id,
+            ))
+            timed("full", lambda: repo.get_history(
+                conversation.id, archived_through_id=conversation.archived_through_id,
+            ))
+            timed("page", lambda: repo.list_page(conversation.id, limit=50))
+
+    return {
+        "message_table_bytes": _table_bytes(engine, "message"),
+        "archive_table_bytes": _table_bytes(engine, "message_archive"),
+        "latency_ms_p50": {name: round(statistics.median(values), 3) for name, values in timings.items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure message table size and history latency before/after retention."
+    )
+    parser.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=40, help="User/assistant pairs per conversation")
+    parser.add_argument("--tasks", type=int, default=25, help="Tasks in each stored list_tasks result")
+    parser.add_argument("--days", type=int, default=90, help="Age of each conversation's first turn")
+    parser.add_argument("--summary-keep", type=int, default=20, help="Messages not yet summarized")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--archive-after-days", type=float, default=30)
+    parser.add_argument("--prune-after-days", type=float, default=7)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/retention.db"
+    modules = _load_modules(database_url)
+    user_id = _seed(modules, args.conversations, args.turns, args.tasks, args.days)
+
+    before = _measure(modules, user_id, args.summary_keep, args.iterations)
+
+    from sqlmodel import Session
+    started = time.perf_counter()
+    with Session(modules["engine"]) as session:
+        report = modules["retention"].MessageArchiver(
+            session,
+            archive_after_days=args.archive_after_days,
+            prune_after_days=args.prune_after_days,
+        ).run()
+    elapsed = time.perf_counter() - started
+
+    after = _measure(modules, user_id, args.summary_keep, args.iterations)
+
+    print(json.dumps({
+        "backend": modules["engine"].dialect.name,
+        "messages_seeded": args.conversations * args.turns * 2,
+        "before": before,
+        "retention": {**report.to_dict(), "elapsed_s": round(elapsed, 3)},
+        "after": after,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# Model Admission Benchmark
+# Spec: agent.spec.md Section 10
+#
+# Starts a local fake Gemini server that rate-limits like the real
+# provider (token bucket) and injects random 429s, points a real
+# google-genai client at it, then fires a burst of concurrent calls
+#
+#   direct     straight to the client (previous behaviour)
+#   admitted   through ModelAdmission (rate limit, semaphore, retries)
+#   coalesced  admitted, with every request using the same prompt
+#
+# and reports successes, errors surfaced to callers, 429s seen by the
+# server, latency and the admission metrics.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.model_admission
+#   python -m phase-3.backend.benchmarks.model_admission \
+#       --requests 200 --server-rate 20 --error-rate 0.1 --client-rate 18
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any
+
+from google import genai
+from google.genai import types
+
+from ..agent.admission import ModelAdmission, ModelOverloadedError, TokenBucket
+
+MODEL = "gemini-2.0-flash"
+
+
+class FakeGeminiServer:
+    """Minimal generateContent endpoint with provider-style throttling."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        error_rate: float,
+        latency_ms: float,
+        retry_after: float = 0.0,
+        seed: int = 0,
+    ):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.error_rate = error_rate
+        self.latency_ms = latency_ms
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.served = 0
+        self.throttled = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server.lock:
+                    injected = server.random.random() < server.error_rate
+                over_limit = server.bucket.reserve() > 0
+                if over_limit:
+                    server.bucket.release()
+
+                if injected or over_limit:
+                    with server.lock:
+                        server.throttled += 1
+                    body = {"error": {"code": 429, "message": "Resource has been exhausted", "status": "RESOURCE_EXHAUSTED"}}
+                    self._reply(429, body, retry_after=server.retry_after)
+                    return
+
+                time.sleep(server.latency_ms / 1000)
+                with server.lock:
+                    server.served += 1
+                self._reply(200, {
+                    "candidates": [{"content": {"role": "model", "parts": [{"text": "ok"}]}}],
+                    "usageMetadata": {"promptTokenCount": 10, "candidatesTokenCount": 1},
+                })
+
+            def _reply(self, code: int, body: Dict[str, Any], retry_after: float = 0.0) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if retry_after:
+                    self.send_header("Retry-After", f"{retry_after:g}")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.served = 0
+            self.throttled = 0
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+
+
+def _contents(i: int, same_prompt: bool) -> List[types.Content]:
+    text = "List my tasks" if same_prompt else f"List my tasks ({i})"
+    return [types.Content(role="user", parts=[types.Part(text=text)])]
+
+
+async def _scenario(
+    name: str,
+    client: Any,
+    server: FakeGeminiServer,
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    server.reset()
+    admission = None
+    if name != "direct":
+        admission = ModelAdmission(
+            rate_per_second=args.client_rate,
+            burst=args.client_burst,
+            max_concurrency=args.concurrency,
+            queue_timeout=args.queue_timeout,
+            max_retries=args.retries,
+            retry_base_seconds=args.retry_base,
+        )
+    config = types.GenerateContentConfig(max_output_tokens=16)
+
+    latencies: List[float] = []
+    outcomes = {"ok": 0, "provider_errors": 0, "shed": 0}
+
+    async def one(i: int) -> None:
+        contents = _contents(i, same_prompt=name == "coalesced")
+        start = time.perf_counter()
+        try:
+            if admission is None:
+                await asyncio.to_thread(client.models.generate_content, model=MODEL, contents=contents, config=config)
+            else:
+                await admission.generate_content(client, model=MODEL, contents=contents, config=config)
+            outcomes["ok"] += 1
+        except ModelOverloadedError:
+            outcomes["shed"] += 1
+        except Exception:
+            outcomes["provider_errors"] += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    report = {
+        "scenario": name,
+        **outcomes,
+        "server_calls_served": server.served,
+        "server_429s": server.throttled,
+        "elapsed_s": round(elapsed, 2),
+        "latency_ms": {
+            "p50": round(statistics.median(ordered), 1),
+            "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 1),
+        },
+    }
+    if admission is not None:
+        report["admission"] = admission.snapshot()
+    return report
+
+
+async def _run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    server = FakeGeminiServer(
+        rate_per_second=args.server_rate,
+        burst=args.server_burst,
+        error_rate=args.error_rate,
+        latency_ms=args.latency_ms,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    client = genai.Client(api_key="offline-benchmark", http_options={"base_url": server.url})
+    try:
+        reports = []
+        for name in ("direct", "admitted", "coalesced"):
+            reports.append(await _scenario(name, client, server, args))
+            await asyncio.sleep(args.server_burst / args.server_rate)  # let the server bucket refill
+        return reports
+    finally:
+        server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Burst model calls at a throttling fake Gemini server, with and without admission control."
+    )
+    parser.add_argument("--requests", type=int, default=120)
+    parser.add_argument("--server-rate", type=float, default=20.0, help="Fake provider quota (calls/s)")
+    parser.add_argument("--server-burst", type=int, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Random 429 probability")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After sent with 429s (0 = none)")
+    parser.add_argument("--client-rate", type=float, default=18.0, help="Admission token rate")
+    parser.add_argument("--client-burst", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--queue-timeout", type=float, default=15.0)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--retry-base", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
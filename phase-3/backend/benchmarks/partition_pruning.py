@@ -0,0 +1,171 @@
+# Task Partition Pruning Check
+# Spec: phase2/specs/database/schema.md (Partitioned tasks table)
+#
+# Runs every PostgreSQLTaskRepository method against a PostgreSQL
+# database whose tasks table is hash-partitioned by user_id (Alembic
+# revision 011), records each statement it sends to tasks, then plans
+# the statement again with EXPLAIN (FORMAT JSON) and the same parameters.
+# A statement passes when its plan reads exactly one tasks partition.
+#
+# Exits 1 if any statement reads more than one partition.
+#
+# Usage:
+#   alembic -x task_partitions=16 upgrade head      # from phase2/backend
+#   python -m phase-3.backend.benchmarks.partition_pruning \
+#       --database-url postgresql://localhost/todo_bench
+
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Set
+
+_PARTITION = re.compile(r"^tasks_p\d+$")
+_TASKS_STATEMENT = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b.*\btasks\b", re.IGNORECASE | re.DOTALL)
+
+
+def _relations(plan: Dict[str, Any], found: Set[str]) -> Set[str]:
+    if "Relation Name" in plan:
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        _relations(child, found)
+    return found
+
+
+def _exercise(repository: Any, record: Dict[str, str]) -> None:
+    """Call every repository method once, labelling the statements it sends."""
+    from app.domain.entities.task import Task
+    from app.domain.value_objects.task_status import TaskStatus
+
+    def call(name: str, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        record["method"] = name
+        return fn(*args, **kwargs)
+
+    first = call("add", repository.add, Task(id=0, title="Buy groceries", description="milk"))
+    second = call("add", repository.add, Task(id=0, title="Write report"))
+    since = datetime.utcnow() - timedelta(days=1)
+
+    call("get_by_id", repository.get_by_id, first.id)
+    call("get_all", repository.get_all)
+    call("find", repository.find, completed=False, query="groceries", limit=10)
+    call("search", repository.search, "groceries", 10)
+    call("update", repository.update, Task(id=first.id, title="Buy milk", status=TaskStatus.COMPLETED))
+    call("get_many", repository.get_many, [first.id, second.id])
+    call("complete_many", repository.complete_many, [second.id])
+    call("update_many", repository.update_many, [Task(id=second.id, title="Write the report")])
+    call("changed_since", repository.changed_since, since)
+    call("count_by_status", repository.count_by_status)
+    call("created_per_day", repository.created_per_day, since)
+    call("exists", repository.exists, first.id)
+    call("delete", repository.delete, first.id)
+    call("delete_many", repository.delete_many, [second.id])
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("TOMBSTONE_PURGE_INTERVAL_SECONDS", "0")
+
+    package = __package__.rsplit(".", 1)[0]
+    importlib.import_module(package)  # Puts phase2/backend on sys.path
+    from sqlalchemy import text
+    from sqlmodel import Session
+    from app.database import create_db_and_tables, engine
+    from app.infrastructure.models import UserDB
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This check needs a PostgreSQL --database-url")
+    with engine.connect() as connection:
+        partitions = connection.execute(text(
+            "SELECT count(*) FROM pg_inherits WHERE inhparent = 'tasks'::regclass"
+        )).scalar()
+    if not partitions:
+        raise SystemExit("tasks is not partitioned; run `alembic upgrade head` first")
+    create_db_and_tables()
+
+    user_id = f"pruning-{int(time.time())}"
+    with Session(engine) as session:
+        session.add(UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id))
+        session.commit()
+
+    results = check_pruning(engine, user_id)
+    return {
+        "partitions": partitions,
+        "statements": len(results),
+        "not_pruned": [r for r in results if not r["pruned"]],
+        "results": results,
+    }
+
+
+def check_pruning(engine: Any, user_id: str) -> List[Dict[str, Any]]:
+    """
+    Run every repository method for user_id and plan each tasks statement.
+
+    Also used by phase2/backend/tests/integration/test_partition_pruning.py.
+
+    Returns:
+        One {method, statement, partitions_scanned, pruned} dict per statement
+    """
+    from sqlalchemy import event
+    from sqlmodel import Session
+    from app.infrastructure.repositories import PostgreSQLTaskRepository
+
+    record: Dict[str, str] = {"method": ""}
+    captured: List[Dict[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and _TASKS_STATEMENT.match(statement):
+            captured.append({"method": record["method"], "statement": statement, "parameters": parameters})
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            _exercise(PostgreSQLTaskRepository(session, user_id), record)
+            session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    results = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for item in captured:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + item["statement"], item["parameters"])
+            plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            scanned = sorted(name for name in _relations(plan[0]["Plan"], set()) if _PARTITION.match(name))
+            results.append({
+                "method": item["method"],
+                "statement": " ".join(item["statement"].split())[:120],
+                "partitions_scanned": scanned,
+                "pruned": len(scanned) == 1,
+            })
+        raw.rollback()
+    finally:
+        raw.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check that task repository queries touch one tasks partition."
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        required="DATABASE_URL" not in os.environ,
+        help="PostgreSQL URL with a hash-partitioned tasks table",
+    )
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if report["not_pruned"] or not report["statements"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
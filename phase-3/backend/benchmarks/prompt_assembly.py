@@ -0,0 +1,100 @@
+# Prompt Assembly Microbenchmark
+# Spec: agent.spec.md Section 8.2
+#
+# Times how long the executor takes to turn hydrated history into the
+# Gemini request (contents + config) for one turn.
+#
+#   legacy  Rebuild tool declarations, GenerateContentConfig and every
+#           types.Content from scratch (pre-cache behaviour)
+#   cached  Static config built once; history Contents reused from the
+#           per-conversation cache, only the new message is converted
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.prompt_assembly
+#   python -m phase-3.backend.benchmarks.prompt_assembly --sizes 20 200 1000 --iterations 500
+
+import argparse
+import json
+import statistics
+import time
+from typing import List, Dict, Any
+
+from ..agent.prompt import (
+    HistoryContentCache,
+    get_generate_config,
+    build_function_declarations,
+    build_generate_config,
+    to_content,
+)
+
+
+def _history(size: int) -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": "system"}]
+    for i in range(size):
+        role = "user" if i % 2 == 0 else "assistant"
+        text = (
+            f"Please add a task to review chapter {i} of the report before Friday"
+            if role == "user"
+            else f"Done! I've added 'Review chapter {i}' to your list (Task #{i})."
+        )
+        messages.append({"id": i + 1, "role": role, "content": text})
+    return messages
+
+
+def _legacy(messages: List[Dict[str, Any]]) -> Any:
+    contents = [to_content(msg) for msg in messages if msg["role"] != "system"]
+    config = build_generate_config(build_function_declarations())
+    return contents, config
+
+
+def _time(fn, iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def run(size: int, iterations: int) -> Dict[str, Any]:
+    history = _history(size)
+
+    legacy = _time(lambda: _legacy(history), iterations)
+
+    # Steady state: history already cached, one new message per turn
+    cache = HistoryContentCache()
+    cache.contents("bench", 1, history)
+    next_id = [size + 1]
+
+    def cached_turn() -> Any:
+        history.append({"id": next_id[0], "role": "user", "content": "And one more thing"})
+        next_id[0] += 1
+        contents = cache.contents("bench", 1, history)
+        history.pop(1)  # Keep the window size constant
+        return contents, get_generate_config()
+
+    cached = _time(cached_turn, iterations)
+
+    legacy_p50 = statistics.median(legacy)
+    cached_p50 = statistics.median(cached)
+    return {
+        "history_messages": size,
+        "legacy_p50_us": round(legacy_p50, 1),
+        "cached_p50_us": round(cached_p50, 1),
+        "speedup": round(legacy_p50 / cached_p50, 1) if cached_p50 else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare legacy and cached prompt assembly cost per turn."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(json.dumps([run(size, args.iterations) for size in args.sizes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
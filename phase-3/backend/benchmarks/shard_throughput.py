@@ -0,0 +1,148 @@
+# Task Shard Throughput Benchmark
+# Spec: phase2/specs/database/schema.md (Task Sharding)
+#
+# Measures task write throughput as the number of task shards grows.
+# For each shard count, --workers processes add tasks for --users users
+# for --seconds, each write going through the Phase II add-task path
+# (AddTaskUseCase -> PostgreSQLTaskRepository, counters included) on the
+# engine ShardMap picks for the user. Worker count and users stay fixed,
+# so the speedup comes only from spreading users over more databases.
+#
+# Without --database-urls every shard is a fresh SQLite file in a temp
+# directory (one writer per file at a time, commits fsync'd). With
+# --database-urls the first N URLs are used for N shards; their tasks
+# tables should be empty (see app.infrastructure.rebalance for IDs).
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.shard_throughput --shards 1 2 4 --workers 8
+#   python -m phase-3.backend.benchmarks.shard_throughput --shards 1 2 \
+#       --database-urls postgresql://localhost/shard0 postgresql://localhost/shard1
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+_PACKAGE = __package__.rsplit(".", 1)[0]
+
+
+def _configure(urls: List[str]) -> None:
+    """Point the Phase II settings at the shards (before app is imported)."""
+    os.environ["DATABASE_URL"] = urls[0]
+    os.environ["DATABASE_SHARDS"] = json.dumps({str(i): url for i, url in enumerate(urls) if i})
+    os.environ["SHARD_RING"] = ""
+    os.environ.setdefault("TOMBSTONE_PURGE_INTERVAL_SECONDS", "0")
+    importlib.import_module(_PACKAGE)  # Puts phase2/backend on sys.path
+
+
+def _setup(urls: List[str], users: List[str]) -> None:
+    _configure(urls)
+    from sqlmodel import Session, select
+    from app.database import create_db_and_tables, engine
+    from app.infrastructure.models import UserDB
+
+    create_db_and_tables()
+    with Session(engine) as session:
+        existing = set(session.exec(select(UserDB.id).where(UserDB.id.in_(users))))
+        session.add_all(
+            UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id)
+            for user_id in users if user_id not in existing
+        )
+        session.commit()
+
+
+def _worker(urls: List[str], users: List[str], seconds: float, start: Any, results: Any) -> None:
+    _configure(urls)
+    from sqlmodel import Session
+    from app.application.use_cases import AddTaskUseCase
+    from app.database import shard_map
+    from app.infrastructure.repositories import PostgreSQLTaskRepository
+
+    # Warm up: copy user rows to their shards, open one connection each
+    for user_id in users:
+        shard_map.engine_for(user_id, for_write=True)
+
+    per_shard = {shard_id: 0 for shard_id in shard_map.engines}
+    errors = 0
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        user_id = users[i % len(users)]
+        i += 1
+        try:
+            with Session(shard_map.engine_for(user_id, for_write=True)) as session:
+                AddTaskUseCase(PostgreSQLTaskRepository(session, user_id)).execute(title=f"bench-{i}")
+                session.commit()
+            per_shard[shard_map.shard_for(user_id)] += 1
+        except Exception:
+            errors += 1
+    results.put({"per_shard": per_shard, "errors": errors})
+
+
+def run(shards: int, args: argparse.Namespace, workdir: str) -> Dict[str, Any]:
+    if args.database_urls:
+        if len(args.database_urls) < shards:
+            raise SystemExit(f"--database-urls has fewer than {shards} URLs")
+        urls = args.database_urls[:shards]
+    else:
+        urls = [f"sqlite:///{workdir}/shards{shards}_{i}.db" for i in range(shards)]
+
+    users = [f"shard-bench-{i}" for i in range(args.users)]
+    context = multiprocessing.get_context("spawn")
+    setup = context.Process(target=_setup, args=(urls, users))
+    setup.start()
+    setup.join()
+
+    start = context.Event()
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(urls, users[i::args.workers], args.seconds, start, results))
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    time.sleep(args.warmup_seconds)
+    start.set()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    per_shard = {shard_id: sum(r["per_shard"].get(shard_id, 0) for r in reports) for shard_id in range(shards)}
+    total = sum(per_shard.values())
+    return {
+        "shards": shards,
+        "workers": args.workers,
+        "writes": total,
+        "errors": sum(r["errors"] for r in reports),
+        "writes_per_s": round(total / args.seconds, 1),
+        "writes_per_shard": per_shard,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure task write throughput against 1..N shards.")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workers", type=int, default=8, help="Writer processes (same for every shard count)")
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--warmup-seconds", type=float, default=3.0, help="Time given to workers to import the app")
+    parser.add_argument("--database-urls", nargs="+", help="Shard URLs, shard 0 first (default: temp SQLite files)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        report = [run(shards, args, workdir) for shards in args.shards]
+
+    base = report[0]["writes_per_s"] / report[0]["shards"]
+    for row in report:
+        row["speedup"] = round(row["writes_per_s"] / report[0]["writes_per_s"], 2) if report[0]["writes_per_s"] else None
+        row["scaling_efficiency"] = round(row["writes_per_s"] / (base * row["shards"]), 2) if base else None
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
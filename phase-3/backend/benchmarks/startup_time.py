@@ -0,0 +1,133 @@
+# Startup Time Benchmark
+# Spec: chat-api.spec.md Section 7.4
+#
+# Measures how long importing the Phase III app takes in a fresh
+# interpreter (the cold-start cost of every autoscaled container) and
+# fails when it regresses:
+#
+#   - median wall time over --runs plain imports must be <= --budget-ms
+#   - modules that must stay lazy (google.genai by default) must not be
+#     imported at startup
+#
+# One extra run with `python -X importtime` breaks the time down by
+# top-level package.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.startup_time
+#   python -m phase-3.backend.benchmarks.startup_time --budget-ms 900 --runs 9
+#
+# Exit status is 1 when a check fails, so it can gate CI.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Any
+
+DEFAULT_MODULE = "phase-3.backend.api.main"
+DEFAULT_BUDGET_MS = 1300.0
+DEFAULT_LAZY_MODULES = ["google.genai"]
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Settings are read at import; no database connection is opened
+    env.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/startup_benchmark.db")
+    env.setdefault("GEMINI_API_KEY", "startup-benchmark")
+    return env
+
+
+def _probe(module: str, lazy: List[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _PROBE.format(module=module, lazy=lazy)]
+    result = subprocess.run(command, cwd=_REPO_ROOT, env=_env(), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr}")
+    return result
+
+
+def _by_package(importtime_log: str) -> Dict[str, float]:
+    """Sum self time (ms) per top-level package from -X importtime output."""
+    totals: Dict[str, float] = defaultdict(float)
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, self_us, _cumulative, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        package = name.split(".")[0]
+        if package in ("phase-3", "app"):
+            package = ".".join(name.split(".")[:3]) if package == "phase-3" else "app (phase II)"
+        totals[package] += int(self_us) / 1000
+    return totals
+
+
+def run(module: str, runs: int, budget_ms: float, lazy: List[str], top: int) -> Dict[str, Any]:
+    samples = []
+    eager: set = set()
+    for _ in range(runs):
+        probe = json.loads(_probe(module, lazy).stdout.strip().splitlines()[-1])
+        samples.append(probe["ms"])
+        eager.update(probe["loaded"])
+
+    breakdown = _by_package(_probe(module, lazy, importtime=True).stderr)
+    heaviest = sorted(breakdown.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    median = statistics.median(samples)
+    failures = []
+    if median > budget_ms:
+        failures.append(f"median import time {median:.0f} ms exceeds budget {budget_ms:.0f} ms")
+    for name in sorted(eager):
+        failures.append(f"{name} is imported at startup (must stay lazy)")
+
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": {
+            "median": round(median, 1),
+            "min": round(min(samples), 1),
+            "max": round(max(samples), 1),
+        },
+        "budget_ms": budget_ms,
+        "self_ms_by_package": {name: round(ms, 1) for name, ms in heaviest},
+        "failures": failures,
+        "ok": not failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check the Phase III app's cold import time against a budget."
+    )
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument(
+        "--lazy", nargs="*", default=DEFAULT_LAZY_MODULES,
+        help="Modules that must not be imported at startup",
+    )
+    parser.add_argument("--top", type=int, default=12, help="Packages shown in the breakdown")
+    args = parser.parse_args()
+
+    report = run(args.module, args.runs, args.budget_ms, args.lazy, args.top)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
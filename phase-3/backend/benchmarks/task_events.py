@@ -0,0 +1,228 @@
+# Task Event Fan-out Benchmark
+# Spec: phase2/specs/api/rest-endpoints.md Section 10
+#
+# Measures notification latency of the task change push path against a
+# local PostgreSQL: UPDATE + COMMIT -> tasks_notify_change trigger ->
+# NOTIFY -> the worker's single LISTEN connection -> TaskEventHub ->
+# subscriber queues (one per open SSE stream).
+#
+# Subscribers are spread evenly over --users users (browser tabs of the
+# same user share a user_id). A writer thread updates one task per event,
+# round-robin over the users, at --rate events/s. Latency is measured from
+# just before COMMIT to the moment each subscriber's queue yields the event.
+#
+# Exits 1 if any expected delivery is missing.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.task_events \
+#       --database-url postgresql://localhost/todo_bench --subscribers 1000 --users 100
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+NOTIFY_MIGRATION = (
+    Path(__file__).resolve().parents[3]
+    / "phase2" / "backend" / "alembic" / "versions" / "20261019_0700_add_task_change_notify.py"
+)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(_percentile(values, 50), 2),
+        "p95": round(_percentile(values, 95), 2),
+        "p99": round(_percentile(values, 99), 2),
+        "max": round(max(values), 2) if values else 0.0,
+        "mean": round(statistics.fmean(values), 2) if values else 0.0,
+    }
+
+
+def _install_trigger(engine: Any) -> None:
+    """Apply Alembic revision 008 unless its trigger already exists."""
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import text
+
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_notify_change'")
+        ).first()
+        if exists:
+            return
+
+        spec = importlib.util.spec_from_file_location("task_change_notify", NOTIFY_MIGRATION)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+
+def _prepare(users: List[str]) -> Dict[str, int]:
+    """Create one task per user; return user_id -> task_id."""
+    from sqlmodel import SQLModel, Session, select
+    from app.database import engine
+    from app.infrastructure.models import TaskDB, UserDB
+
+    SQLModel.metadata.create_all(engine)
+    _install_trigger(engine)
+
+    with Session(engine) as session:
+        existing = set(session.exec(select(UserDB.id).where(UserDB.id.in_(users))))
+        for user_id in users:
+            if user_id not in existing:
+                session.add(UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id))
+        session.commit()
+
+        tasks = {user_id: TaskDB(user_id=user_id, title="bench") for user_id in users}
+        session.add_all(tasks.values())
+        session.commit()
+        return {user_id: task.id for user_id, task in tasks.items()}
+
+
+def _write(
+    users: List[str],
+    task_ids: Dict[str, int],
+    events: int,
+    rate: float,
+    sent: Dict[int, float],
+) -> None:
+    """Update one task per event (round-robin over users), recording the send time."""
+    from datetime import datetime
+    from sqlalchemy import update
+    from sqlmodel import Session
+    from app.database import engine
+    from app.infrastructure.models import TaskDB
+
+    interval = 1.0 / rate if rate > 0 else 0.0
+    with Session(engine) as session:
+        next_at = time.perf_counter()
+        for i in range(events):
+            user_id = users[i % len(users)]
+            session.exec(
+                update(TaskDB)
+                .where(TaskDB.id == task_ids[user_id])
+                .values(title=f"bench-{i}", updated_at=datetime.utcnow())
+            )
+            sent[i] = time.perf_counter()
+            session.commit()
+
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("TOMBSTONE_PURGE_INTERVAL_SECONDS", "0")
+
+    package = __package__.rsplit(".", 1)[0]
+    importlib.import_module(package)  # Puts phase2/backend on sys.path
+    from app.infrastructure.task_events import TaskEventHub, live_events_supported
+
+    if not live_events_supported():
+        raise SystemExit("This benchmark needs a PostgreSQL --database-url")
+
+    run_id = f"{int(time.time())}"
+    users = [f"events-{run_id}-{i}" for i in range(args.users)]
+    task_ids = await asyncio.to_thread(_prepare, users)
+
+    hub = TaskEventHub(queue_size=max(100, args.events))
+    per_user = [args.subscribers // args.users + (i < args.subscribers % args.users) for i in range(args.users)]
+    received: Dict[int, List[float]] = {i: [] for i in range(args.events)}
+
+    async def consume(queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            now = time.perf_counter()
+            title = event["data"].get("title", "") if event["event"] == "upsert" else ""
+            if title.startswith("bench-") and int(title[6:]) in received:
+                received[int(title[6:])].append(now)
+
+    consumers = []
+    for user_id, count in zip(users, per_user):
+        for _ in range(count):
+            consumers.append(asyncio.create_task(consume(hub.subscribe(user_id))))
+
+    while not hub.snapshot()["listening"]:
+        await asyncio.sleep(0.05)
+
+    sent: Dict[int, float] = {}
+    started = time.perf_counter()
+    await asyncio.to_thread(_write, users, task_ids, args.events, args.rate, sent)
+    await asyncio.sleep(args.drain_seconds)
+    elapsed = time.perf_counter() - started
+
+    for consumer in consumers:
+        consumer.cancel()
+    await hub.close()
+
+    deliveries: List[float] = []
+    first: List[float] = []
+    last: List[float] = []
+    for i, times in received.items():
+        if not times or i not in sent:
+            continue
+        latencies = [(t - sent[i]) * 1000 for t in times]
+        deliveries.extend(latencies)
+        first.append(min(latencies))
+        last.append(max(latencies))
+
+    expected = sum(per_user[i % args.users] for i in range(args.events))
+    return {
+        "subscribers": args.subscribers,
+        "users": args.users,
+        "events": args.events,
+        "rate_per_s": args.rate,
+        "elapsed_s": round(elapsed, 3),
+        "notifications": hub.notifications,
+        "deliveries": len(deliveries),
+        "expected_deliveries": expected,
+        "subscribers_per_user": max(per_user),
+        "overflows": hub.overflows,
+        "latency_ms": _summary(deliveries),
+        "first_subscriber_ms": _summary(first),
+        "last_subscriber_ms": _summary(last),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure task change notification latency through LISTEN/NOTIFY fan-out."
+    )
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL"),
+        required="DATABASE_URL" not in os.environ,
+        help="PostgreSQL URL (tables and the notify trigger are created if missing)",
+    )
+    parser.add_argument("--subscribers", type=int, default=1000, help="Open subscriptions (SSE streams)")
+    parser.add_argument("--users", type=int, default=100, help="Users the subscribers are spread over")
+    parser.add_argument("--events", type=int, default=500, help="Task updates to commit")
+    parser.add_argument("--rate", type=float, default=100.0, help="Updates per second (0 = unpaced)")
+    parser.add_argument("--drain-seconds", type=float, default=1.0, help="Wait for stragglers after the last commit")
+    args = parser.parse_args()
+
+    report = asyncio.run(_run(args))
+    print(json.dumps(report, indent=2))
+    if report["deliveries"] < report["expected_deliveries"] or report["overflows"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
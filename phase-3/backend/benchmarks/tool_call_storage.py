@@ -0,0 +1,144 @@
+# Tool Call Storage Benchmark
+# Spec: conversation.spec.md Section 12
+#
+# Writes the same scripted turns twice, once with full tool results in
+# message.tool_calls (legacy) and once through ToolResultRepository.compact,
+# then compares per-message tool_calls size and get_history time.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.tool_call_storage
+#   python -m phase-3.backend.benchmarks.tool_call_storage --conversations 50 --turns 40 --tasks 40
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Any
+
+
+def _load_modules(database_url: str) -> Dict[str, Any]:
+    """Import the app modules after DATABASE_URL is set."""
+    os.environ["DATABASE_URL"] = database_url
+    package = __package__.rsplit(".", 1)[0]
+    modules = {
+        "models": importlib.import_module(f"{package}.models"),
+        "repositories": importlib.import_module(f"{package}.repositories"),
+    }
+    from app.database import engine
+    modules["engine"] = engine
+    return modules
+
+
+def _tool_calls(turn: int, tasks: int) -> List[Dict[str, Any]]:
+    """A list_tasks call; the list only changes every fourth turn."""
+    version = turn // 4
+    return [{
+        "tool": "list_tasks",
+        "arguments": {"status": "all", "query": None, "limit": None},
+        "result": {"tasks": [
+            {
+                "id": i,
+                "title": f"Task number {i} with a reasonably descriptive title",
+                "description": "Some notes about what needs to happen for this task",
+                "completed": (i + version) % 3 == 0,
+                "created_at": "2026-09-01T10:00:00",
+            }
+            for i in range(tasks)
+        ]},
+    }]
+
+
+def _seed(modules: Dict[str, Any], user_id: str, compact: bool, args: argparse.Namespace) -> List[int]:
+    from sqlmodel import Session
+    from app.infrastructure.models import UserDB
+
+    repositories = modules["repositories"]
+    conversation_ids = []
+    with Session(modules["engine"]) as session:
+        session.add(UserDB(id=user_id, email=f"{user_id}@bench.local", name=user_id))
+        session.commit()
+        tool_results = repositories.ToolResultRepository(session, user_id)
+
+        for _ in range(args.conversations):
+            conversation = repositories.ConversationRepository(session, user_id).create()
+            conversation_ids.append(conversation.id)
+            rows = []
+            for turn in range(args.turns):
+                tool_calls = _tool_calls(turn, args.tasks)
+                if compact:
+                    tool_calls = tool_results.compact(tool_calls)
+                rows.append({"role": "user", "content": f"Show me my tasks ({turn})"})
+                rows.append({"role": "assistant", "content": "Here are your tasks.", "tool_calls": tool_calls})
+            repositories.MessageRepository(session, user_id).add_many(conversation.id, rows)
+            session.commit()
+    return conversation_ids
+
+
+def _measure(modules: Dict[str, Any], user_id: str, conversation_ids: List[int], iterations: int) -> Dict[str, Any]:
+    from sqlalchemy import text
+    from sqlmodel import Session
+
+    engine = modules["engine"]
+    with engine.connect() as connection:
+        row_bytes = connection.execute(
+            text(
+                "SELECT AVG(LENGTH(CAST(tool_calls AS TEXT))) FROM message "
+                "WHERE user_id = :user_id AND role = 'assistant'"
+            ),
+            {"user_id": user_id},
+        ).scalar()
+        stored = connection.execute(
+            text("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM tool_result WHERE user_id = :user_id"),
+            {"user_id": user_id},
+        ).one()
+
+    samples = []
+    with Session(engine) as session:
+        repo = modules["repositories"].MessageRepository(session, user_id)
+        for i in range(iterations):
+            start = time.perf_counter()
+            repo.get_history(conversation_ids[i % len(conversation_ids)])
+            samples.append((time.perf_counter() - start) * 1000)
+            session.expunge_all()
+
+    return {
+        "avg_assistant_tool_calls_bytes": round(row_bytes or 0, 1),
+        "tool_result_rows": stored[0],
+        "tool_result_bytes": stored[1],
+        "get_history_p50_ms": round(statistics.median(samples), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare legacy and compact tool_calls storage."
+    )
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20, help="User/assistant pairs per conversation")
+    parser.add_argument("--tasks", type=int, default=25, help="Tasks in each list_tasks result")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/tool_calls.db"
+    modules = _load_modules(database_url)
+
+    from sqlmodel import SQLModel
+    from app.infrastructure.models import UserDB  # noqa: F401 (registers "user")
+    SQLModel.metadata.create_all(modules["engine"])
+
+    run_id = int(time.time())
+    report = {"backend": modules["engine"].dialect.name}
+    for mode in ("legacy", "compact"):
+        user_id = f"storage-{mode}-{run_id}"
+        conversation_ids = _seed(modules, user_id, mode == "compact", args)
+        report[mode] = _measure(modules, user_id, conversation_ids, args.iterations)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
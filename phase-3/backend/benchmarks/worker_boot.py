@@ -0,0 +1,175 @@
+# Worker Boot Benchmark
+# Spec: phase2/specs/database/schema.md (Startup schema check)
+#
+# Measures how long a fresh worker takes to become ready: importing the
+# app, then running its ASGI lifespan startup (what uvicorn/gunicorn
+# wait for before accepting requests), once per STARTUP_SCHEMA mode:
+#
+#   create_all  SQLModel.metadata.create_all on every boot (previous behaviour)
+#   check       one alembic_version read per database
+#
+# Each mode can also be run with POOL_WARM_UP_CONNECTIONS > 0.
+#
+# Without --database-url the database is a temp SQLite file migrated with
+# `alembic upgrade head`; with it, that database must already be migrated.
+# SQLite's catalog is in-process, so create_all costs far less there than
+# on a remote PostgreSQL server, where each table check is a round trip.
+# --round-trip-ms models that server: every statement sleeps that long
+# and every new connection four times that (TCP, TLS and auth).
+# The statements each mode sends during startup are counted.
+#
+# Usage:
+#   python -m phase-3.backend.benchmarks.worker_boot --runs 5 --round-trip-ms 2
+#   python -m phase-3.backend.benchmarks.worker_boot --warm-up 0 5 \
+#       --database-url postgresql://localhost/todo_bench
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+DEFAULT_MODULE = "phase-3.backend.api.main"
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_BACKEND = _REPO_ROOT / "phase2" / "backend"
+
+_PROBE = """
+import asyncio, importlib, json, logging, sys, time
+sys.path.insert(0, {backend!r})
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+app = importlib.import_module({module!r}).app
+from sqlalchemy import event
+from app.database import replica_engine, shard_map
+statements = []
+for engine in list(shard_map.engines.values()) + [replica_engine]:
+    if engine is None:
+        continue
+    @event.listens_for(engine, "before_cursor_execute")
+    def round_trip(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+        time.sleep({round_trip_ms} / 1000)
+    @event.listens_for(engine, "do_connect")
+    def handshake(dialect, connection_record, cargs, cparams):
+        time.sleep(4 * {round_trip_ms} / 1000)
+imported = time.perf_counter()
+
+async def lifespan():
+    messages = asyncio.Queue()
+    await messages.put({{"type": "lifespan.startup"}})
+    sent = []
+    ready = asyncio.Event()
+
+    async def send(message):
+        sent.append(message)
+        if message["type"].startswith("lifespan.startup."):
+            ready.set()
+
+    task = asyncio.create_task(app({{"type": "lifespan", "asgi": {{"version": "3.0"}}, "state": {{}}}}, messages.get, send))
+    await ready.wait()
+    started = time.perf_counter()
+    await messages.put({{"type": "lifespan.shutdown"}})
+    await task
+    return started, sent[0]
+
+started, result = asyncio.run(lifespan())
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "statements": len(statements),
+    "ok": result["type"] == "lifespan.startup.complete",
+    "message": result.get("message", ""),
+}}))
+"""
+
+
+def _env(database_url: str, mode: str, warm_up: int) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": database_url,
+        "STARTUP_SCHEMA": mode,
+        "POOL_WARM_UP_CONNECTIONS": str(warm_up),
+        "TOMBSTONE_PURGE_INTERVAL_SECONDS": "0",
+        "AGENT_WARM_UP": "0",
+    })
+    env.setdefault("GEMINI_API_KEY", "worker-boot-benchmark")
+    return env
+
+
+def _migrate(database_url: str) -> None:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=_BACKEND, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"alembic upgrade head failed:\n{result.stderr}")
+
+
+def _boot(module: str, database_url: str, mode: str, warm_up: int, round_trip_ms: float) -> Dict[str, Any]:
+    probe = _PROBE.format(backend=str(_BACKEND), module=module, round_trip_ms=round_trip_ms)
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=_REPO_ROOT, env=_env(database_url, mode, warm_up), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Booting {module} failed:\n{result.stderr}")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    if not probe["ok"]:
+        raise SystemExit(f"Startup failed in mode {mode}: {probe['message']}")
+    return probe
+
+
+def run(args: argparse.Namespace, database_url: str) -> List[Dict[str, Any]]:
+    report = []
+    for mode in args.modes:
+        for warm_up in args.warm_up:
+            samples = [
+                _boot(args.module, database_url, mode, warm_up, args.round_trip_ms) for _ in range(args.runs)
+            ]
+            startup = [sample["startup_ms"] for sample in samples]
+            total = [sample["import_ms"] + sample["startup_ms"] for sample in samples]
+            report.append({
+                "startup_schema": mode,
+                "pool_warm_up_connections": warm_up,
+                "startup_statements": samples[-1]["statements"],
+                "startup_ms_median": round(statistics.median(startup), 1),
+                "boot_ms_median": round(statistics.median(total), 1),
+                "boot_ms_min": round(min(total), 1),
+            })
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure worker boot time per startup schema mode.")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["create_all", "check"])
+    parser.add_argument("--warm-up", type=int, nargs="+", default=[0], help="POOL_WARM_UP_CONNECTIONS values")
+    parser.add_argument("--database-url", help="Migrated database (default: temp SQLite)")
+    parser.add_argument("--round-trip-ms", type=float, default=0.0, help="Simulated server round trip")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = args.database_url
+        if not database_url:
+            database_url = f"sqlite:///{workdir}/worker_boot.db"
+            _migrate(database_url)
+            # The user table belongs to Better Auth, not the migrations;
+            # create it untimed so create_all runs only find tables
+            _boot(args.module, database_url, "create_all", 0, 0.0)
+        report = run(args, database_url)
+
+    base = report[0]["startup_ms_median"]
+    for row in report:
+        row["startup_saved_ms"] = round(base - row["startup_ms_median"], 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
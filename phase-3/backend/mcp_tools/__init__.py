@@ -10,15 +10,23 @@
 from .tools import (
     add_task,
     list_tasks,
+    search_tasks,
     complete_task,
     delete_task,
     update_task,
+    complete_tasks,
+    delete_tasks,
+    update_tasks,
 )
 
 __all__ = [
     "add_task",
     "list_tasks",
+    "search_tasks",
     "complete_task",
     "delete_task",
     "update_task",
+    "complete_tasks",
+    "delete_tasks",
+    "update_tasks",
 ]
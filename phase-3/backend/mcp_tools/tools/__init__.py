@@ -6,14 +6,22 @@
 
 from .add_task import add_task
 from .list_tasks import list_tasks
+from .search_tasks import search_tasks
 from .complete_task import complete_task
 from .delete_task import delete_task
 from .update_task import update_task
+from .complete_tasks import complete_tasks
+from .delete_tasks import delete_tasks
+from .update_tasks import update_tasks
 
 __all__ = [
     "add_task",
     "list_tasks",
+    "search_tasks",
     "complete_task",
     "delete_task",
     "update_task",
+    "complete_tasks",
+    "delete_tasks",
+    "update_tasks",
 ]
@@ -4,34 +4,37 @@
 # This module provides the adapter pattern for connecting MCP tools to Phase II.
 # It handles session management and repository instantiation.
 
-import sys
-from pathlib import Path
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Tuple, Any, List, Optional
 
-# Add phase2 to path for imports
-# This allows importing Phase II modules without modifying them
-_phase2_path = Path(__file__).parent.parent.parent.parent.parent / "phase2" / "backend"
-if str(_phase2_path) not in sys.path:
-    sys.path.insert(0, str(_phase2_path))
+from ...observability import span
 
 # Phase II imports (READ-ONLY usage)
-from sqlmodel import Session
-from app.database import engine
+from sqlmodel import Session, select, func
+from app.database import shard_map
+from app.infrastructure.models import TaskDB
 from app.infrastructure.repositories import PostgreSQLTaskRepository
 from app.domain.exceptions import TaskNotFoundError, TaskValidationError
 
+# Maximum number of task IDs accepted by one batch tool call
+MAX_BATCH_SIZE = 100
+
 
 @contextmanager
-def get_task_repository(user_id: str) -> Generator[PostgreSQLTaskRepository, None, None]:
+def get_task_repository(
+    user_id: str, for_write: bool = True
+) -> Generator[PostgreSQLTaskRepository, None, None]:
     """
     Context manager that provides a user-scoped task repository.
 
     This is the ADAPTER pattern - we create a Phase II repository
     with proper user isolation, then yield it for use case execution.
+    The session is opened on the user's task shard.
 
     Args:
         user_id: Authenticated user ID for data isolation
+        for_write: The tool modifies tasks (refused while the user is
+            being moved between shards)
 
     Yields:
         PostgreSQLTaskRepository scoped to the user
@@ -41,12 +44,40 @@ def get_task_repository(user_id: str) -> Generator[PostgreSQLTaskRepository, Non
             use_case = ListTasksUseCase(repo)
             tasks = use_case.execute()
     """
-    with Session(engine) as session:
+    shard_engine = shard_map.engine_for(user_id, for_write=for_write)
+    with span("mcp.repository_session"), Session(shard_engine) as session:
         repository = PostgreSQLTaskRepository(session, user_id)
         yield repository
         session.commit()
 
 
+def get_task_collection_version(session: Session, user_id: str) -> Tuple[Any, ...]:
+    """
+    Return a cheap fingerprint of the user's task collection.
+
+    Any add, update, complete or delete changes the task count or the
+    newest updated_at, whichever process or API performed it.
+
+    Args:
+        session: Database session to run the query on, unless the
+            user's tasks live on another shard
+        user_id: User whose tasks are fingerprinted
+
+    Returns:
+        (task_count, max_updated_at) tuple
+    """
+    statement = select(func.count(TaskDB.id), func.max(TaskDB.updated_at)).where(
+        TaskDB.user_id == user_id
+    )
+    shard_engine = shard_map.engine_for(user_id)
+    if shard_engine is session.get_bind():
+        count, latest = session.exec(statement).one()
+    else:
+        with Session(shard_engine) as shard_session:
+            count, latest = shard_session.exec(statement).one()
+    return count, latest.isoformat() if latest else None
+
+
 def format_task_result(task, status: str) -> dict:
     """
     Format a Phase II Task domain object into MCP tool result.
@@ -65,16 +96,24 @@ def format_task_result(task, status: str) -> dict:
     }
 
 
-def format_task_list_item(task) -> dict:
+def format_task_list_item(task, compact: bool = False) -> dict:
     """
     Format a Phase II Task for list_tasks response.
 
     Args:
         task: Phase II Task domain entity
+        compact: Omit the description (fewer tokens in the model context)
 
     Returns:
         Dict with id, title, description, completed
+        (id, title, completed when compact)
     """
+    if compact:
+        return {
+            "id": task.id,
+            "title": task.title,
+            "completed": task.status.is_completed(),
+        }
     return {
         "id": task.id,
         "title": task.title,
@@ -83,6 +122,59 @@ def format_task_list_item(task) -> dict:
     }
 
 
+def normalize_task_ids(task_ids: Any) -> Tuple[List[int], Optional[dict]]:
+    """
+    Validate the task ID list of a batch tool call.
+
+    Duplicates are dropped, keeping first-seen order.
+
+    Args:
+        task_ids: Raw task_ids argument from the model
+
+    Returns:
+        (unique task IDs, None) when valid, ([], error dict) otherwise
+    """
+    if not isinstance(task_ids, (list, tuple)) or not task_ids:
+        return [], format_error(
+            error_type="validation",
+            message="task_ids must be a non-empty list of task IDs",
+        )
+
+    try:
+        ids = list(dict.fromkeys(int(task_id) for task_id in task_ids))
+    except (TypeError, ValueError):
+        return [], format_error(
+            error_type="validation",
+            message="task_ids must contain only integer task IDs",
+        )
+
+    if len(ids) > MAX_BATCH_SIZE:
+        return [], format_error(
+            error_type="validation",
+            message=f"At most {MAX_BATCH_SIZE} tasks can be changed per call",
+        )
+
+    return ids, None
+
+
+def format_batch_result(results: List[dict]) -> dict:
+    """
+    Format per-task outcomes of a batch tool call.
+
+    Args:
+        results: One task result or error dict per requested task, in request order
+
+    Returns:
+        Dict with results plus succeeded/failed counts
+    """
+    failed = sum(1 for result in results if "error" in result)
+    return {
+        "results": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+    }
+
+
 def format_error(error_type: str, message: str, **extra) -> dict:
     """
     Format an error response for MCP tool.
@@ -4,8 +4,6 @@
 # Creates a new task by delegating to Phase II AddTaskUseCase.
 # This is an ADAPTER - no CRUD logic here, only delegation.
 
-import sys
-from pathlib import Path
 from typing import Optional
 
 from ._adapter import (
@@ -15,10 +13,6 @@ from ._adapter import (
 )
 
 # Phase II import
-_phase2_path = Path(__file__).parent.parent.parent.parent.parent / "phase2" / "backend"
-if str(_phase2_path) not in sys.path:
-    sys.path.insert(0, str(_phase2_path))
-
 from app.application.use_cases import AddTaskUseCase
 from app.domain.exceptions import TaskValidationError
 
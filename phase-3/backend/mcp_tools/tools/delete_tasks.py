@@ -0,0 +1,71 @@
+# delete_tasks MCP Tool (batch)
+# Spec: mcp-tools.spec.md Section 4.6
+#
+# Deletes several tasks in one transaction by delegating to
+# Phase II DeleteTasksUseCase (one SELECT ... IN, one DELETE ... IN).
+# This is an ADAPTER - no CRUD logic here, only delegation.
+
+from typing import List
+
+from ._adapter import (
+    get_task_repository,
+    format_task_result,
+    format_error,
+    format_batch_result,
+    normalize_task_ids,
+)
+
+# Phase II import
+from app.application.use_cases import DeleteTasksUseCase
+
+
+async def delete_tasks(
+    user_id: str,
+    task_ids: List[int],
+) -> dict:
+    """
+    Delete several tasks.
+
+    ADAPTER PATTERN:
+    1. Receives parameters from MCP call
+    2. Validates the ID list (1-100 IDs, duplicates dropped)
+    3. Instantiates Phase II repository (user-scoped)
+    4. Delegates to Phase II DeleteTasksUseCase
+    5. Returns one outcome per task ID
+
+    Args:
+        user_id: Authenticated user ID for data isolation
+        task_ids: IDs of the tasks to delete
+
+    Returns:
+        {results: [{task_id, status: "deleted", title} | {error, message, task_id}],
+         succeeded, failed} on success
+        {error, message} on failure
+    """
+    ids, error = normalize_task_ids(task_ids)
+    if error:
+        return error
+
+    try:
+        with get_task_repository(user_id) as repository:
+            # Delegate to Phase II use case - NO CRUD logic here
+            use_case = DeleteTasksUseCase(repository)
+            tasks, _missing = use_case.execute(task_ids=ids)
+
+            by_id = {task.id: task for task in tasks}
+            return format_batch_result([
+                format_task_result(by_id[task_id], status="deleted")
+                if task_id in by_id
+                else format_error(
+                    error_type="not_found",
+                    message=f"Task {task_id} not found",
+                    task_id=task_id,
+                )
+                for task_id in ids
+            ])
+
+    except Exception as e:
+        return format_error(
+            error_type="internal",
+            message="Failed to delete tasks",
+        )
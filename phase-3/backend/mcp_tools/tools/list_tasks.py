@@ -4,8 +4,6 @@
 # Lists tasks by delegating to Phase II ListTasksUseCase.
 # This is an ADAPTER - no CRUD logic here, only delegation.
 
-import sys
-from pathlib import Path
 from typing import Optional, Literal
 
 from ._adapter import (
@@ -15,51 +13,67 @@ from ._adapter import (
 )
 
 # Phase II import
-_phase2_path = Path(__file__).parent.parent.parent.parent.parent / "phase2" / "backend"
-if str(_phase2_path) not in sys.path:
-    sys.path.insert(0, str(_phase2_path))
-
 from app.application.use_cases import ListTasksUseCase
 
 
+# Upper bound for the limit argument
+MAX_LIST_LIMIT = 100
+
+_STATUS_FILTERS = {"all": None, "pending": False, "completed": True}
+
+
 async def list_tasks(
     user_id: str,
     status: Optional[Literal["all", "pending", "completed"]] = "all",
+    query: Optional[str] = None,
+    limit: Optional[int] = None,
+    compact: bool = False,
 ) -> dict:
     """
-    List tasks for the user with optional status filter.
+    List tasks for the user with optional filters.
 
     ADAPTER PATTERN:
     1. Receives parameters from MCP call
     2. Instantiates Phase II repository (user-scoped)
-    3. Delegates to Phase II ListTasksUseCase
-    4. Filters by status (app-layer, not in use case)
-    5. Returns formatted result
+    3. Delegates to Phase II ListTasksUseCase with the filters,
+       which the repository applies in SQL
+    4. Returns formatted result
 
     Args:
         user_id: Authenticated user ID for data isolation
         status: Filter - "all", "pending", or "completed"
+        query: Case-insensitive substring of title or description
+        limit: Maximum number of tasks to return (1-100, newest first)
+        compact: Return only id, title and completed for each task
 
     Returns:
         {tasks: [{id, title, description, completed}, ...]} on success
+        ({id, title, completed} per task when compact)
         {error, message} on failure
     """
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if not 1 <= limit <= MAX_LIST_LIMIT:
+            return format_error(
+                error_type="validation",
+                message=f"Limit must be between 1 and {MAX_LIST_LIMIT}",
+            )
+
     try:
-        with get_task_repository(user_id) as repository:
+        with get_task_repository(user_id, for_write=False) as repository:
             # Delegate to Phase II use case - NO CRUD logic here
             use_case = ListTasksUseCase(repository)
-            all_tasks = use_case.execute()
-
-            # Filter by status (adapter-layer logic, not CRUD)
-            if status == "pending":
-                filtered_tasks = [t for t in all_tasks if not t.status.is_completed()]
-            elif status == "completed":
-                filtered_tasks = [t for t in all_tasks if t.status.is_completed()]
-            else:
-                filtered_tasks = all_tasks
+            tasks = use_case.execute(
+                completed=_STATUS_FILTERS.get(status),
+                query=(query or "").strip() or None,
+                limit=limit,
+            )
 
             return {
-                "tasks": [format_task_list_item(t) for t in filtered_tasks],
+                "tasks": [format_task_list_item(t, compact=compact) for t in tasks],
             }
 
     except Exception as e:
@@ -0,0 +1,76 @@
+# search_tasks MCP Tool
+# Spec: mcp-tools.spec.md Section 4.7
+#
+# Finds the user's best-matching tasks by delegating to Phase II
+# SearchTasksUseCase (tsvector + GIN index on PostgreSQL).
+# This is an ADAPTER - no CRUD logic here, only delegation.
+
+
+from ._adapter import (
+    get_task_repository,
+    format_task_list_item,
+    format_error,
+)
+
+# Phase II import
+from app.application.use_cases import SearchTasksUseCase
+
+# Bounds for the limit argument
+DEFAULT_SEARCH_LIMIT = 5
+MAX_SEARCH_LIMIT = 20
+
+
+async def search_tasks(
+    user_id: str,
+    query: str,
+    limit: int = DEFAULT_SEARCH_LIMIT,
+) -> dict:
+    """
+    Search the user's tasks and return the top-ranked matches.
+
+    ADAPTER PATTERN:
+    1. Receives parameters from MCP call
+    2. Validates the query and limit
+    3. Instantiates Phase II repository (user-scoped)
+    4. Delegates to Phase II SearchTasksUseCase
+    5. Returns compact results (id, title, completed), best match first
+
+    Args:
+        user_id: Authenticated user ID for data isolation
+        query: Words describing the task (e.g. "grocery")
+        limit: Maximum number of matches (1-20, default 5)
+
+    Returns:
+        {tasks: [{id, title, completed}, ...]} on success
+        {error, message} on failure
+    """
+    if not query or not str(query).strip():
+        return format_error(
+            error_type="validation",
+            message="Search query is required",
+        )
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 0
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        return format_error(
+            error_type="validation",
+            message=f"Limit must be between 1 and {MAX_SEARCH_LIMIT}",
+        )
+
+    try:
+        with get_task_repository(user_id, for_write=False) as repository:
+            # Delegate to Phase II use case - NO CRUD logic here
+            use_case = SearchTasksUseCase(repository)
+            tasks = use_case.execute(text=str(query), limit=limit)
+
+            return {
+                "tasks": [format_task_list_item(t, compact=True) for t in tasks],
+            }
+
+    except Exception as e:
+        return format_error(
+            error_type="internal",
+            message="Failed to search tasks",
+        )
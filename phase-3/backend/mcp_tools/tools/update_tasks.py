@@ -0,0 +1,109 @@
+# update_tasks MCP Tool (batch)
+# Spec: mcp-tools.spec.md Section 4.6
+#
+# Updates several tasks in one transaction by delegating to Phase II
+# UpdateTasksUseCase (one SELECT ... IN, one executemany UPDATE).
+# This is an ADAPTER - no CRUD logic here, only delegation.
+
+from typing import List, Dict, Any
+
+from ._adapter import (
+    get_task_repository,
+    format_task_result,
+    format_error,
+    format_batch_result,
+    MAX_BATCH_SIZE,
+)
+
+# Phase II import
+from app.application.use_cases import UpdateTasksUseCase
+
+
+async def update_tasks(
+    user_id: str,
+    updates: List[Dict[str, Any]],
+) -> dict:
+    """
+    Update the title and/or description of several tasks.
+
+    ADAPTER PATTERN:
+    1. Receives parameters from MCP call
+    2. Validates each patch has a task_id and a field to change
+    3. Instantiates Phase II repository (user-scoped)
+    4. Delegates valid patches to Phase II UpdateTasksUseCase
+    5. Returns one outcome per patch, in request order
+
+    Args:
+        user_id: Authenticated user ID for data isolation
+        updates: Patches of the form {task_id, title?, description?}
+                 (1-100 per call; later patches for the same ID win)
+
+    Returns:
+        {results: [{task_id, status: "updated", title} | {error, message, task_id}],
+         succeeded, failed} on success
+        {error, message} on failure
+    """
+    if not isinstance(updates, (list, tuple)) or not updates:
+        return format_error(
+            error_type="validation",
+            message="updates must be a non-empty list of {task_id, title, description}",
+        )
+    if len(updates) > MAX_BATCH_SIZE:
+        return format_error(
+            error_type="validation",
+            message=f"At most {MAX_BATCH_SIZE} tasks can be changed per call",
+        )
+
+    # Per-patch validation; keyed by task ID so each task is written once
+    outcomes: Dict[int, dict] = {}
+    patches: Dict[int, Dict[str, Any]] = {}
+    for patch in updates:
+        try:
+            task_id = int(patch["task_id"])
+        except (TypeError, ValueError, KeyError):
+            return format_error(
+                error_type="validation",
+                message="Every update needs an integer task_id",
+            )
+        title = patch.get("title")
+        description = patch.get("description")
+        if title is None and description is None:
+            outcomes[task_id] = format_error(
+                error_type="validation",
+                message="At least one of title or description must be provided",
+                task_id=task_id,
+            )
+            patches.pop(task_id, None)
+            continue
+        outcomes.pop(task_id, None)
+        patches[task_id] = {"task_id": task_id, "title": title, "description": description}
+
+    try:
+        with get_task_repository(user_id) as repository:
+            # Delegate to Phase II use case - NO CRUD logic here
+            use_case = UpdateTasksUseCase(repository)
+            tasks, missing, invalid = use_case.execute(patches=list(patches.values()))
+
+            for task in tasks:
+                outcomes[task.id] = format_task_result(task, status="updated")
+            for task_id in missing:
+                outcomes[task_id] = format_error(
+                    error_type="not_found",
+                    message=f"Task {task_id} not found",
+                    task_id=task_id,
+                )
+            for task_id, message in invalid.items():
+                outcomes[task_id] = format_error(
+                    error_type="validation",
+                    message=message,
+                    task_id=task_id,
+                )
+
+            ordered = dict.fromkeys(int(patch["task_id"]) for patch in updates)
+            return format_batch_result([outcomes[task_id] for task_id in ordered])
+
+    except Exception as e:
+        return format_error(
+            error_type="internal",
+            message="Failed to update tasks",
+        )
@@ -1,9 +1,11 @@
 # T-311, T-312: Phase III Database Models
-# Spec: conversation.spec.md Sections 3.5, 4.5
+# Spec: conversation.spec.md Sections 3.5, 4.5, 11, 12
 #
 # NEW models for Phase III. Does NOT modify Phase II models.
 
 from .conversation import ConversationDB
 from .message import MessageDB
+from .message_archive import MessageArchiveDB
+from .tool_result import ToolResultDB
 
-__all__ = ["ConversationDB", "MessageDB"]
+__all__ = ["ConversationDB", "MessageDB", "MessageArchiveDB", "ToolResultDB"]
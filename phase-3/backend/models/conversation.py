@@ -6,6 +6,7 @@
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 
@@ -22,6 +23,10 @@ class ConversationDB(SQLModel, table=True):
     """
 
     __tablename__ = "conversation"
+    __table_args__ = (
+        # Keyset pagination of a user's conversations, most recent first
+        Index("idx_conversation_user_updated", "user_id", text("updated_at DESC")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(
@@ -40,3 +45,15 @@ class ConversationDB(SQLModel, table=True):
         nullable=False,
         description="Last activity timestamp",
     )
+    summary: Optional[str] = Field(
+        default=None,
+        description="Rolling summary of turns evicted from the context window",
+    )
+    summary_through_id: Optional[int] = Field(
+        default=None,
+        description="ID of the last message folded into summary",
+    )
+    archived_through_id: Optional[int] = Field(
+        default=None,
+        description="ID of the last message moved to message_archive",
+    )
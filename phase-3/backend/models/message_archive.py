@@ -0,0 +1,65 @@
+# Message Archive SQLModel
+# Spec: conversation.spec.md Section 11
+#
+# NEW table for Phase III. Holds compressed blocks of messages moved out
+# of the message table by the retention job (retention/archiver.py).
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Index, LargeBinary
+
+
+class MessageArchiveDB(SQLModel, table=True):
+    """
+    One compressed block of archived messages from a single conversation.
+
+    payload is zlib-compressed JSON: a list of message dicts (id, role,
+    content, tool_calls, created_at) in ID order. Large tool results are
+    pruned to summaries before archiving.
+    """
+
+    __tablename__ = "message_archive"
+    __table_args__ = (
+        # Read-through lookups: archives of a conversation after a message ID
+        Index("idx_message_archive_conversation_last", "conversation_id", "last_message_id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    conversation_id: int = Field(
+        foreign_key="conversation.id",
+        nullable=False,
+        description="FK to conversation table",
+    )
+    user_id: str = Field(
+        foreign_key="user.id",
+        index=True,
+        nullable=False,
+        description="FK to Phase II user table (redundant for security)",
+    )
+    first_message_id: int = Field(
+        nullable=False,
+        description="Lowest message ID in the block",
+    )
+    last_message_id: int = Field(
+        nullable=False,
+        description="Highest message ID in the block",
+    )
+    message_count: int = Field(
+        nullable=False,
+        description="Number of messages in the block",
+    )
+    payload: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="zlib-compressed JSON list of messages",
+    )
+    raw_bytes: int = Field(
+        nullable=False,
+        description="Size of the JSON before compression",
+    )
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        description="When the block was archived",
+    )
@@ -0,0 +1,53 @@
+# Tool Result SQLModel
+# Spec: conversation.spec.md Section 12
+#
+# NEW table for Phase III. Content-addressed storage for large tool
+# results referenced from message.tool_calls.
+
+from datetime import datetime
+
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import LargeBinary
+
+
+class ToolResultDB(SQLModel, table=True):
+    """
+    One distinct tool result, stored once per user.
+
+    Keyed by (user_id, content_hash) where content_hash is the SHA-256
+    of the result's canonical JSON, so a result returned on many turns
+    (e.g. an unchanged task list) is stored a single time. Rows no
+    message references any more are deleted by the retention job once
+    created_at is older than TOOL_RESULT_PRUNE_AFTER_DAYS.
+    """
+
+    __tablename__ = "tool_result"
+
+    user_id: str = Field(
+        foreign_key="user.id",
+        primary_key=True,
+        description="FK to Phase II user table (owner of the result)",
+    )
+    content_hash: str = Field(
+        primary_key=True,
+        max_length=64,
+        description="SHA-256 hex digest of the canonical JSON",
+    )
+    payload: bytes = Field(
+        sa_column=Column(LargeBinary, nullable=False),
+        description="Canonical JSON, zlib-compressed when compressed is true",
+    )
+    compressed: bool = Field(
+        default=False,
+        nullable=False,
+        description="Whether payload is zlib-compressed",
+    )
+    raw_bytes: int = Field(
+        nullable=False,
+        description="Size of the canonical JSON",
+    )
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        nullable=False,
+        description="When the result was last stored (refreshed on every reuse)",
+    )
@@ -0,0 +1,17 @@
+# Phase III Observability
+#
+# Request tracing for the chat pipeline (agent executor + MCP tools).
+
+from .tracing import Trace, Span, current_trace, start_trace, span
+from .exporters import JsonlTraceExporter, OtlpHttpTraceExporter, export_trace
+
+__all__ = [
+    "Trace",
+    "Span",
+    "current_trace",
+    "start_trace",
+    "span",
+    "JsonlTraceExporter",
+    "OtlpHttpTraceExporter",
+    "export_trace",
+]
@@ -0,0 +1,153 @@
+# Trace Exporters
+#
+# Ship finished request traces out of process.
+#
+# Configuration (environment variables):
+#   AGENT_TRACE_FILE           Append each trace as one JSON line to this file
+#   AGENT_TRACE_OTLP_ENDPOINT  POST traces as OTLP/HTTP JSON to this URL
+#                              (e.g. http://localhost:4318/v1/traces)
+#
+# Both are optional; with neither set, traces are only attached to the
+# request result.
+
+import json
+import logging
+import os
+import queue
+import threading
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "todo-chat-agent"
+
+
+class JsonlTraceExporter:
+    """Appends one JSON object per trace to a local file."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Any) -> None:
+        line = json.dumps(trace.to_dict(), default=str)
+        with self._lock:
+            with open(self._path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+class OtlpHttpTraceExporter:
+    """
+    Sends traces to an OpenTelemetry collector using OTLP/HTTP JSON.
+
+    Export happens on a daemon thread so the request path never waits
+    on the collector; traces are dropped if the queue is full.
+    """
+
+    def __init__(self, endpoint: str, max_queue: int = 1000, timeout: float = 2.0):
+        self._endpoint = endpoint
+        self._timeout = timeout
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._worker.start()
+
+    def export(self, trace: Any) -> None:
+        try:
+            self._queue.put_nowait(to_otlp(trace.to_dict()))
+        except queue.Full:
+            logger.warning("Trace export queue full; dropping trace")
+
+    def _run(self) -> None:
+        while True:
+            payload = self._queue.get()
+            request = urllib.request.Request(
+                self._endpoint,
+                data=json.dumps(payload, default=str).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                urllib.request.urlopen(request, timeout=self._timeout).close()
+            except Exception as e:
+                logger.warning(f"Trace export failed: {e}")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a trace dict into an OTLP ExportTraceServiceRequest (JSON).
+
+    Args:
+        trace: Output of Trace.to_dict()
+
+    Returns:
+        OTLP/HTTP JSON payload
+    """
+    spans = []
+    for span in trace["spans"]:
+        start = span["start_unix_ns"]
+        spans.append({
+            "traceId": trace["trace_id"],
+            "spanId": span["span_id"],
+            "parentSpanId": span["parent_id"] or "",
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int(span["duration_ms"] * 1_000_000)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span["attributes"].items()
+                if value is not None
+            ],
+        })
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [
+                    {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                ],
+            },
+            "scopeSpans": [{
+                "scope": {"name": "phase3.agent"},
+                "spans": spans,
+            }],
+        }],
+    }
+
+
+def _configured_exporters() -> List[Any]:
+    exporters: List[Any] = []
+    trace_file: Optional[str] = os.environ.get("AGENT_TRACE_FILE")
+    endpoint: Optional[str] = os.environ.get("AGENT_TRACE_OTLP_ENDPOINT")
+    if trace_file:
+        exporters.append(JsonlTraceExporter(trace_file))
+    if endpoint:
+        exporters.append(OtlpHttpTraceExporter(endpoint))
+    return exporters
+
+
+_EXPORTERS: Optional[List[Any]] = None
+
+
+def export_trace(trace: Any) -> None:
+    """Send a finished trace to every configured exporter."""
+    global _EXPORTERS
+    if _EXPORTERS is None:
+        _EXPORTERS = _configured_exporters()
+
+    for exporter in _EXPORTERS:
+        try:
+            exporter.export(trace)
+        except Exception:
+            logger.exception("Trace export failed")
@@ -0,0 +1,186 @@
+# Request Tracing
+# Spec: agent.spec.md Section 4.1
+#
+# Lightweight span tracing for the chat request lifecycle.
+# The active trace is carried in a ContextVar so the agent executor and
+# the MCP tools can open spans without threading a tracer through calls.
+# A trace lives for a single request (agent.spec.md Section 4.3).
+
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterator
+
+from .exporters import export_trace
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("agent_trace", default=None)
+
+
+@dataclass
+class Span:
+    """One timed phase of a request."""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_unix_ns: int
+    duration_ms: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes (token counts, round index, ...)."""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_unix_ns": self.start_unix_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NullSpan:
+    """Span stand-in used when no trace is active."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """
+    Collection of spans for one request.
+
+    Spans nest by call structure; the request's coroutine runs its
+    awaits sequentially, so a simple stack tracks the parent span.
+    """
+
+    def __init__(self, name: str):
+        """
+        Start a trace.
+
+        Args:
+            name: Root operation name (e.g. "chat")
+        """
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._start = time.perf_counter()
+        self._start_unix_ns = time.time_ns()
+        self.duration_ms = 0.0
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a block as a child of the innermost open span."""
+        span = Span(
+            name=name,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=self._stack[-1].span_id if self._stack else None,
+            start_unix_ns=time.time_ns(),
+            attributes=dict(attributes),
+        )
+        self._stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            self._stack.pop()
+            self.spans.append(span)
+
+    def finish(self) -> None:
+        """Record the total request duration."""
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate spans into per-phase numbers.
+
+        Returns:
+            Dict with phase durations, model rounds, token counts and
+            tool latencies
+        """
+        phases: Dict[str, float] = {}
+        model_rounds = 0
+        prompt_tokens = 0
+        response_tokens = 0
+        tools: List[Dict[str, Any]] = []
+
+        for span in self.spans:
+            if span.parent_id is None:
+                phases[span.name] = round(phases.get(span.name, 0.0) + span.duration_ms, 3)
+            if span.name == "model.generate":
+                model_rounds += 1
+                prompt_tokens += span.attributes.get("prompt_tokens") or 0
+                response_tokens += span.attributes.get("response_tokens") or 0
+            elif span.name.startswith("tool."):
+                tools.append({
+                    "tool": span.name[len("tool."):],
+                    "duration_ms": round(span.duration_ms, 3),
+                })
+
+        return {
+            "total_ms": round(self.duration_ms, 3),
+            "phases_ms": phases,
+            "model_rounds": model_rounds,
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "tools": tools,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start_unix_ns": self._start_unix_ns,
+            "summary": self.summary(),
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace active in this context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """
+    Activate a new trace for the enclosed block and export it on exit.
+
+    Args:
+        name: Root operation name
+    """
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_trace.reset(token)
+        export_trace(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Time a block in the active trace; no-op when tracing is inactive.
+
+    Args:
+        name: Span name, e.g. "agent.hydrate" or "tool.list_tasks"
+        **attributes: Initial span attributes
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NULL_SPAN
+        return
+    with trace.span(name, **attributes) as active:
+        yield active
@@ -1,9 +1,10 @@
 # T-314, T-315: Phase III Repositories
-# Spec: conversation.spec.md Sections 6.1, 6.2
+# Spec: conversation.spec.md Sections 6.1, 6.2, 12
 #
 # Repositories for conversation and message persistence.
 
 from .conversation_repository import ConversationRepository
 from .message_repository import MessageRepository
+from .tool_result_repository import ToolResultRepository
 
-__all__ = ["ConversationRepository", "MessageRepository"]
+__all__ = ["ConversationRepository", "MessageRepository", "ToolResultRepository"]
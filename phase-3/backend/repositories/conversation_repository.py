@@ -4,11 +4,13 @@
 # Repository for conversation persistence with user isolation.
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
+from sqlalchemy import update, and_, or_
 from sqlmodel import Session, select
 
 from ..models.conversation import ConversationDB
+from ..models.message import MessageDB
 
 
 class ConversationRepository:
@@ -83,6 +85,62 @@ class ConversationRepository:
         )
         return list(self._session.exec(statement).all())
 
+    def list_page(
+        self,
+        limit: int = 20,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Tuple[ConversationDB, Optional[MessageDB]]]:
+        """
+        List the user's conversations with their latest message, keyset-paginated.
+
+        Ordered by (updated_at DESC, id DESC) using
+        idx_conversation_user_updated. The latest message comes from a
+        correlated subquery on idx_message_conversation_created, in the
+        same query, so there is no per-conversation lookup.
+
+        Args:
+            limit: Maximum number of conversations to return
+            before: (updated_at, id) of the last conversation on the
+                previous page; None for the first page
+
+        Returns:
+            List of (ConversationDB, latest MessageDB or None)
+        """
+        last_message_id = (
+            select(MessageDB.id)
+            .where(
+                MessageDB.conversation_id == ConversationDB.id,
+                MessageDB.user_id == self._user_id,  # CRITICAL: User isolation
+            )
+            .order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
+            .limit(1)
+            .correlate(ConversationDB)
+            .scalar_subquery()
+        )
+
+        statement = (
+            select(ConversationDB, MessageDB)
+            .outerjoin(MessageDB, MessageDB.id == last_message_id)
+            .where(ConversationDB.user_id == self._user_id)  # CRITICAL: User isolation
+        )
+        if before is not None:
+            updated_at, conversation_id = before
+            statement = statement.where(
+                or_(
+                    ConversationDB.updated_at < updated_at,
+                    and_(
+                        ConversationDB.updated_at == updated_at,
+                        ConversationDB.id < conversation_id,
+                    ),
+                )
+            )
+        statement = statement.order_by(
+            ConversationDB.updated_at.desc(), ConversationDB.id.desc()
+        ).limit(limit)
+
+        rows = self._session.exec(statement).all()
+        return [(conversation, message) for conversation, message in rows]
+
     def update_timestamp(self, conversation_id: int) -> None:
         """
         Update conversation's updated_at to now.
@@ -97,6 +155,49 @@ class ConversationRepository:
             conversation.updated_at = datetime.utcnow()
             self._session.add(conversation)
 
+    def touch(self, conversation_id: int) -> None:
+        """
+        Set updated_at to now with a single UPDATE (no SELECT first).
+
+        SECURITY: Filters by user_id; another user's conversation is
+        left untouched.
+
+        Args:
+            conversation_id: Conversation ID to update
+        """
+        statement = (
+            update(ConversationDB)
+            .where(
+                ConversationDB.id == conversation_id,
+                ConversationDB.user_id == self._user_id,  # CRITICAL: User isolation
+            )
+            .values(updated_at=datetime.utcnow())
+        )
+        self._session.exec(statement)
+
+    def update_summary(
+        self,
+        conversation_id: int,
+        summary: str,
+        through_message_id: int,
+    ) -> None:
+        """
+        Replace the conversation's rolling summary.
+
+        Messages up to and including through_message_id are covered by
+        the summary and are no longer loaded into the agent context.
+
+        Args:
+            conversation_id: Conversation ID to update
+            summary: New summary text
+            through_message_id: ID of the last message folded into summary
+        """
+        conversation = self.get_by_id(conversation_id)
+        if conversation:
+            conversation.summary = summary
+            conversation.summary_through_id = through_message_id
+            self._session.add(conversation)
+
     def delete(self, conversation_id: int) -> bool:
         """
         Delete conversation if it belongs to user.
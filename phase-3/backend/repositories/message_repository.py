@@ -4,11 +4,14 @@
 # Repository for message persistence with user isolation.
 
 from datetime import datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict, Tuple
 
+from sqlalchemy import insert, and_, or_
 from sqlmodel import Session, select
 
 from ..models.message import MessageDB
+from ..models.message_archive import MessageArchiveDB
+from ..retention.codec import decode_messages
 
 
 class MessageRepository:
@@ -60,27 +63,190 @@ class MessageRepository:
         self._session.flush()  # Get ID without committing
         return message
 
-    def get_history(self, conversation_id: int) -> List[MessageDB]:
+    def add_many(
+        self,
+        conversation_id: int,
+        messages: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Add several messages to a conversation with one multi-row INSERT.
+
+        Used for the per-turn write phase (user message + assistant reply).
+        Nothing is committed here.
+
+        Args:
+            conversation_id: ID of the conversation
+            messages: Dicts with role, content and optional tool_calls
+                and created_at
         """
-        Get all messages for a conversation in chronological order.
+        if not messages:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "conversation_id": conversation_id,
+                "user_id": self._user_id,  # Redundant but required for security
+                "role": message["role"],
+                "content": message["content"],
+                "tool_calls": message.get("tool_calls"),
+                "created_at": message.get("created_at") or now,
+            }
+            for message in messages
+        ]
+        self._session.exec(insert(MessageDB).values(rows))
+
+    def get_history(
+        self,
+        conversation_id: int,
+        after_id: Optional[int] = None,
+        archived_through_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[MessageDB]:
+        """
+        Get messages for a conversation in chronological order.
+
+        With a limit only the newest messages are read: live rows first
+        (newest first, using idx_message_conversation_created), then, if
+        the limit is not reached, archive blocks newest first until it
+        is. Archived messages are only read when some of them are newer
+        than after_id, so conversations whose archived turns are already
+        summarized cost no extra query.
 
         SECURITY: Filters by user_id to prevent cross-user access.
 
         Args:
             conversation_id: Conversation ID to get messages for
+            after_id: Only return messages with a greater ID (e.g. those
+                not yet covered by the conversation summary)
+            archived_through_id: The conversation's archived_through_id
+            limit: Maximum number of (newest) messages to return; None
+                for all of them
 
         Returns:
             List of MessageDB ordered by created_at ASC
         """
-        statement = (
-            select(MessageDB)
-            .where(
-                MessageDB.conversation_id == conversation_id,
-                MessageDB.user_id == self._user_id,  # CRITICAL: User isolation
-            )
-            .order_by(MessageDB.created_at.asc())
+        statement = select(MessageDB).where(
+            MessageDB.conversation_id == conversation_id,
+            MessageDB.user_id == self._user_id,  # CRITICAL: User isolation
         )
-        return list(self._session.exec(statement).all())
+        if after_id is not None:
+            statement = statement.where(MessageDB.id > after_id)
+        statement = statement.order_by(MessageDB.created_at.desc(), MessageDB.id.desc())
+        if limit is not None:
+            statement = statement.limit(limit)
+        history = list(self._session.exec(statement).all())
+
+        wanted = None if limit is None else limit - len(history)
+        if (
+            (wanted is None or wanted > 0)
+            and archived_through_id is not None
+            and (after_id or 0) < archived_through_id
+        ):
+            before = (history[-1].created_at, history[-1].id) if history else None
+            history.extend(self._archived_page(conversation_id, wanted, before, after_id))
+
+        history.reverse()
+        return history
+
+    def list_page(
+        self,
+        conversation_id: int,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[MessageDB]:
+        """
+        Get a page of messages, newest first, keyset-paginated.
+
+        Ordered by (created_at DESC, id DESC) using
+        idx_message_conversation_created. Once the live rows run out,
+        the page continues into the conversation's archived messages.
+
+        SECURITY: Filters by user_id to prevent cross-user access.
+
+        Args:
+            conversation_id: Conversation ID to page through
+            limit: Maximum number of messages to return
+            before: (created_at, id) of the oldest message on the previous
+                page; None for the newest page
+
+        Returns:
+            List of MessageDB, newest first
+        """
+        statement = select(MessageDB).where(
+            MessageDB.conversation_id == conversation_id,
+            MessageDB.user_id == self._user_id,  # CRITICAL: User isolation
+        )
+        if before is not None:
+            created_at, message_id = before
+            statement = statement.where(
+                or_(
+                    MessageDB.created_at < created_at,
+                    and_(MessageDB.created_at == created_at, MessageDB.id < message_id),
+                )
+            )
+        statement = statement.order_by(
+            MessageDB.created_at.desc(), MessageDB.id.desc()
+        ).limit(limit)
+        page = list(self._session.exec(statement).all())
+
+        if len(page) < limit:
+            page.extend(self._archived_page(conversation_id, limit - len(page), before))
+        return page
+
+    def _archived_page(
+        self,
+        conversation_id: int,
+        limit: Optional[int],
+        before: Optional[Tuple[datetime, int]] = None,
+        after_id: Optional[int] = None,
+    ) -> List[MessageDB]:
+        """
+        Read up to limit archived messages before the cursor, newest first.
+
+        Blocks are fetched one at a time, newest first, starting below the
+        cursor's message ID, and only until the page is full. So a page
+        decodes the block holding the cursor and the blocks it needs,
+        never the whole archive.
+
+        SECURITY: Filters by user_id to prevent cross-user access.
+
+        Args:
+            conversation_id: Conversation ID to read archives for
+            limit: Maximum number of messages to return; None for all
+            before: (created_at, id) cursor; None to start at the newest
+            after_id: Stop at messages with this ID or lower
+
+        Returns:
+            List of MessageDB, newest first
+        """
+        page: List[MessageDB] = []
+        below_id = before[1] if before is not None else None
+        while limit is None or len(page) < limit:
+            statement = select(MessageArchiveDB.first_message_id, MessageArchiveDB.payload).where(
+                MessageArchiveDB.conversation_id == conversation_id,
+                MessageArchiveDB.user_id == self._user_id,  # CRITICAL: User isolation
+            )
+            if below_id is not None:
+                statement = statement.where(MessageArchiveDB.first_message_id < below_id)
+            if after_id is not None:
+                statement = statement.where(MessageArchiveDB.last_message_id > after_id)
+            block = self._session.exec(
+                statement.order_by(MessageArchiveDB.first_message_id.desc()).limit(1)
+            ).first()
+            if block is None:
+                break
+            below_id, payload = block
+
+            for data in reversed(decode_messages(payload)):
+                message = MessageDB(conversation_id=conversation_id, user_id=self._user_id, **data)
+                if after_id is not None and message.id <= after_id:
+                    break
+                if before is None or (message.created_at, message.id) < before:
+                    page.append(message)
+                    if len(page) == limit:
+                        break
+        return page
 
     def get_latest(self, conversation_id: int) -> Optional[MessageDB]:
         """
@@ -0,0 +1,216 @@
+# Tool Result Repository
+# Spec: conversation.spec.md Section 12
+#
+# Compact storage for message.tool_calls. Small results stay inline;
+# larger ones are stored once per user in tool_result (deduplicated by
+# content hash, compressed when large) and replaced in the message by a
+# truncated preview plus a reference.
+
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from ..models.tool_result import ToolResultDB
+from ..retention.pruning import summarize_result
+
+# Serialized results up to this size are stored inline in the message
+TOOL_RESULT_INLINE_BYTES = 512
+
+# Largest preview kept in the message next to a reference
+TOOL_RESULT_PREVIEW_BYTES = 512
+
+# Stored results at least this large are zlib-compressed
+TOOL_RESULT_COMPRESS_MIN_BYTES = 1024
+
+REF_PREFIX = "sha256:"
+
+
+def _canonical(value: Any) -> bytes:
+    """Canonical JSON encoding used for hashing and storage."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def _is_ref(result: Any) -> bool:
+    return isinstance(result, dict) and str(result.get("ref", "")).startswith(REF_PREFIX)
+
+
+class ToolResultRepository:
+    """
+    Repository for content-addressed tool results.
+
+    SECURITY: Results are keyed and read by (user_id, content_hash);
+    a reference never resolves to another user's data.
+    """
+
+    def __init__(self, session: Session, user_id: str):
+        """
+        Initialize repository with session and user context.
+
+        Args:
+            session: SQLModel database session
+            user_id: Authenticated user ID for data isolation
+        """
+        self._session = session
+        self._user_id = user_id
+
+    def compact(self, tool_calls: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Encode tool call records for storage in message.tool_calls.
+
+        Results larger than TOOL_RESULT_INLINE_BYTES are written to
+        tool_result (at most one upsert; existing hashes only get a
+        fresh created_at)
+        and replaced by {"truncated": true, "ref", "bytes", "preview"}.
+        Arguments with a None value are dropped. Nothing is committed.
+
+        Args:
+            tool_calls: Records with tool, arguments and full result
+
+        Returns:
+            Compact records (same order)
+        """
+        if not tool_calls:
+            return tool_calls
+
+        compacted: List[Dict[str, Any]] = []
+        blobs: Dict[str, Dict[str, Any]] = {}
+
+        for call in tool_calls:
+            arguments = call.get("arguments") or {}
+            record = {
+                "tool": call["tool"],
+                "arguments": {k: v for k, v in arguments.items() if v is not None},
+            }
+            result = call.get("result")
+            raw = _canonical(result)
+
+            if len(raw) <= TOOL_RESULT_INLINE_BYTES:
+                record["result"] = result
+            else:
+                content_hash = hashlib.sha256(raw).hexdigest()
+                if content_hash not in blobs:
+                    compressed = len(raw) >= TOOL_RESULT_COMPRESS_MIN_BYTES
+                    blobs[content_hash] = {
+                        "user_id": self._user_id,
+                        "content_hash": content_hash,
+                        "payload": zlib.compress(raw) if compressed else raw,
+                        "compressed": compressed,
+                        "raw_bytes": len(raw),
+                    }
+                preview = summarize_result(result)
+                if len(_canonical(preview)) > TOOL_RESULT_PREVIEW_BYTES:
+                    preview = None
+                record["result"] = {
+                    "truncated": True,
+                    "ref": REF_PREFIX + content_hash,
+                    "bytes": len(raw),
+                    "preview": preview,
+                }
+            compacted.append(record)
+
+        if blobs:
+            self._insert_missing(list(blobs.values()))
+        return compacted
+
+    def _insert_missing(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert blobs whose (user_id, content_hash) is not stored yet.
+
+        Blobs already stored get a fresh created_at instead, so the
+        retention job never collects a result a new turn references.
+        """
+        now = datetime.utcnow()
+        rows = [{**row, "created_at": now} for row in rows]
+        dialect = self._session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            # Dialect modules are imported on first use (postgresql is ~50 ms)
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            statement = dialect_insert(ToolResultDB).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=["user_id", "content_hash"],
+                set_={"created_at": statement.excluded.created_at},
+            )
+            self._session.exec(statement)
+            return
+
+        existing = set(
+            self._session.exec(
+                select(ToolResultDB.content_hash).where(
+                    ToolResultDB.user_id == self._user_id,
+                    ToolResultDB.content_hash.in_([row["content_hash"] for row in rows]),
+                )
+            ).all()
+        )
+        missing = [row for row in rows if row["content_hash"] not in existing]
+        if missing:
+            self._session.exec(insert(ToolResultDB).values(missing))
+        if existing:
+            self._session.exec(
+                update(ToolResultDB)
+                .where(
+                    ToolResultDB.user_id == self._user_id,
+                    ToolResultDB.content_hash.in_(existing),
+                )
+                .values(created_at=now)
+            )
+
+    def load_many(self, refs: Iterable[str]) -> Dict[str, Any]:
+        """
+        Resolve references to full results with one query.
+
+        SECURITY: Filters by user_id to prevent cross-user access.
+
+        Args:
+            refs: "sha256:<hex>" references
+
+        Returns:
+            Dict of reference → full result (unknown references are omitted)
+        """
+        hashes = {ref[len(REF_PREFIX):] for ref in refs if ref.startswith(REF_PREFIX)}
+        if not hashes:
+            return {}
+
+        rows = self._session.exec(
+            select(ToolResultDB).where(
+                ToolResultDB.user_id == self._user_id,  # CRITICAL: User isolation
+                ToolResultDB.content_hash.in_(hashes),
+            )
+        ).all()
+        return {
+            REF_PREFIX + row.content_hash: json.loads(
+                zlib.decompress(row.payload) if row.compressed else row.payload
+            )
+            for row in rows
+        }
+
+    def expand(self, messages_tool_calls: Iterable[Optional[List[Dict[str, Any]]]]) -> None:
+        """
+        Replace references with full results, in place, for many messages.
+
+        Args:
+            messages_tool_calls: tool_calls lists of the messages to expand
+        """
+        calls = [
+            call
+            for tool_calls in messages_tool_calls
+            for call in (tool_calls or [])
+            if isinstance(call, dict) and _is_ref(call.get("result"))
+        ]
+        if not calls:
+            return
+
+        results = self.load_many(call["result"]["ref"] for call in calls)
+        for call in calls:
+            ref = call["result"]["ref"]
+            if ref in results:
+                call["result"] = results[ref]
@@ -0,0 +1,20 @@
+# Phase III Message Retention
+# Spec: conversation.spec.md Section 11
+#
+# Pruning and archival of old chat messages.
+
+from .archiver import MessageArchiver, RetentionReport, run_retention, archive_periodically
+from .codec import encode_messages, decode_messages
+from .pruning import prune_result, prune_tool_calls, summarize_result
+
+__all__ = [
+    "MessageArchiver",
+    "RetentionReport",
+    "run_retention",
+    "archive_periodically",
+    "encode_messages",
+    "decode_messages",
+    "prune_result",
+    "prune_tool_calls",
+    "summarize_result",
+]
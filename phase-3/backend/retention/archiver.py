@@ -0,0 +1,377 @@
+# Message Retention Job
+# Spec: conversation.spec.md Section 11
+#
+# Keeps the message table small:
+#   1. Prune: tool results older than TOOL_RESULT_PRUNE_AFTER_DAYS and
+#      larger than TOOL_RESULT_MAX_BYTES are replaced by summaries.
+#      References to tool_result are resolved first, so smaller stored
+#      results are inlined and old messages stop referencing tool_result.
+#   2. Archive: messages older than MESSAGE_ARCHIVE_AFTER_DAYS are moved
+#      into compressed per-conversation blocks in message_archive and
+#      deleted from message (with any references resolved the same way).
+#   3. Collect: tool_result rows older than TOOL_RESULT_PRUNE_AFTER_DAYS
+#      that no message references any more are deleted.
+#
+# MessageRepository.get_history reads archived blocks back when a
+# conversation's context still needs them.
+#
+# Usage:
+#   python -m phase-3.backend.retention.archiver
+#   python -m phase-3.backend.retention.archiver --archive-after-days 90 --prune-after-days 14
+#
+# Or set MESSAGE_ARCHIVE_INTERVAL_SECONDS to run it inside the API process.
+
+import argparse
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+from sqlalchemy import String, bindparam, case, cast, delete, tuple_, update
+from sqlmodel import Session, select
+
+from ..models.conversation import ConversationDB
+from ..models.message import MessageDB
+from ..models.message_archive import MessageArchiveDB
+from ..models.tool_result import ToolResultDB
+from ..repositories.tool_result_repository import REF_PREFIX, ToolResultRepository
+from .codec import encode_messages
+from .config import (
+    MESSAGE_ARCHIVE_AFTER_DAYS,
+    TOOL_RESULT_PRUNE_AFTER_DAYS,
+    TOOL_RESULT_MAX_BYTES,
+    ARCHIVE_MAX_MESSAGES_PER_BLOCK,
+    ARCHIVE_BATCH_CONVERSATIONS,
+    PRUNE_BATCH_SIZE,
+)
+from .pruning import prune_tool_calls
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionReport:
+    """Counters for one retention run."""
+
+    results_pruned: int = 0
+    conversations_archived: int = 0
+    messages_archived: int = 0
+    archive_blocks: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+    conflicts: int = 0
+    results_collected: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class MessageArchiver:
+    """
+    Prunes and archives old messages across all users.
+
+    This is a system job: unlike the repositories it is not scoped to
+    one user, but every statement that touches a conversation filters
+    by that conversation's owner. Each archive block is committed on
+    its own, so an interrupted run loses no work.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        archive_after_days: float = MESSAGE_ARCHIVE_AFTER_DAYS,
+        prune_after_days: float = TOOL_RESULT_PRUNE_AFTER_DAYS,
+        max_result_bytes: int = TOOL_RESULT_MAX_BYTES,
+        max_messages_per_block: int = ARCHIVE_MAX_MESSAGES_PER_BLOCK,
+        batch_conversations: int = ARCHIVE_BATCH_CONVERSATIONS,
+    ):
+        self._session = session
+        self._archive_after = timedelta(days=archive_after_days)
+        self._prune_after = timedelta(days=prune_after_days)
+        self._max_result_bytes = max_result_bytes
+        self._max_messages_per_block = max_messages_per_block
+        self._batch_conversations = batch_conversations
+
+    def run(self, now: Optional[datetime] = None) -> RetentionReport:
+        """
+        Run one prune, one archive and one collect pass.
+
+        Args:
+            now: Reference time for the age cutoffs (defaults to utcnow)
+
+        Returns:
+            RetentionReport with what was done
+        """
+        now = now or datetime.utcnow()
+        report = RetentionReport()
+        self.prune(now - self._prune_after, report)
+        self.archive(now - self._archive_after, report)
+        self.collect(now - self._prune_after, report)
+        return report
+
+    def prune(self, cutoff: datetime, report: RetentionReport) -> None:
+        """Prune large tool results on assistant messages older than cutoff."""
+        last_id = 0
+        while True:
+            rows = self._session.exec(
+                select(MessageDB.id, MessageDB.user_id, MessageDB.tool_calls)
+                .where(
+                    MessageDB.role == "assistant",
+                    MessageDB.created_at < cutoff,
+                    MessageDB.id > last_id,
+                )
+                .order_by(MessageDB.id)
+                .limit(PRUNE_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+
+            resolved = self._resolve_references(
+                (user_id, tool_calls) for _, user_id, tool_calls in rows
+            )
+            changed = []
+            for (message_id, _, tool_calls), calls in zip(rows, resolved):
+                pruned = prune_tool_calls(calls, self._max_result_bytes)
+                # A reference whose result is gone resolves to itself
+                if pruned is not tool_calls and pruned != tool_calls:
+                    changed.append({"message_id": message_id, "pruned_calls": pruned})
+
+            if changed:
+                statement = (
+                    update(MessageDB.__table__)
+                    .where(MessageDB.__table__.c.id == bindparam("message_id"))
+                    .values(tool_calls=bindparam("pruned_calls"))
+                )
+                self._session.connection().execute(statement, changed)
+                self._session.commit()
+                report.results_pruned += len(changed)
+
+    def archive(self, cutoff: datetime, report: RetentionReport) -> None:
+        """Archive messages older than cutoff, one conversation at a time."""
+        candidates = self._session.exec(
+            select(MessageDB.conversation_id, MessageDB.user_id)
+            .where(MessageDB.created_at < cutoff)
+            .group_by(MessageDB.conversation_id, MessageDB.user_id)
+            .limit(self._batch_conversations)
+        ).all()
+
+        for conversation_id, user_id in candidates:
+            if self._archive_conversation(conversation_id, user_id, cutoff, report):
+                report.conversations_archived += 1
+
+    def _archive_conversation(
+        self,
+        conversation_id: int,
+        user_id: str,
+        cutoff: datetime,
+        report: RetentionReport,
+    ) -> bool:
+        """Move a conversation's old messages into archive blocks."""
+        archived = False
+        while True:
+            rows = self._session.exec(
+                select(MessageDB)
+                .where(
+                    MessageDB.conversation_id == conversation_id,
+                    MessageDB.user_id == user_id,
+                    MessageDB.created_at < cutoff,
+                )
+                .order_by(MessageDB.id)
+                .limit(self._max_messages_per_block)
+            ).all()
+            if not rows:
+                return archived
+
+            resolved = self._resolve_references((user_id, row.tool_calls) for row in rows)
+            messages = [
+                {
+                    "id": row.id,
+                    "role": row.role,
+                    "content": row.content,
+                    "tool_calls": prune_tool_calls(calls, self._max_result_bytes),
+                    "created_at": row.created_at,
+                }
+                for row, calls in zip(rows, resolved)
+            ]
+            ids = [row.id for row in rows]
+            payload, raw_bytes = encode_messages(messages)
+            self._session.expunge_all()
+
+            # Claim the rows first: a concurrent run that already archived
+            # them deletes nothing here, so the block is not written twice
+            deleted = self._session.exec(
+                delete(MessageDB).where(
+                    MessageDB.id.in_(ids),
+                    MessageDB.user_id == user_id,
+                )
+            ).rowcount
+            if deleted != len(ids):
+                self._session.rollback()
+                report.conflicts += 1
+                return archived
+
+            self._session.add(
+                MessageArchiveDB(
+                    conversation_id=conversation_id,
+                    user_id=user_id,
+                    first_message_id=ids[0],
+                    last_message_id=ids[-1],
+                    message_count=len(ids),
+                    payload=payload,
+                    raw_bytes=raw_bytes,
+                )
+            )
+            through = ConversationDB.archived_through_id
+            self._session.exec(
+                update(ConversationDB)
+                .where(
+                    ConversationDB.id == conversation_id,
+                    ConversationDB.user_id == user_id,
+                )
+                .values(
+                    archived_through_id=case(
+                        (through.is_(None), ids[-1]),
+                        (through < ids[-1], ids[-1]),
+                        else_=through,
+                    )
+                )
+            )
+            self._session.commit()
+
+            archived = True
+            report.archive_blocks += 1
+            report.messages_archived += len(ids)
+            report.raw_bytes += raw_bytes
+            report.compressed_bytes += len(payload)
+
+
+    def collect(self, cutoff: datetime, report: RetentionReport) -> None:
+        """Delete stored tool results created before cutoff that no message references."""
+        last: Tuple[str, str] = ("", "")
+        while True:
+            rows = self._session.exec(
+                select(ToolResultDB.user_id, ToolResultDB.content_hash)
+                .where(
+                    ToolResultDB.created_at < cutoff,
+                    tuple_(ToolResultDB.user_id, ToolResultDB.content_hash) > tuple_(*last),
+                )
+                .order_by(ToolResultDB.user_id, ToolResultDB.content_hash)
+                .limit(PRUNE_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return
+            last = tuple(rows[-1])
+
+            by_user: Dict[str, Set[str]] = defaultdict(set)
+            for user_id, content_hash in rows:
+                by_user[user_id].add(content_hash)
+
+            for user_id, hashes in by_user.items():
+                unreferenced = hashes - self._referenced_hashes(user_id)
+                if unreferenced:
+                    report.results_collected += self._session.exec(
+                        delete(ToolResultDB).where(
+                            ToolResultDB.user_id == user_id,
+                            ToolResultDB.content_hash.in_(unreferenced),
+                            ToolResultDB.created_at < cutoff,
+                        )
+                    ).rowcount
+            self._session.commit()
+
+    def _referenced_hashes(self, user_id: str) -> Set[str]:
+        """
+        Content hashes referenced by a user's messages.
+
+        After the prune pass only messages younger than the prune window
+        hold references, so this reads few rows.
+        """
+        rows = self._session.exec(
+            select(MessageDB.tool_calls).where(
+                MessageDB.user_id == user_id,
+                cast(MessageDB.tool_calls, String).contains(REF_PREFIX),
+            )
+        ).all()
+        return {
+            call["result"]["ref"][len(REF_PREFIX):]
+            for tool_calls in rows
+            for call in (tool_calls or [])
+            if isinstance(call, dict)
+            and isinstance(call.get("result"), dict)
+            and str(call["result"].get("ref", "")).startswith(REF_PREFIX)
+        }
+
+    def _resolve_references(
+        self, messages: Any
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Inline stored results into (user_id, tool_calls) pairs.
+
+        Returns each message's tool_calls unchanged when it holds no
+        reference, otherwise a copy with the full results (one query per
+        user). Unknown references are left as they are.
+        """
+        messages = list(messages)
+        resolved: List[Optional[List[Dict[str, Any]]]] = []
+        copies: Dict[str, List[List[Dict[str, Any]]]] = defaultdict(list)
+        for user_id, tool_calls in messages:
+            if tool_calls and REF_PREFIX in json.dumps(tool_calls, default=str):
+                calls = [dict(call) if isinstance(call, dict) else call for call in tool_calls]
+                copies[user_id].append(calls)
+                resolved.append(calls)
+            else:
+                resolved.append(tool_calls)
+
+        for user_id, user_calls in copies.items():
+            ToolResultRepository(self._session, user_id).expand(user_calls)
+        return resolved
+
+
+def run_retention(**options: Any) -> RetentionReport:
+    """Run the retention job once in its own session."""
+    from app.database import engine
+
+    with Session(engine) as session:
+        report = MessageArchiver(session, **options).run()
+    logger.info(f"Message retention run: {report.to_dict()}")
+    return report
+
+
+async def archive_periodically(interval_seconds: float, **options: Any) -> None:
+    """
+    Run the retention job every interval_seconds, off the event loop.
+
+    Errors are logged and the next run is attempted as scheduled.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_retention, **options)
+        except Exception:
+            logger.exception("Message retention run failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Prune old tool results and archive old chat messages."
+    )
+    parser.add_argument("--archive-after-days", type=float, default=MESSAGE_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--prune-after-days", type=float, default=TOOL_RESULT_PRUNE_AFTER_DAYS)
+    parser.add_argument("--max-result-bytes", type=int, default=TOOL_RESULT_MAX_BYTES)
+    parser.add_argument("--batch-conversations", type=int, default=ARCHIVE_BATCH_CONVERSATIONS)
+    args = parser.parse_args()
+
+    report = run_retention(
+        archive_after_days=args.archive_after_days,
+        prune_after_days=args.prune_after_days,
+        max_result_bytes=args.max_result_bytes,
+        batch_conversations=args.batch_conversations,
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Archive Codec
+# Spec: conversation.spec.md Section 11.2
+#
+# (De)serializes archived message blocks as zlib-compressed JSON.
+
+import json
+import zlib
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+
+from .config import ARCHIVE_COMPRESSION_LEVEL
+
+
+def encode_messages(messages: List[Dict[str, Any]]) -> Tuple[bytes, int]:
+    """
+    Compress a list of message dicts.
+
+    datetime values are stored as ISO 8601 strings.
+
+    Args:
+        messages: Message dicts (id, role, content, tool_calls, created_at)
+
+    Returns:
+        (compressed payload, size of the JSON before compression)
+    """
+    raw = json.dumps(
+        messages,
+        separators=(",", ":"),
+        default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value),
+    ).encode("utf-8")
+    return zlib.compress(raw, ARCHIVE_COMPRESSION_LEVEL), len(raw)
+
+
+def decode_messages(payload: bytes) -> List[Dict[str, Any]]:
+    """
+    Decompress a payload produced by encode_messages.
+
+    created_at is parsed back into a datetime.
+
+    Args:
+        payload: Compressed archive payload
+
+    Returns:
+        Message dicts in their original order
+    """
+    messages = json.loads(zlib.decompress(payload))
+    for message in messages:
+        message["created_at"] = datetime.fromisoformat(message["created_at"])
+    return messages
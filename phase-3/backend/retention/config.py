@@ -0,0 +1,35 @@
+# Retention Configuration
+# Spec: conversation.spec.md Section 11
+#
+# Defaults for the message retention job. The job's CLI flags and
+# function arguments override these per run.
+
+import os
+
+# Messages older than this are moved into compressed archive blocks
+MESSAGE_ARCHIVE_AFTER_DAYS = 30
+
+# Tool results older than this are pruned to summaries in place
+TOOL_RESULT_PRUNE_AFTER_DAYS = 7
+
+# Serialized tool results larger than this are pruned
+TOOL_RESULT_MAX_BYTES = 2048
+
+# Maximum messages per archive block (larger conversations get several)
+ARCHIVE_MAX_MESSAGES_PER_BLOCK = 500
+
+# Conversations archived per run, and rows scanned per prune batch
+ARCHIVE_BATCH_CONVERSATIONS = 200
+PRUNE_BATCH_SIZE = 500
+
+# IDs kept in the summary of a pruned list result
+PRUNED_LIST_MAX_IDS = 50
+
+# Strings longer than this are shortened in pruned summaries
+PRUNED_STRING_MAX_CHARS = 200
+
+# zlib level for archive payloads
+ARCHIVE_COMPRESSION_LEVEL = 6
+
+# Run the job inside the API process every N seconds (0 disables)
+MESSAGE_ARCHIVE_INTERVAL_SECONDS = float(os.environ.get("MESSAGE_ARCHIVE_INTERVAL_SECONDS", "0"))
@@ -0,0 +1,88 @@
+# Tool Result Pruning
+# Spec: conversation.spec.md Section 11.3
+#
+# Shrinks large tool results stored in message.tool_calls. Results are
+# kept for transparency only (history sent to the model is message text),
+# so a short summary is enough once a turn is old.
+
+import json
+from typing import Optional, List, Dict, Any
+
+from .config import (
+    TOOL_RESULT_MAX_BYTES,
+    PRUNED_LIST_MAX_IDS,
+    PRUNED_STRING_MAX_CHARS,
+)
+
+
+def summarize_result(value: Any) -> Any:
+    """Summarize a result value: lists become counts plus item IDs."""
+    if isinstance(value, list):
+        summary: Dict[str, Any] = {"count": len(value)}
+        ids = [item["id"] for item in value if isinstance(item, dict) and "id" in item]
+        if ids:
+            summary["ids"] = ids[:PRUNED_LIST_MAX_IDS]
+        return summary
+    if isinstance(value, dict):
+        return {key: summarize_result(item) for key, item in value.items()}
+    if isinstance(value, str) and len(value) > PRUNED_STRING_MAX_CHARS:
+        return value[:PRUNED_STRING_MAX_CHARS] + "…"
+    return value
+
+
+def prune_result(result: Any, max_bytes: int = TOOL_RESULT_MAX_BYTES) -> Any:
+    """
+    Replace a tool result with a summary if it is larger than max_bytes.
+
+    A list_tasks result {"tasks": [...]} becomes
+    {"pruned": true, "original_bytes": n, "summary": {"tasks": {"count": 120, "ids": [...]}}}.
+
+    Args:
+        result: Tool result as stored in tool_calls
+        max_bytes: Largest serialized result kept as-is
+
+    Returns:
+        The original result, or its pruned summary
+    """
+    if isinstance(result, dict) and result.get("pruned"):
+        return result
+
+    size = len(json.dumps(result, separators=(",", ":"), default=str))
+    if size <= max_bytes:
+        return result
+
+    return {
+        "pruned": True,
+        "original_bytes": size,
+        "summary": summarize_result(result),
+    }
+
+
+def prune_tool_calls(
+    tool_calls: Optional[List[Dict[str, Any]]],
+    max_bytes: int = TOOL_RESULT_MAX_BYTES,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Prune every large result in a message's tool_calls.
+
+    Args:
+        tool_calls: Stored tool call records ({"tool", "arguments", "result"})
+        max_bytes: Largest serialized result kept as-is
+
+    Returns:
+        The same list if nothing changed, otherwise a pruned copy
+    """
+    if not tool_calls:
+        return tool_calls
+
+    pruned = []
+    changed = False
+    for call in tool_calls:
+        if isinstance(call, dict) and "result" in call:
+            result = prune_result(call["result"], max_bytes)
+            if result is not call["result"]:
+                call = {**call, "result": result}
+                changed = True
+        pruned.append(call)
+
+    return pruned if changed else tool_calls
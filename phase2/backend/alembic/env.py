@@ -3,6 +3,10 @@ Alembic Environment Configuration
 
 Configures Alembic migrations for SQLModel/SQLAlchemy.
 Loads database URL from environment variables.
+
+Migrations run against every database: DATABASE_URL (shard 0) and each
+task shard in DATABASE_SHARDS, in shard id order. The shard id is passed
+to revisions as config.attributes["shard_id"].
 """
 
 from logging.config import fileConfig
@@ -41,6 +45,15 @@ if database_url:
     config.set_main_option("sqlalchemy.url", database_url)
 
 
+def shard_urls() -> dict:
+    """Return shard id -> URL, shard 0 being sqlalchemy.url."""
+    from app.config import get_settings
+
+    urls = get_settings().shard_urls
+    urls[0] = config.get_main_option("sqlalchemy.url")
+    return dict(sorted(urls.items()))
+
+
 def run_migrations_offline() -> None:
     """
     Run migrations in 'offline' mode.
@@ -53,16 +66,18 @@ def run_migrations_offline() -> None:
     Calls to context.execute() here emit the given string to the
     script output.
     """
-    url = config.get_main_option("sqlalchemy.url")
-    context.configure(
-        url=url,
-        target_metadata=target_metadata,
-        literal_binds=True,
-        dialect_opts={"paramstyle": "named"},
-    )
+    for shard_id, url in shard_urls().items():
+        config.attributes["shard_id"] = shard_id
+        context.configure(
+            url=url,
+            target_metadata=target_metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+        )
 
-    with context.begin_transaction():
-        context.run_migrations()
+        with context.begin_transaction():
+            context.execute(f"-- shard {shard_id}")
+            context.run_migrations()
 
 
 def run_migrations_online() -> None:
@@ -72,20 +87,23 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata
+    for shard_id, url in shard_urls().items():
+        config.attributes["shard_id"] = shard_id
+        connectable = engine_from_config(
+            {**config.get_section(config.config_ini_section, {}), "sqlalchemy.url": url},
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+        connectable.dispose()
 
 
 if context.is_offline_mode():
@@ -9,8 +9,11 @@ Creates the tasks table with:
 - Foreign key to users.id
 - Indexes for performance
 - Constraints for data integrity
+
+On task shards other than 0 (alembic/env.py passes the shard id) there
+is no users table, so the foreign key is only created on shard 0.
 """
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
@@ -21,6 +24,20 @@ branch_labels = None
 depends_on = None
 
 
+def _user_foreign_key() -> list:
+    if int(context.config.attributes.get('shard_id', 0)) != 0:
+        return []
+    return [
+        sa.ForeignKeyConstraint(
+            ['user_id'],
+            ['users.id'],
+            name='fk_tasks_user_id',
+            ondelete='CASCADE',
+            onupdate='CASCADE'
+        ),
+    ]
+
+
 def upgrade() -> None:
     """
     Create tasks table with indexes and constraints.
@@ -40,7 +57,7 @@ def upgrade() -> None:
     - idx_tasks_user_created: On (user_id, created_at DESC) for sorting
 
     Constraints:
-    - Foreign key: user_id → users.id (CASCADE on delete/update)
+    - Foreign key: user_id → users.id (CASCADE on delete/update; shard 0 only)
     - NOT NULL: user_id, title, completed, created_at, updated_at
     - DEFAULT: completed = FALSE, timestamps = NOW()
     """
@@ -63,14 +80,8 @@ def upgrade() -> None:
         sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
         sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
 
-        # Foreign key constraint
-        sa.ForeignKeyConstraint(
-            ['user_id'],
-            ['users.id'],
-            name='fk_tasks_user_id',
-            ondelete='CASCADE',
-            onupdate='CASCADE'
-        ),
+        # Foreign key constraint (shard 0 only)
+        *_user_foreign_key(),
     )
 
     # Create indexes for performance
@@ -0,0 +1,101 @@
+"""add_conversation_summary
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 01:00:00
+
+Adds the Phase III rolling summary columns to the conversation table:
+- summary: Summary of turns evicted from the agent context window
+- summary_through_id: Last message ID folded into the summary
+
+Fresh databases get the Phase III conversation and message tables here
+(in their Phase III shape, before this and later revisions extend them).
+Databases whose tables were created by SQLModel.metadata.create_all keep
+them. Chat tables live on shard 0 only (see alembic/env.py), so other
+shards are left alone.
+
+Downgrade only drops the summary columns, never the chat tables.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def _conversation_columns() -> set:
+    """Return existing conversation column names (empty if no table)."""
+    inspector = sa.inspect(op.get_bind())
+    if 'conversation' not in inspector.get_table_names():
+        return set()
+    return {column['name'] for column in inspector.get_columns('conversation')}
+
+
+def _create_chat_tables() -> None:
+    """Create conversation and message where missing."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'conversation' not in tables:
+        op.create_table(
+            'conversation',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        )
+        op.create_index('ix_conversation_user_id', 'conversation', ['user_id'])
+
+    if 'message' not in tables:
+        op.create_table(
+            'message',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('conversation_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('role', sa.String(), nullable=False),
+            sa.Column('content', sa.String(), nullable=False),
+            sa.Column('tool_calls', sa.JSON(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['conversation_id'], ['conversation.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        )
+        op.create_index('ix_message_conversation_id', 'message', ['conversation_id'])
+        op.create_index('ix_message_user_id', 'message', ['user_id'])
+
+
+def upgrade() -> None:
+    """Create the chat tables if missing and add the summary columns."""
+    if _shard_id() != 0:
+        return
+
+    _create_chat_tables()
+    columns = _conversation_columns()
+
+    if 'summary' not in columns:
+        op.add_column('conversation', sa.Column('summary', sa.Text(), nullable=True))
+    if 'summary_through_id' not in columns:
+        op.add_column(
+            'conversation',
+            sa.Column('summary_through_id', sa.Integer(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    """Drop summary columns from conversation."""
+    if _shard_id() != 0:
+        return
+
+    columns = _conversation_columns()
+
+    if 'summary_through_id' in columns:
+        op.drop_column('conversation', 'summary_through_id')
+    if 'summary' in columns:
+        op.drop_column('conversation', 'summary')
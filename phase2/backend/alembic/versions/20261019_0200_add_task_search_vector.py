@@ -0,0 +1,61 @@
+"""add_task_search_vector
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 02:00:00
+
+Adds full-text search over task title and description (PostgreSQL only):
+- search_vector: Generated tsvector column (title weighted A, description B)
+- idx_tasks_search: GIN index on search_vector
+
+Used by PostgreSQLTaskRepository.search() and the search_tasks MCP tool.
+Other databases are left unchanged (the repository falls back to ILIKE).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Must match SEARCH_CONFIG in postgresql_task_repository.py
+SEARCH_CONFIG = 'english'
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Add generated search_vector column and GIN index to tasks."""
+    if not _is_postgresql():
+        return
+
+    op.execute(
+        f"""
+        ALTER TABLE tasks
+        ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'idx_tasks_search',
+        'tasks',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Drop search index and column."""
+    if not _is_postgresql():
+        return
+
+    op.drop_index('idx_tasks_search', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
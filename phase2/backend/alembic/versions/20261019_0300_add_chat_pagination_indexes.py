@@ -0,0 +1,59 @@
+"""add_chat_pagination_indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 03:00:00
+
+Adds composite indexes for the Phase III history endpoints:
+- idx_conversation_user_updated: conversation (user_id, updated_at DESC)
+  for keyset pagination of a user's conversations
+- idx_message_conversation_created: message (conversation_id, created_at)
+  for message pages and the last-message preview lookup
+
+The tables are created by revision 002 on shard 0 (chat tables are not
+on other shards). Databases built by SQLModel.metadata.create_all
+already have the indexes, so each is only added when missing.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ('idx_conversation_user_updated', 'conversation', ['user_id', sa.text('updated_at DESC')]),
+    ('idx_message_conversation_created', 'message', ['conversation_id', 'created_at']),
+)
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def _existing_indexes(table: str) -> set:
+    """Return index names on table."""
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Create the pagination indexes where missing."""
+    if _shard_id() != 0:
+        return
+
+    for name, table, columns in _INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Drop the pagination indexes."""
+    if _shard_id() != 0:
+        return
+
+    for name, table, _columns in reversed(_INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,92 @@
+"""add_message_archive
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 04:00:00
+
+Adds storage for the Phase III message retention job:
+- message_archive: compressed blocks of archived messages per conversation
+- conversation.archived_through_id: last message ID moved to the archive
+
+Shard 0 only, like the other chat tables (revision 002). Databases
+built by SQLModel.metadata.create_all already have both, so each change
+is only applied when missing.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def _tables() -> set:
+    """Return existing table names."""
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Create message_archive and add conversation.archived_through_id."""
+    if _shard_id() != 0:
+        return
+
+    tables = _tables()
+
+    columns = {
+        column['name']
+        for column in sa.inspect(op.get_bind()).get_columns('conversation')
+    }
+    if 'archived_through_id' not in columns:
+        op.add_column(
+            'conversation',
+            sa.Column('archived_through_id', sa.Integer(), nullable=True),
+        )
+
+    if 'message_archive' not in tables:
+        op.create_table(
+            'message_archive',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('conversation_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('first_message_id', sa.Integer(), nullable=False),
+            sa.Column('last_message_id', sa.Integer(), nullable=False),
+            sa.Column('message_count', sa.Integer(), nullable=False),
+            sa.Column('payload', sa.LargeBinary(), nullable=False),
+            sa.Column('raw_bytes', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['conversation_id'], ['conversation.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        )
+        op.create_index(
+            'idx_message_archive_conversation_last',
+            'message_archive',
+            ['conversation_id', 'last_message_id'],
+        )
+        op.create_index(
+            'ix_message_archive_user_id',
+            'message_archive',
+            ['user_id'],
+        )
+
+
+def downgrade() -> None:
+    """Drop message_archive and conversation.archived_through_id."""
+    if _shard_id() != 0:
+        return
+
+    if 'message_archive' in _tables():
+        op.drop_table('message_archive')
+
+    columns = {
+        column['name']
+        for column in sa.inspect(op.get_bind()).get_columns('conversation')
+    }
+    if 'archived_through_id' in columns:
+        op.drop_column('conversation', 'archived_through_id')
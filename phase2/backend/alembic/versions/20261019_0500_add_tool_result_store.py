@@ -0,0 +1,56 @@
+"""add_tool_result_store
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 05:00:00
+
+Adds tool_result, the content-addressed store for large Phase III tool
+results referenced from message.tool_calls. Primary key is
+(user_id, content_hash), so identical results are stored once per user.
+
+Shard 0 only, like the other chat tables (revision 002). It is only
+created when missing, since SQLModel.metadata.create_all may have
+created it already.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def _tables() -> set:
+    """Return existing table names."""
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Create tool_result if missing."""
+    if _shard_id() != 0 or 'tool_result' in _tables():
+        return
+
+    op.create_table(
+        'tool_result',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('compressed', sa.Boolean(), nullable=False),
+        sa.Column('raw_bytes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'content_hash'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+    )
+
+
+def downgrade() -> None:
+    """Drop tool_result."""
+    if _shard_id() == 0 and 'tool_result' in _tables():
+        op.drop_table('tool_result')
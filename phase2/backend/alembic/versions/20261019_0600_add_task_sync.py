@@ -0,0 +1,72 @@
+"""add_task_sync
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 06:00:00
+
+Supports delta sync (GET /api/{user_id}/tasks/changes):
+- idx_tasks_user_updated: tasks (user_id, updated_at) so "changed since"
+  reads only the changed rows of one user
+- task_tombstones: one row per deleted task (task_id, user_id,
+  deleted_at), indexed on (user_id, deleted_at); rows past the retention
+  window are purged by app.infrastructure.tombstones
+
+task_tombstones is also created by SQLModel.metadata.create_all
+(STARTUP_SCHEMA=create_all), so it is only created here when missing.
+Its foreign key to user.id is only created on shard 0: the user table
+reaches other task shards in revision 010.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    """Create the updated_at index and the tombstone table."""
+    inspector = _inspector()
+
+    existing = {index['name'] for index in inspector.get_indexes('tasks')}
+    if 'idx_tasks_user_updated' not in existing:
+        op.create_index('idx_tasks_user_updated', 'tasks', ['user_id', 'updated_at'])
+
+    if 'task_tombstones' not in inspector.get_table_names():
+        op.create_table(
+            'task_tombstones',
+            sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('task_id'),
+            *([sa.ForeignKeyConstraint(['user_id'], ['user.id'])] if _shard_id() == 0 else []),
+        )
+        op.create_index(
+            'idx_task_tombstones_user_deleted',
+            'task_tombstones',
+            ['user_id', 'deleted_at'],
+        )
+
+
+def downgrade() -> None:
+    """Drop the tombstone table and the updated_at index."""
+    inspector = _inspector()
+
+    if 'task_tombstones' in inspector.get_table_names():
+        op.drop_index('idx_task_tombstones_user_deleted', table_name='task_tombstones')
+        op.drop_table('task_tombstones')
+
+    existing = {index['name'] for index in inspector.get_indexes('tasks')}
+    if 'idx_tasks_user_updated' in existing:
+        op.drop_index('idx_tasks_user_updated', table_name='tasks')
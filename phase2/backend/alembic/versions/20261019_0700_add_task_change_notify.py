@@ -0,0 +1,77 @@
+"""add_task_change_notify
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 07:00:00
+
+PostgreSQL only: adds the notify_task_change() trigger function and an
+AFTER INSERT/UPDATE/DELETE row trigger on tasks. Each change sends a
+NOTIFY on the task_changes channel (delivered when the writing
+transaction commits), consumed by app.infrastructure.task_events for
+GET /api/{user_id}/tasks/events.
+
+Payload (JSON, well under the 8000-byte NOTIFY limit since title is
+capped at 200 and description at 1000 characters):
+    {"op", "user_id", "id", "at", "task": {id, title, description,
+     completed, created_at, updated_at} | null}
+
+Because the trigger fires for every writer (API, Phase III tools, bulk
+statements), repositories do not need to emit notifications themselves.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the notify function and trigger."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+        DECLARE
+            changed tasks%ROWTYPE;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                changed := OLD;
+            ELSE
+                changed := NEW;
+            END IF;
+            PERFORM pg_notify('task_changes', json_build_object(
+                'op', TG_OP,
+                'user_id', changed.user_id,
+                'id', changed.id,
+                'at', to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+                'task', CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE json_build_object(
+                    'id', changed.id,
+                    'title', changed.title,
+                    'description', coalesce(changed.description, ''),
+                    'completed', changed.completed,
+                    'created_at', changed.created_at,
+                    'updated_at', changed.updated_at
+                ) END
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+    """)
+
+
+def downgrade() -> None:
+    """Drop the trigger and function."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS tasks_notify_change ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS notify_task_change()")
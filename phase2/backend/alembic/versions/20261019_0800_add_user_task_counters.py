@@ -0,0 +1,64 @@
+"""add_user_task_counters
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 08:00:00
+
+Adds user_task_counters (user_id, total, completed, updated_at), the
+per-user task counts behind GET /api/{user_id}/tasks/stats, and
+backfills a row for every user who already has tasks.
+
+The table is also created by SQLModel.metadata.create_all
+(STARTUP_SCHEMA=create_all), and the repository
+seeds a missing row on a user's first mutation, so the backfill only
+inserts rows for users who do not have one yet.
+
+The foreign key to user.id is only created on shard 0: the user table
+reaches other task shards in revision 010.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def upgrade() -> None:
+    """Create user_task_counters if missing and backfill it."""
+    if 'user_task_counters' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'user_task_counters',
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('completed', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('user_id'),
+            *([sa.ForeignKeyConstraint(['user_id'], ['user.id'])] if _shard_id() == 0 else []),
+        )
+
+    op.execute("""
+        INSERT INTO user_task_counters (user_id, total, completed, updated_at)
+        SELECT t.user_id,
+               COUNT(*),
+               SUM(CASE WHEN t.completed THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM tasks t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM user_task_counters c WHERE c.user_id = t.user_id
+        )
+        GROUP BY t.user_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop user_task_counters."""
+    if 'user_task_counters' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table('user_task_counters')
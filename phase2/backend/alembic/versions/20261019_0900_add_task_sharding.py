@@ -0,0 +1,103 @@
+"""add_task_sharding
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 09:00:00
+
+Prepares the schema for user-based task sharding
+(app.infrastructure.sharding). alembic/env.py runs every revision once
+per shard and passes the shard id in config.attributes["shard_id"].
+
+- Shard 0: adds user_shard_placement (user_id, shard_id, moving,
+  updated_at), the per-user overrides written by the rebalancer.
+- Shard N > 0: adds the user table (id, email, name). Better Auth
+  only creates it on shard 0; ShardMap.ensure_user copies a user's row
+  here before their first task is written.
+- Shard N > 0 (PostgreSQL): starts the tasks id sequence at
+  N * 100,000,000 + 1. Task IDs stay unique across shards, so a user's
+  tasks keep their IDs (and clients their references) when the
+  rebalancer moves them. SQLite shards keep overlapping IDs and are for
+  local testing only; the rebalancer refuses moves that would collide.
+- PostgreSQL: the tasks_notify_change trigger is skipped when the
+  todo.skip_task_notify setting is 'on'. The rebalancer sets it while it
+  copies and deletes a moving user's rows, so SSE clients are not told
+  their tasks were deleted.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Task IDs issued by shard N start at N * SHARD_ID_BLOCK + 1
+# (INTEGER ids leave room for 21 shards)
+SHARD_ID_BLOCK = 100_000_000
+
+
+def _shard_id() -> int:
+    return int(context.config.attributes.get('shard_id', 0))
+
+
+def upgrade() -> None:
+    """Create user_shard_placement on shard 0, the user table on other shards."""
+    bind = op.get_bind()
+    shard_id = _shard_id()
+
+    if shard_id == 0:
+        if 'user_shard_placement' not in sa.inspect(bind).get_table_names():
+            op.create_table(
+                'user_shard_placement',
+                sa.Column('user_id', sa.String(), nullable=False),
+                sa.Column('shard_id', sa.Integer(), nullable=False),
+                sa.Column('moving', sa.Boolean(), nullable=False, server_default=sa.false()),
+                sa.Column('updated_at', sa.DateTime(), nullable=False),
+                sa.PrimaryKeyConstraint('user_id'),
+            )
+    elif 'user' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'user',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('email', sa.String(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    if bind.dialect.name != 'postgresql':
+        return
+
+    if shard_id > 0:
+        op.execute(sa.text("""
+            SELECT setval(pg_get_serial_sequence('tasks', 'id'), :base, false)
+            WHERE (SELECT coalesce(max(id), 0) FROM tasks) < :base
+        """).bindparams(base=shard_id * SHARD_ID_BLOCK + 1))
+
+    op.execute("DROP TRIGGER IF EXISTS tasks_notify_change ON tasks")
+    op.execute("""
+        CREATE TRIGGER tasks_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW
+        WHEN (current_setting('todo.skip_task_notify', true) IS DISTINCT FROM 'on')
+        EXECUTE FUNCTION notify_task_change()
+    """)
+
+
+def downgrade() -> None:
+    """Restore the unconditional trigger; drop user_shard_placement or user."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS tasks_notify_change ON tasks")
+        op.execute("""
+            CREATE TRIGGER tasks_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+        """)
+
+    if _shard_id() == 0:
+        op.drop_table('user_shard_placement')
+    else:
+        op.drop_table('user')
@@ -0,0 +1,310 @@
+"""partition_tasks
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 10:00:00
+
+PostgreSQL only: converts tasks into a table PARTITION BY HASH (user_id),
+so vacuum and index maintenance work on partitions a fraction of the
+size. Every PostgreSQLTaskRepository query filters on user_id, so each
+one touches a single partition (checked by
+phase-3/backend/benchmarks/partition_pruning.py).
+
+Partition count: `alembic -x task_partitions=32 upgrade head`, or the
+TASK_PARTITIONS environment variable (default 16). Copy batch size:
+-x task_partition_batch=N (default 10000).
+
+The table stays writable while its rows are copied:
+
+1. tasks_partitioned is created LIKE tasks (defaults, generated
+   search_vector and the id sequence included), with primary key
+   (id, user_id) and partitions tasks_p0..tasks_p{N-1}. The indexes
+   are created ON ONLY the parent.
+2. A trigger on tasks mirrors every insert, update and delete into
+   tasks_partitioned.
+3. Existing rows are copied in id-range batches, each committed on its
+   own. A batch locks its source rows FOR SHARE, so a concurrent delete
+   either happens before the row is read or is mirrored after it was
+   copied.
+4. Each partition's indexes are built CONCURRENTLY and attached to the
+   parent indexes.
+5. The row counts of both tables are compared in one snapshot, without
+   a lock. Every write to tasks is mirrored in its own transaction, so
+   the counts agree in any snapshot once the copy is complete, and they
+   stay equal while the trigger is in place.
+6. In one short transaction, tasks is locked, the mirror trigger and
+   max(id) of both tables are checked (index lookups, no scans), the id
+   sequence is handed over, the old table is dropped and
+   tasks_partitioned takes its name, indexes and notify trigger.
+
+Steps 1-5 run in autocommit mode. If the migration is interrupted, run
+it again: leftovers from the earlier attempt are dropped first.
+
+Other databases are left unchanged.
+"""
+import os
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+DEFAULT_PARTITIONS = 16
+DEFAULT_BATCH_SIZE = 10000
+
+NEW_TABLE = 'tasks_partitioned'
+
+# name -> column list, as created by revisions 001, 003 and 007
+INDEXES = {
+    'idx_tasks_user_id': '(user_id)',
+    'idx_tasks_user_completed': '(user_id, completed)',
+    'idx_tasks_user_created': '(user_id, created_at DESC)',
+    'idx_tasks_user_updated': '(user_id, updated_at)',
+    'idx_tasks_search': 'USING gin (search_vector)',
+}
+
+
+def partition_name(remainder: int) -> str:
+    """Name of the partition holding hash remainder `remainder`."""
+    return f'tasks_p{remainder}'
+
+
+def partition_index_name(name: str, remainder: int) -> str:
+    """Name of a partition's copy of index `name` (idx_tasks_* -> idx_tasks_p{N}_*)."""
+    return name.replace('idx_tasks', f'idx_tasks_p{remainder}', 1)
+
+
+def _option(name: str, env: str, default: int) -> int:
+    value = context.get_x_argument(as_dictionary=True).get(name) or os.getenv(env)
+    return int(value) if value else default
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tasks'::regclass"
+    )).first() is not None
+
+
+def _copy_columns(bind) -> list:
+    """Columns to copy (generated columns are recomputed)."""
+    return list(bind.execute(sa.text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'tasks'
+          AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+    """)).scalars())
+
+
+def _create_partitioned_table(bind, partitions: int, columns: list) -> list:
+    """Create tasks_partitioned, its partitions, parent indexes and the mirror trigger."""
+    bind.execute(sa.text(f"DROP TABLE IF EXISTS {NEW_TABLE} CASCADE"))
+    bind.execute(sa.text(f"""
+        CREATE TABLE {NEW_TABLE} (
+            LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS,
+            CONSTRAINT {NEW_TABLE}_pkey PRIMARY KEY (id, user_id)
+        ) PARTITION BY HASH (user_id)
+    """))
+    for remainder in range(partitions):
+        bind.execute(sa.text(f"""
+            CREATE TABLE {partition_name(remainder)} PARTITION OF {NEW_TABLE}
+            FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})
+        """))
+
+    # Foreign keys are not copied by LIKE
+    for definition in bind.execute(sa.text("""
+        SELECT pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = 'tasks'::regclass AND contype = 'f'
+    """)).scalars():
+        bind.execute(sa.text(f"ALTER TABLE {NEW_TABLE} ADD {definition}"))
+
+    has_search = 'search_vector' in set(bind.execute(sa.text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'tasks'
+    """)).scalars())
+    indexes = [name for name in INDEXES if name != 'idx_tasks_search' or has_search]
+    for name in indexes:
+        bind.execute(sa.text(f"CREATE INDEX {name}_p ON ONLY {NEW_TABLE} {INDEXES[name]}"))
+
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'NEW.{column}' for column in columns)
+    assignments = ', '.join(
+        f'{column} = EXCLUDED.{column}' for column in columns if column not in ('id', 'user_id')
+    )
+    bind.execute(sa.text(f"""
+        CREATE OR REPLACE FUNCTION tasks_mirror_to_partitioned() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM {NEW_TABLE} WHERE id = OLD.id AND user_id = OLD.user_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {NEW_TABLE} ({column_list}) VALUES ({new_values})
+                ON CONFLICT (id, user_id) DO UPDATE SET {assignments};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    bind.execute(sa.text("""
+        CREATE TRIGGER tasks_mirror_to_partitioned
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_mirror_to_partitioned()
+    """))
+    return indexes
+
+
+def _copy_rows(bind, columns: list, batch_size: int) -> None:
+    """Copy existing rows in id-range batches, one transaction each."""
+    low, high = bind.execute(sa.text("SELECT min(id), max(id) FROM tasks")).one()
+    if low is None:
+        return
+
+    column_list = ', '.join(columns)
+    statement = sa.text(f"""
+        WITH batch AS (
+            SELECT {column_list} FROM tasks
+            WHERE id >= :start AND id < :stop
+            FOR SHARE
+        )
+        INSERT INTO {NEW_TABLE} ({column_list})
+        SELECT {column_list} FROM batch
+        ON CONFLICT (id, user_id) DO NOTHING
+    """)
+    for start in range(low, high + 1, batch_size):
+        bind.execute(statement, {'start': start, 'stop': start + batch_size})
+
+
+def _build_partition_indexes(bind, partitions: int, indexes: list) -> None:
+    """Build each partition's indexes without blocking the mirror trigger."""
+    for remainder in range(partitions):
+        for name in indexes:
+            partition_index = partition_index_name(name, remainder)
+            bind.execute(sa.text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} "
+                f"ON {partition_name(remainder)} {INDEXES[name]}"
+            ))
+            bind.execute(sa.text(f"ALTER INDEX {name}_p ATTACH PARTITION {partition_index}"))
+
+
+def _check_row_counts(bind) -> None:
+    """Compare row counts in one snapshot (full scans, so before the lock)."""
+    old_count, new_count = bind.execute(sa.text(
+        f"SELECT (SELECT count(*) FROM tasks), (SELECT count(*) FROM {NEW_TABLE})"
+    )).one()
+    if old_count != new_count:
+        raise RuntimeError(
+            f"tasks has {old_count} rows but {NEW_TABLE} has {new_count}; aborting the swap"
+        )
+
+
+def _check_mirror(bind) -> None:
+    """Under the lock: the mirror trigger is still enabled and max(id) agrees."""
+    mirrored = bind.execute(sa.text("""
+        SELECT 1 FROM pg_trigger
+        WHERE tgrelid = 'tasks'::regclass AND tgname = 'tasks_mirror_to_partitioned'
+          AND tgenabled <> 'D'
+    """)).first()
+    old_max, new_max = bind.execute(sa.text(
+        f"SELECT (SELECT max(id) FROM tasks), (SELECT max(id) FROM {NEW_TABLE})"
+    )).one()
+    if not mirrored or old_max != new_max:
+        raise RuntimeError(
+            f"{NEW_TABLE} stopped mirroring tasks (max id {new_max} vs {old_max}); "
+            "aborting the swap"
+        )
+
+
+def upgrade() -> None:
+    """Convert tasks to a hash-partitioned table, copying rows online."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or _is_partitioned(bind):
+        return
+
+    partitions = _option('task_partitions', 'TASK_PARTITIONS', DEFAULT_PARTITIONS)
+    batch_size = _option('task_partition_batch', 'TASK_PARTITION_BATCH', DEFAULT_BATCH_SIZE)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        bind.execute(sa.text("DROP TRIGGER IF EXISTS tasks_mirror_to_partitioned ON tasks"))
+        columns = _copy_columns(bind)
+        indexes = _create_partitioned_table(bind, partitions, columns)
+        _copy_rows(bind, columns, batch_size)
+        _build_partition_indexes(bind, partitions, indexes)
+        _check_row_counts(bind)
+
+    # Swap (in the migration transaction); the lock is held for
+    # catalog changes and index lookups only
+    bind = op.get_bind()
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    _check_mirror(bind)
+
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('tasks', 'id')")).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {NEW_TABLE}.id")
+    op.execute("DROP TABLE tasks")
+    op.execute("DROP FUNCTION tasks_mirror_to_partitioned()")
+    op.execute(f"ALTER TABLE {NEW_TABLE} RENAME TO tasks")
+    op.execute(f"ALTER TABLE tasks RENAME CONSTRAINT {NEW_TABLE}_pkey TO tasks_pkey")
+    for name in indexes:
+        op.execute(f"ALTER INDEX {name}_p RENAME TO {name}")
+
+    # Revisions 008/010: task change notifications. Touching the function
+    # makes sessions recompile its tasks%ROWTYPE against the new table
+    if bind.execute(sa.text("SELECT 1 FROM pg_proc WHERE proname = 'notify_task_change'")).first():
+        op.execute("ALTER FUNCTION notify_task_change() RESET ALL")
+        op.execute("""
+            CREATE TRIGGER tasks_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW
+            WHEN (current_setting('todo.skip_task_notify', true) IS DISTINCT FROM 'on')
+            EXECUTE FUNCTION notify_task_change()
+        """)
+
+
+def downgrade() -> None:
+    """Copy tasks back into an unpartitioned table (writes are blocked meanwhile)."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not _is_partitioned(bind):
+        return
+
+    columns = ', '.join(_copy_columns(bind))
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TABLE tasks_unpartitioned (
+            LIKE tasks INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS,
+            CONSTRAINT tasks_unpartitioned_pkey PRIMARY KEY (id)
+        )
+    """)
+    for definition in bind.execute(sa.text("""
+        SELECT pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = 'tasks'::regclass AND contype = 'f'
+    """)).scalars():
+        op.execute(f"ALTER TABLE tasks_unpartitioned ADD {definition}")
+    op.execute(f"INSERT INTO tasks_unpartitioned ({columns}) SELECT {columns} FROM tasks")
+
+    index_names = set(bind.execute(sa.text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'tasks'"
+    )).scalars())
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('tasks', 'id')")).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY tasks_unpartitioned.id")
+    op.execute("DROP TABLE tasks CASCADE")
+    op.execute("ALTER TABLE tasks_unpartitioned RENAME TO tasks")
+    op.execute("ALTER TABLE tasks RENAME CONSTRAINT tasks_unpartitioned_pkey TO tasks_pkey")
+    for name, columns_sql in INDEXES.items():
+        if name in index_names:
+            op.execute(f"CREATE INDEX {name} ON tasks {columns_sql}")
+
+    if bind.execute(sa.text("SELECT 1 FROM pg_proc WHERE proname = 'notify_task_change'")).first():
+        op.execute("ALTER FUNCTION notify_task_change() RESET ALL")
+        op.execute("""
+            CREATE TRIGGER tasks_notify_change
+            AFTER INSERT OR UPDATE OR DELETE ON tasks
+            FOR EACH ROW
+            WHEN (current_setting('todo.skip_task_notify', true) IS DISTINCT FROM 'on')
+            EXECUTE FUNCTION notify_task_change()
+        """)
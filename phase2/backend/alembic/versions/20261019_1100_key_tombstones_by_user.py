@@ -0,0 +1,81 @@
+"""key_tombstones_by_user
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 11:00:00
+
+task_tombstones is keyed on (task_id, user_id) instead of task_id.
+SQLite hands out the ID of a deleted task again, possibly to another
+user, so one task ID can have tombstones for several users; each user's
+delete only ever replaces that user's own tombstone.
+
+Databases created by SQLModel.metadata.create_all already have the new
+key and are left unchanged. SQLite tables are rebuilt.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+TABLE = 'task_tombstones'
+
+
+def _primary_key() -> list:
+    return sa.inspect(op.get_bind()).get_pk_constraint(TABLE)['constrained_columns']
+
+
+def _set_primary_key(columns: list) -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if bind.dialect.name == 'postgresql':
+        name = inspector.get_pk_constraint(TABLE)['name']
+        op.execute(
+            f"ALTER TABLE {TABLE} DROP CONSTRAINT {name}, "
+            f"ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({', '.join(columns)})"
+        )
+        return
+
+    # SQLite cannot alter a primary key: copy into a rebuilt table
+    has_user_fk = bool(inspector.get_foreign_keys(TABLE))
+    op.create_table(
+        f'{TABLE}_new',
+        sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(*columns),
+        *([sa.ForeignKeyConstraint(['user_id'], ['user.id'])] if has_user_fk else []),
+    )
+    op.execute(
+        f"INSERT INTO {TABLE}_new (task_id, user_id, deleted_at) "
+        f"SELECT task_id, user_id, deleted_at FROM {TABLE}"
+    )
+    op.drop_index('idx_task_tombstones_user_deleted', table_name=TABLE)
+    op.drop_table(TABLE)
+    op.rename_table(f'{TABLE}_new', TABLE)
+    op.create_index('idx_task_tombstones_user_deleted', TABLE, ['user_id', 'deleted_at'])
+
+
+def upgrade() -> None:
+    """Make (task_id, user_id) the tombstone primary key."""
+    if _primary_key() == ['task_id']:
+        _set_primary_key(['task_id', 'user_id'])
+
+
+def downgrade() -> None:
+    """Key tombstones on task_id again, keeping the newest per task ID."""
+    if _primary_key() != ['task_id', 'user_id']:
+        return
+
+    op.execute(f"""
+        DELETE FROM {TABLE} WHERE EXISTS (
+            SELECT 1 FROM {TABLE} newer
+            WHERE newer.task_id = {TABLE}.task_id
+              AND (newer.deleted_at, newer.user_id) > ({TABLE}.deleted_at, {TABLE}.user_id)
+        )
+    """)
+    _set_primary_key(['task_id'])
@@ -1,6 +1,7 @@
 """Task repository interface."""
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Tuple
 from app.domain.entities.task import Task
 
 
@@ -40,6 +41,38 @@ class TaskRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def find(
+        self,
+        completed: Optional[bool] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """Get tasks matching optional filters.
+
+        Args:
+            completed: Only completed (True) or pending (False) tasks; None for both
+            query: Case-insensitive substring of title or description
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of matching tasks, newest first
+        """
+        pass
+
+    @abstractmethod
+    def search(self, text: str, limit: int) -> List[Task]:
+        """Full-text search over task title and description.
+
+        Args:
+            text: Free-text search terms
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Matching tasks, best match first
+        """
+        pass
+
     @abstractmethod
     def update(self, task: Task) -> Task:
         """Update an existing task.
@@ -64,6 +97,99 @@ class TaskRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, task_ids: List[int]) -> List[Task]:
+        """Get the tasks with the given IDs.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Tasks that were found (missing IDs are omitted)
+        """
+        pass
+
+    @abstractmethod
+    def complete_many(self, task_ids: List[int]) -> int:
+        """Mark several tasks as completed in one operation.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Number of tasks updated
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, tasks: List[Task]) -> List[Task]:
+        """Update several existing tasks in one operation.
+
+        Args:
+            tasks: Tasks to update
+
+        Returns:
+            Updated tasks
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, task_ids: List[int]) -> int:
+        """Delete several tasks in one operation.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Number of tasks deleted
+        """
+        pass
+
+    @abstractmethod
+    def changed_since(self, since: datetime) -> List[Task]:
+        """Get tasks created or modified after a point in time.
+
+        Args:
+            since: Exclusive lower bound on updated_at
+
+        Returns:
+            Changed tasks, oldest change first
+        """
+        pass
+
+    @abstractmethod
+    def deleted_since(self, since: datetime) -> List[Tuple[int, datetime]]:
+        """Get tasks deleted after a point in time.
+
+        Args:
+            since: Exclusive lower bound on the deletion time
+
+        Returns:
+            (task ID, deleted_at) pairs, oldest deletion first
+        """
+        pass
+
+    @abstractmethod
+    def count_by_status(self) -> Tuple[int, int]:
+        """Get task counts.
+
+        Returns:
+            (total, completed)
+        """
+        pass
+
+    @abstractmethod
+    def created_per_day(self, since: datetime) -> List[Tuple[date, int]]:
+        """Count tasks created per day.
+
+        Args:
+            since: Inclusive lower bound on the creation time
+
+        Returns:
+            (day, count) pairs in day order; days without tasks are omitted
+        """
+        pass
+
     @abstractmethod
     def exists(self, task_id: int) -> bool:
         """Check if task exists.
@@ -1,16 +1,28 @@
 """Use cases package."""
 from .add_task import AddTaskUseCase
 from .list_tasks import ListTasksUseCase
+from .search_tasks import SearchTasksUseCase
 from .update_task import UpdateTaskUseCase
 from .delete_task import DeleteTaskUseCase
 from .complete_task import CompleteTaskUseCase
 from .uncomplete_task import UncompleteTaskUseCase
+from .complete_tasks import CompleteTasksUseCase
+from .delete_tasks import DeleteTasksUseCase
+from .update_tasks import UpdateTasksUseCase
+from .get_task_changes import GetTaskChangesUseCase
+from .get_task_stats import GetTaskStatsUseCase
 
 __all__ = [
     "AddTaskUseCase",
     "ListTasksUseCase",
+    "SearchTasksUseCase",
     "UpdateTaskUseCase",
     "DeleteTaskUseCase",
     "CompleteTaskUseCase",
     "UncompleteTaskUseCase",
+    "CompleteTasksUseCase",
+    "DeleteTasksUseCase",
+    "UpdateTasksUseCase",
+    "GetTaskChangesUseCase",
+    "GetTaskStatsUseCase",
 ]
@@ -0,0 +1,35 @@
+"""Complete tasks (batch) use case."""
+from typing import List, Tuple
+from app.application.interfaces.task_repository import TaskRepository
+from app.domain.entities.task import Task
+
+
+class CompleteTasksUseCase:
+    """Use case for marking several tasks as completed at once."""
+
+    def __init__(self, repository: TaskRepository):
+        """Initialize use case.
+
+        Args:
+            repository: Task repository
+        """
+        self.repository = repository
+
+    def execute(self, task_ids: List[int]) -> Tuple[List[Task], List[int]]:
+        """Mark tasks as completed.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            (completed tasks, IDs that were not found)
+        """
+        tasks = self.repository.get_many(task_ids)
+        found = {task.id for task in tasks}
+        missing = [task_id for task_id in task_ids if task_id not in found]
+
+        for task in tasks:
+            task.complete()
+        self.repository.complete_many([task.id for task in tasks])
+
+        return tasks, missing
@@ -0,0 +1,39 @@
+"""Get task changes (delta sync) use case."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.application.interfaces.task_repository import TaskRepository
+from app.domain.entities.task import Task
+
+
+class GetTaskChangesUseCase:
+    """Use case for fetching what changed since a client last synced."""
+
+    def __init__(self, repository: TaskRepository):
+        """Initialize use case.
+
+        Args:
+            repository: Task repository
+        """
+        self.repository = repository
+
+    def execute(
+        self,
+        since: Optional[datetime],
+        horizon: datetime,
+    ) -> Tuple[List[Task], List[Tuple[int, datetime]], bool]:
+        """Get tasks changed and deleted since a point in time.
+
+        Deletions are only known while their tombstones are kept, so a
+        client that last synced before horizon (or never) gets every task
+        and must replace its local list instead of merging.
+
+        Args:
+            since: Time of the client's last sync (None for a first sync)
+            horizon: Oldest time for which tombstones are still complete
+
+        Returns:
+            (changed tasks, (task ID, deleted_at) tombstones, full resync flag)
+        """
+        if since is None or since < horizon:
+            return self.repository.get_all(), [], True
+        return self.repository.changed_since(since), self.repository.deleted_since(since), False
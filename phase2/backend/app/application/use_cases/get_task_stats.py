@@ -0,0 +1,44 @@
+"""Get task statistics use case."""
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict
+from app.application.interfaces.task_repository import TaskRepository
+
+
+class GetTaskStatsUseCase:
+    """Use case for summarizing a user's tasks without loading them."""
+
+    def __init__(self, repository: TaskRepository):
+        """Initialize use case.
+
+        Args:
+            repository: Task repository
+        """
+        self.repository = repository
+
+    def execute(self, days: int, today: date) -> Dict[str, Any]:
+        """Get status counts, completion rate and a created-per-day histogram.
+
+        Args:
+            days: Number of days in the histogram, ending with today
+            today: Last day of the histogram (UTC)
+
+        Returns:
+            Dict with total, pending, completed, completion_rate and
+            created_per_day (one (day, count) pair per day, zeros included)
+        """
+        total, completed = self.repository.count_by_status()
+
+        first_day = today - timedelta(days=days - 1)
+        counts = dict(self.repository.created_per_day(datetime.combine(first_day, time.min)))
+        histogram = [
+            (day, counts.get(day, 0))
+            for day in (first_day + timedelta(days=offset) for offset in range(days))
+        ]
+
+        return {
+            "total": total,
+            "pending": total - completed,
+            "completed": completed,
+            "completion_rate": round(completed / total, 4) if total else 0.0,
+            "created_per_day": histogram,
+        }
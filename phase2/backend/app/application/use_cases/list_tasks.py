@@ -1,5 +1,5 @@
 """List tasks use case."""
-from typing import List
+from typing import List, Optional
 from app.application.interfaces.task_repository import TaskRepository
 from app.domain.entities.task import Task
 
@@ -15,10 +15,25 @@ class ListTasksUseCase:
         """
         self.repository = repository
 
-    def execute(self) -> List[Task]:
-        """List all tasks.
+    def execute(
+        self,
+        completed: Optional[bool] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """List tasks, optionally filtered.
+
+        Filters are applied by the repository (in the database for
+        PostgreSQLTaskRepository); with no filters all tasks are returned.
+
+        Args:
+            completed: Only completed (True) or pending (False) tasks
+            query: Case-insensitive substring of title or description
+            limit: Maximum number of tasks to return
 
         Returns:
-            List of all tasks
+            List of matching tasks
         """
-        return self.repository.get_all()
+        if completed is None and query is None and limit is None:
+            return self.repository.get_all()
+        return self.repository.find(completed=completed, query=query, limit=limit)
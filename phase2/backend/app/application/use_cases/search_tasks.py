@@ -0,0 +1,30 @@
+"""Search tasks use case."""
+from typing import List
+from app.application.interfaces.task_repository import TaskRepository
+from app.domain.entities.task import Task
+
+
+class SearchTasksUseCase:
+    """Use case for finding tasks by free-text search."""
+
+    def __init__(self, repository: TaskRepository):
+        """Initialize use case.
+
+        Args:
+            repository: Task repository
+        """
+        self.repository = repository
+
+    def execute(self, text: str, limit: int = 5) -> List[Task]:
+        """Search tasks by title and description.
+
+        Args:
+            text: Free-text search terms
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Matching tasks, best match first
+        """
+        if not text or not text.strip():
+            return []
+        return self.repository.search(text, limit)
@@ -0,0 +1,58 @@
+"""Update tasks (batch) use case."""
+from typing import Dict, List, Optional, Tuple
+from app.application.interfaces.task_repository import TaskRepository
+from app.domain.entities.task import Task
+from app.domain.exceptions import TaskValidationError
+
+
+class UpdateTasksUseCase:
+    """Use case for updating several tasks at once."""
+
+    def __init__(self, repository: TaskRepository):
+        """Initialize use case.
+
+        Args:
+            repository: Task repository
+        """
+        self.repository = repository
+
+    def execute(
+        self,
+        patches: List[Dict[str, Optional[str]]]
+    ) -> Tuple[List[Task], List[int], Dict[int, str]]:
+        """Update tasks.
+
+        Each patch is validated on its own; invalid patches are skipped
+        and the remaining tasks are still updated.
+
+        Args:
+            patches: Dicts with task_id and optional title/description
+
+        Returns:
+            (updated tasks, IDs that were not found,
+             {task_id: validation message} for rejected patches)
+        """
+        tasks = {
+            task.id: task
+            for task in self.repository.get_many([p["task_id"] for p in patches])
+        }
+        missing: List[int] = []
+        invalid: Dict[int, str] = {}
+        changed: List[Task] = []
+
+        for patch in patches:
+            task = tasks.get(patch["task_id"])
+            if task is None:
+                missing.append(patch["task_id"])
+                continue
+            try:
+                if patch.get("title") is not None:
+                    task.update_title(patch["title"])
+                if patch.get("description") is not None:
+                    task.update_description(patch["description"])
+            except TaskValidationError as e:
+                invalid[task.id] = str(e)
+                continue
+            changed.append(task)
+
+        return self.repository.update_many(changed), missing, invalid
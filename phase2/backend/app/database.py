@@ -1,25 +1,162 @@
 """
 Database Connection and Session Management
 
-Manages SQLModel engine and database sessions.
+Manages SQLModel engines and database sessions.
 Provides dependency injection for FastAPI endpoints.
+
+With DATABASE_REPLICA_URL set, GET/HEAD requests read from the replica
+engine, except:
+- for a short window after the client's last write (read-your-writes),
+  signalled by the primary_until cookie or X-Primary-Until header that
+  write requests receive
+- while the replica lags more than REPLICA_MAX_LAG_SECONDS, or cannot
+  be reached
+Everything else (writes, background jobs, listeners) uses `engine`.
+
+With DATABASE_SHARDS set, requests whose path has a {user_id} use the
+engine of that user's shard (see app.infrastructure.sharding); the
+replica only serves users on shard 0. Writes for a user the rebalancer
+is moving get 503 with Retry-After. Routes whose tables are not sharded
+use get_unsharded_session.
 """
 
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import text
 from sqlmodel import SQLModel, create_engine, Session
 from app.config import get_settings
+from app.infrastructure.schema_version import check_schema_version
+from app.infrastructure.sharding import PRIMARY_SHARD, ShardMap, UserMovingError
+from app.infrastructure.slow_queries import SlowQueryLog
+from app.instrumentation import instrument_engine
 
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-# Create database engine
-# pool_pre_ping ensures connections are alive before using
-# echo prints SQL statements when debug=True
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=5,  # Connection pool size
-    max_overflow=10,  # Max overflow connections
+# Read-your-writes marker: epoch seconds until which reads use the primary
+PRIMARY_UNTIL_COOKIE = "primary_until"
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+# Methods that may be served by the replica
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Replay lag of a PostgreSQL standby in seconds (0 when it has replayed
+# everything it received, NULL when the server is not a standby)
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+# Opt-in slow query log with sampled EXPLAIN plans (see app.infrastructure.slow_queries)
+slow_query_log = (
+    SlowQueryLog(
+        settings.slow_query_ms,
+        capacity=settings.slow_query_log_size,
+        explain_interval_seconds=settings.slow_query_explain_interval_seconds,
+        sample_rate=settings.slow_query_explain_sample_rate,
+        explain_timeout_ms=settings.slow_query_explain_timeout_ms,
+    )
+    if settings.slow_query_ms > 0 else None
+)
+
+
+def _create_engine(url: str):
+    # pool_pre_ping ensures connections are alive before using
+    # echo prints SQL statements when debug=True
+    new_engine = create_engine(
+        url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        pool_size=5,  # Connection pool size
+        max_overflow=10,  # Max overflow connections
+    )
+    # Count statements and DB time per request (Server-Timing)
+    instrument_engine(new_engine)
+    if slow_query_log is not None:
+        slow_query_log.attach(new_engine)
+    return new_engine
+
+
+# Create database engines (primary, replica and shards if configured)
+engine = _create_engine(settings.database_url)
+replica_engine = (
+    _create_engine(settings.database_replica_url) if settings.database_replica_url else None
+)
+shard_map = ShardMap(
+    {
+        shard_id: engine if shard_id == PRIMARY_SHARD else _create_engine(url)
+        for shard_id, url in settings.shard_urls.items()
+    },
+    settings.shard_ring_ids,
+    refresh_seconds=settings.shard_placement_refresh_seconds,
+)
+
+
+class ReplicaMonitor:
+    """
+    Cached view of whether the replica is fit to serve reads.
+
+    Lag is probed at most once per check interval per process; one
+    request thread runs the probe while the others use the last result.
+    A failed probe marks the replica unhealthy until the next check.
+    """
+
+    def __init__(self, replica, max_lag_seconds: float, check_seconds: float):
+        self._replica = replica
+        self._max_lag_seconds = max_lag_seconds
+        self._check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._healthy = True
+        self.lag_seconds: Optional[float] = None
+
+    def is_usable(self) -> bool:
+        """True if the replica's last known lag is within the limit."""
+        if time.monotonic() - self._checked_at >= self._check_seconds:
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._check()
+                finally:
+                    self._lock.release()
+        return self._healthy
+
+    def _check(self) -> None:
+        try:
+            lag = 0.0
+            with self._replica.connect() as connection:
+                if self._replica.dialect.name == "postgresql":
+                    lag = float(connection.execute(_PG_REPLICA_LAG).scalar() or 0.0)
+                else:
+                    connection.execute(text("SELECT 1"))
+            self.lag_seconds = lag
+            healthy = lag <= self._max_lag_seconds
+            if healthy != self._healthy:
+                state = "usable" if healthy else "lagging"
+                logger.warning(f"Read replica {state} (lag {lag:.2f}s)")
+            self._healthy = healthy
+        except Exception:
+            if self._healthy:
+                logger.exception("Read replica unreachable, reading from primary")
+            self.lag_seconds = None
+            self._healthy = False
+        self._checked_at = time.monotonic()
+
+
+replica_monitor = (
+    ReplicaMonitor(
+        replica_engine,
+        max_lag_seconds=settings.replica_max_lag_seconds,
+        check_seconds=settings.replica_lag_check_seconds,
+    )
+    if replica_engine is not None else None
 )
 
 
@@ -27,19 +164,150 @@ def create_db_and_tables():
     """
     Create all database tables defined in SQLModel.
 
-    This should be called on application startup.
+    For tests, benchmarks and local development; deployed workers check
+    the Alembic revision instead (see check_schema).
     Creates tables for all SQLModel classes with table=True.
 
     Note: Better Auth creates users table automatically.
     This only creates tasks table and any future tables.
     """
     # Import models to ensure they're registered
-    from app.infrastructure.models import TaskDB  # noqa: F401
+    from app.infrastructure.models import (  # noqa: F401
+        TaskDB,
+        TaskTombstoneDB,
+        UserDB,
+        UserShardPlacementDB,
+        UserTaskCountersDB,
+    )
 
     SQLModel.metadata.create_all(engine)
 
+    # Other shards only hold the sharded tables (and copied user rows)
+    sharded_tables = [
+        model.__table__ for model in (UserDB, TaskDB, TaskTombstoneDB, UserTaskCountersDB)
+    ]
+    for shard_id, shard_engine in shard_map.engines.items():
+        if shard_id != PRIMARY_SHARD:
+            SQLModel.metadata.create_all(shard_engine, tables=sharded_tables)
 
-def get_session():
+
+def check_schema() -> str:
+    """
+    Check that every shard database is migrated to this release's head.
+
+    Returns:
+        The Alembic head revision
+
+    Raises:
+        SchemaVersionError: A database is behind (run `alembic upgrade head`)
+    """
+    return check_schema_version(
+        {f"shard {shard_id}": shard_engine for shard_id, shard_engine in shard_map.engines.items()}
+    )
+
+
+def warm_up_pools(connections: int) -> int:
+    """
+    Open pooled connections to every database in parallel.
+
+    Each engine gets min(connections, pool size) connections at once;
+    they are returned to the pool idle, so the first requests skip the
+    connect and TLS handshake.
+
+    Args:
+        connections: Connections to open per engine
+
+    Returns:
+        Number of connections opened
+    """
+    engines = list(shard_map.engines.values())
+    if replica_engine is not None:
+        engines.append(replica_engine)
+    targets = [
+        target for target in engines
+        for _ in range(min(connections, target.pool.size() if hasattr(target.pool, "size") else 1))
+    ]
+    if not targets:
+        return 0
+
+    with ThreadPoolExecutor(
+        max_workers=len(targets), thread_name_prefix="pool-warm-up"
+    ) as executor:
+        # Hold every connection until all are open, so none is reused
+        opened = list(executor.map(lambda target: target.connect(), targets))
+    for connection in opened:
+        connection.close()
+    return len(opened)
+
+
+def _primary_until(request: Request) -> float:
+    """Read the client's read-your-writes deadline (0 if absent or malformed)."""
+    value = request.headers.get(PRIMARY_UNTIL_HEADER) or request.cookies.get(PRIMARY_UNTIL_COOKIE)
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+def select_engine(request: Request, response: Response, sharded: bool = True):
+    """
+    Pick the engine for a request.
+
+    The path's user_id picks the shard. On shard 0, write requests use
+    the primary and (re)start the client's read-your-writes window; read
+    requests use the replica when one is configured, the window has
+    passed and the replica is not lagging.
+
+    Args:
+        request: Incoming request
+        response: Response whose cookies/headers carry the window
+        sharded: Route by the path's user_id (False = always shard 0)
+
+    Returns:
+        The shard, primary or replica engine
+
+    Raises:
+        HTTPException 503: If a write targets a user who is being moved
+    """
+    user_id = request.path_params.get("user_id") if sharded else None
+    if user_id is not None and shard_map.sharded:
+        try:
+            shard_engine = shard_map.engine_for(
+                user_id, for_write=request.method not in READ_METHODS
+            )
+        except UserMovingError:
+            retry_after = max(1, int(settings.shard_placement_refresh_seconds + 0.999))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Tasks are being moved, please retry shortly",
+                headers={"Retry-After": str(retry_after)},
+            )
+        if shard_engine is not engine:
+            return shard_engine
+
+    if replica_engine is None:
+        return engine
+
+    if request.method not in READ_METHODS:
+        until = f"{time.time() + settings.replica_sticky_seconds:.3f}"
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            until,
+            max_age=max(1, int(settings.replica_sticky_seconds + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+        response.headers[PRIMARY_UNTIL_HEADER] = until
+        return engine
+
+    if _primary_until(request) > time.time():
+        return engine
+    if not replica_monitor.is_usable():
+        return engine
+    return replica_engine
+
+
+def get_session(request: Request, response: Response):
     """
     Dependency for getting database session.
 
@@ -47,6 +315,13 @@ def get_session():
     to endpoint handlers. Automatically closes session
     after request completes.
 
+    Requests are routed to the path user's shard; GET/HEAD requests
+    on shard 0 may be served from the read replica (see select_engine).
+
+    Args:
+        request: Incoming request (injected by FastAPI)
+        response: Outgoing response (injected by FastAPI)
+
     Yields:
         Session: Database session
 
@@ -56,7 +331,28 @@ def get_session():
             tasks = session.query(TaskDB).all()
             return tasks
     """
-    with Session(engine) as session:
+    with Session(select_engine(request, response)) as session:
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+def get_unsharded_session(request: Request, response: Response):
+    """
+    Dependency for a session on shard 0, whatever the path's user_id.
+
+    For routes whose tables are not sharded (users, Phase III chat
+    tables). GET/HEAD requests may still use the read replica.
+
+    Args:
+        request: Incoming request (injected by FastAPI)
+        response: Outgoing response (injected by FastAPI)
+
+    Yields:
+        Session: Database session
+    """
+    with Session(select_engine(request, response, sharded=False)) as session:
         try:
             yield session
         finally:
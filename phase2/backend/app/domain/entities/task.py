@@ -13,7 +13,8 @@ class Task:
         title: str,
         description: str = "",
         status: TaskStatus = TaskStatus.PENDING,
-        created_at: datetime = None
+        created_at: datetime = None,
+        updated_at: datetime = None
     ):
         """Initialize a task.
 
@@ -23,12 +24,14 @@ class Task:
             description: Task description (0-1000 characters)
             status: Task status (default: PENDING)
             created_at: Creation timestamp (default: now)
+            updated_at: Last modification timestamp (default: created_at)
 
         Raises:
             TaskValidationError: If validation fails
         """
         self._id = id
         self._created_at = created_at or datetime.now()
+        self._updated_at = updated_at or self._created_at
         self._status = status
 
         # Validate and set title
@@ -64,6 +67,11 @@ class Task:
         """Get creation timestamp (immutable)."""
         return self._created_at
 
+    @property
+    def updated_at(self) -> datetime:
+        """Get last modification timestamp (as loaded from storage)."""
+        return self._updated_at
+
     def complete(self) -> None:
         """Mark task as completed."""
         self._status = TaskStatus.COMPLETED
@@ -5,6 +5,7 @@ Infrastructure layer database representations.
 Maps to domain entities via repository pattern.
 """
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 from typing import Optional
@@ -46,6 +47,12 @@ class TaskDB(SQLModel, table=True):
 
     __tablename__ = "tasks"
 
+    # The ORM identifies rows by (id, user_id), so the UPDATE, DELETE and
+    # refresh statements it emits also filter on the partition key of a
+    # hash-partitioned tasks table (Alembic revision 011). The table's
+    # own primary key stays id alone.
+    __mapper_args__ = {"primary_key": ["id", "user_id"]}
+
     # Primary key
     id: Optional[int] = Field(
         default=None,
@@ -103,5 +110,126 @@ class TaskDB(SQLModel, table=True):
         }
 
 
+class TaskTombstoneDB(SQLModel, table=True):
+    """
+    Record of a deleted task, for delta sync.
+
+    Written in the same transaction as the task delete so clients syncing
+    with GET /api/{user_id}/tasks/changes learn about deletions. Rows
+    older than the tombstone retention window are purged periodically;
+    clients whose sync token predates that window get a full resync.
+
+    Keyed on (task_id, user_id): SQLite may hand the ID of a deleted task
+    to another user, and each user's tombstone must survive the other's
+    delete.
+
+    Attributes:
+        task_id: ID of the deleted task
+        user_id: Owner of the deleted task
+        deleted_at: Deletion timestamp
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("idx_task_tombstones_user_deleted", "user_id", "deleted_at"),
+    )
+
+    task_id: int = Field(
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+        description="ID of the deleted task"
+    )
+
+    user_id: str = Field(
+        primary_key=True,
+        foreign_key="user.id",
+        description="Owner of the deleted task"
+    )
+
+    deleted_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="Deletion timestamp"
+    )
+
+
+class UserTaskCountersDB(SQLModel, table=True):
+    """
+    Per-user task counts, maintained on every task mutation.
+
+    PostgreSQLTaskRepository updates the row in the same transaction as
+    each add, update, complete and delete, so GET /api/{user_id}/tasks/stats
+    answers status counts with one primary-key lookup instead of scanning
+    the user's tasks. Pending is total - completed.
+
+    Attributes:
+        user_id: Owner of the counted tasks
+        total: Number of tasks
+        completed: Number of completed tasks
+        updated_at: Last counter change
+    """
+
+    __tablename__ = "user_task_counters"
+
+    user_id: str = Field(
+        foreign_key="user.id",
+        primary_key=True,
+        description="Owner of the counted tasks"
+    )
+
+    total: int = Field(
+        default=0,
+        description="Number of tasks"
+    )
+
+    completed: int = Field(
+        default=0,
+        description="Number of completed tasks"
+    )
+
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="Last counter change"
+    )
+
+
+class UserShardPlacementDB(SQLModel, table=True):
+    """
+    Per-user shard placement override, kept on shard 0.
+
+    Users are normally placed by hashing user_id onto the shard ring
+    (app.infrastructure.sharding). The rebalancer writes a row while it
+    moves a user (moving=True: writes are refused until the copy is done)
+    and keeps it afterwards so the user stays on the new shard until the
+    ring is changed to match.
+
+    Attributes:
+        user_id: User whose placement is overridden
+        shard_id: Shard holding the user's tasks
+        moving: True while the user's rows are being copied away
+        updated_at: Last placement change
+    """
+
+    __tablename__ = "user_shard_placement"
+
+    user_id: str = Field(
+        primary_key=True,
+        description="User whose placement is overridden"
+    )
+
+    shard_id: int = Field(
+        description="Shard holding the user's tasks"
+    )
+
+    moving: bool = Field(
+        default=False,
+        description="True while the user's rows are being moved"
+    )
+
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="Last placement change"
+    )
+
+
 # Note: users table is managed by Better Auth
 # We do NOT define it here - it's created and managed by Better Auth
@@ -0,0 +1,391 @@
+"""
+Online Shard Rebalancing
+
+Moves users' task rows (tasks, task_tombstones, user_task_counters)
+between shards while the API keeps serving them. Moving one user:
+
+1. Freeze: a user_shard_placement row marks the user as moving. Once
+   every worker has re-read placements (SHARD_PLACEMENT_REFRESH_SECONDS
+   plus a margin), writes for the user get 503 + Retry-After; reads are
+   still served from the current shard.
+2. Copy: rows are copied to the target shard in keyset batches inside one
+   target transaction, then every source id is checked on the target and
+   the target's counters are recounted. Rows already on the target are
+   kept (merge), so stray rows left on a shard can be folded back too.
+3. Flip: the placement row points at the target (or is dropped when the
+   ring already does), ending the freeze.
+4. Clean up: after another refresh interval the source rows are deleted.
+
+On PostgreSQL, copying and cleaning up run with todo.skip_task_notify
+set, so SSE clients see neither duplicate upserts nor deletions.
+
+Adding shard 3 to a 0,1,2 ring:
+    1. Add "3" to DATABASE_SHARDS (not SHARD_RING), run
+       `alembic upgrade head`, deploy.
+    2. python -m app.infrastructure.rebalance pin --ring 0,1,2,3
+       (pins users the new ring would move to where their rows are)
+    3. Set SHARD_RING=0,1,2,3 and deploy; new users go to the new ring.
+    4. python -m app.infrastructure.rebalance apply
+       (moves every pinned user to their ring shard)
+
+`plan` lists pending moves and stray rows (rows on a shard the user is
+not routed to, e.g. a first task written between steps 2 and 3);
+`move USER --from S --to T` handles those one at a time.
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import case, delete, func, select, text
+from sqlmodel import Session
+
+from app.domain.exceptions import TodoAppException
+from app.infrastructure.models import (
+    TaskDB,
+    TaskTombstoneDB,
+    UserShardPlacementDB,
+    UserTaskCountersDB,
+)
+from app.infrastructure.sharding import PRIMARY_SHARD, HashRing
+
+logger = logging.getLogger(__name__)
+
+# Rows read and inserted per statement while copying
+COPY_BATCH_SIZE = 1000
+
+# Added to the placement refresh interval before relying on a change
+SETTLE_MARGIN_SECONDS = 1.0
+
+# Tables holding a user's task data, copied in this order
+MOVED_MODELS = (TaskDB, TaskTombstoneDB)
+
+
+class RebalanceError(TodoAppException):
+    """Raised when a user cannot be moved safely."""
+    pass
+
+
+def _shard_map():
+    from app.database import shard_map
+
+    return shard_map
+
+
+def _settle_seconds() -> float:
+    from app.config import get_settings
+
+    return get_settings().shard_placement_refresh_seconds + SETTLE_MARGIN_SECONDS
+
+
+def _skip_notify(connection) -> None:
+    """Keep the tasks_notify_change trigger quiet for this transaction."""
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL todo.skip_task_notify = 'on'"))
+
+
+def users_on_shard(shard_id: int) -> Set[str]:
+    """Return every user_id with task rows on a shard."""
+    engine = _shard_map().engines[shard_id]
+    users: Set[str] = set()
+    with engine.connect() as connection:
+        for model in (*MOVED_MODELS, UserTaskCountersDB):
+            users.update(connection.execute(select(model.__table__.c.user_id).distinct()).scalars())
+    return users
+
+
+def plan(ring_ids: Optional[Iterable[int]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Work out which users must move to match a ring.
+
+    Args:
+        ring_ids: Target ring (defaults to the configured SHARD_RING)
+
+    Returns:
+        {"moves": [{user_id, source, target}], "stray": [{user_id, shard, routed}]}
+    """
+    shard_map = _shard_map()
+    ring = HashRing(ring_ids) if ring_ids is not None else shard_map.ring
+    shard_map.invalidate()
+
+    moves: List[Dict[str, Any]] = []
+    stray: List[Dict[str, Any]] = []
+    for shard_id in sorted(shard_map.engines):
+        for user_id in sorted(users_on_shard(shard_id)):
+            routed = shard_map.shard_for(user_id)
+            if routed != shard_id:
+                stray.append({"user_id": user_id, "shard": shard_id, "routed": routed})
+            elif ring.shard_for(user_id) != shard_id:
+                moves.append(
+                    {"user_id": user_id, "source": shard_id, "target": ring.shard_for(user_id)}
+                )
+    return {"moves": moves, "stray": stray}
+
+
+def _set_placement(user_id: str, shard_id: Optional[int], moving: bool = False) -> None:
+    """Write (or, with shard_id None, drop) a user's placement row on shard 0."""
+    shard_map = _shard_map()
+    with Session(shard_map.engines[PRIMARY_SHARD]) as session:
+        existing = session.get(UserShardPlacementDB, user_id)
+        if shard_id is None:
+            if existing is not None:
+                session.delete(existing)
+        else:
+            session.merge(UserShardPlacementDB(
+                user_id=user_id, shard_id=shard_id, moving=moving, updated_at=datetime.utcnow()
+            ))
+        session.commit()
+    shard_map.invalidate()
+
+
+def pin(ring_ids: Iterable[int]) -> int:
+    """
+    Pin users the new ring would move to the shard holding their rows.
+
+    Run before switching SHARD_RING so no user is routed away from
+    their data; `apply` then moves them.
+
+    Returns:
+        Number of users pinned
+    """
+    moves = plan(ring_ids)["moves"]
+    for move in moves:
+        _set_placement(move["user_id"], move["source"])
+    logger.info(f"Pinned {len(moves)} users ahead of the ring change")
+    return len(moves)
+
+
+def _copy_rows(source, target, model, user_id: str, target_shard: int, batch_size: int) -> int:
+    """Copy one table's rows for a user, skipping ids already on the target."""
+    table = model.__table__
+    key = list(table.primary_key.columns)[0]
+    copied = 0
+    last = None
+
+    while True:
+        statement = select(table).where(table.c.user_id == user_id).order_by(key).limit(batch_size)
+        if last is not None:
+            statement = statement.where(key > last)
+        rows = [dict(row._mapping) for row in source.execute(statement)]
+        if not rows:
+            return copied
+        last = rows[-1][key.name]
+
+        existing = target.execute(
+            select(key, table.c.user_id).where(key.in_([row[key.name] for row in rows]))
+        ).all()
+        # Tombstones are keyed per user, so only tasks can collide
+        taken = [row_id for row_id, owner in existing if owner != user_id]
+        if taken and "user_id" not in table.primary_key.columns:
+            raise RebalanceError(
+                f"{table.name} ids {taken[:5]} are already used on shard {target_shard}"
+            )
+        present = {row_id for row_id, owner in existing if owner == user_id}
+        rows = [row for row in rows if row[key.name] not in present]
+        if rows:
+            target.execute(table.insert(), rows)
+            copied += len(rows)
+
+
+def _ids(connection, model, user_id: str) -> Set[Any]:
+    table = model.__table__
+    key = list(table.primary_key.columns)[0]
+    return set(connection.execute(select(key).where(table.c.user_id == user_id)).scalars())
+
+
+def _recount(connection, user_id: str) -> None:
+    """Rebuild the user's counter row from the tasks on this shard."""
+    tasks = TaskDB.__table__
+    counters = UserTaskCountersDB.__table__
+    total, completed = connection.execute(
+        select(
+            func.count(tasks.c.id),
+            func.coalesce(func.sum(case((tasks.c.completed, 1), else_=0)), 0),
+        ).where(tasks.c.user_id == user_id)
+    ).one()
+    connection.execute(delete(counters).where(counters.c.user_id == user_id))
+    connection.execute(counters.insert().values(
+        user_id=user_id, total=total, completed=completed, updated_at=datetime.utcnow()
+    ))
+
+
+def move_user(
+    user_id: str,
+    source_shard: int,
+    target_shard: int,
+    batch_size: int = COPY_BATCH_SIZE,
+    settle_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Move a user's task rows from one shard to another, online.
+
+    Args:
+        user_id: User to move
+        source_shard: Shard to copy from (its rows are deleted afterwards)
+        target_shard: Shard to copy to (existing rows are kept)
+        batch_size: Rows per copy statement
+        settle_seconds: Wait for workers to see a placement change
+            (defaults to the refresh interval plus a margin)
+
+    Returns:
+        Dict with copied row counts and the freeze duration
+
+    Raises:
+        RebalanceError: If ids collide or the copy cannot be verified;
+            the user's placement is restored and no rows are deleted
+    """
+    shard_map = _shard_map()
+    if source_shard == target_shard:
+        raise RebalanceError("Source and target shard are the same")
+    settle = _settle_seconds() if settle_seconds is None else settle_seconds
+    source = shard_map.engines[source_shard]
+    target = shard_map.engines[target_shard]
+
+    with Session(shard_map.engines[PRIMARY_SHARD]) as session:
+        previous = session.get(UserShardPlacementDB, user_id)
+        previous = (previous.shard_id, previous.moving) if previous else None
+    if previous is not None and previous[1]:
+        raise RebalanceError(f"User {user_id} is already being moved")
+
+    # 1. Freeze writes where the user is currently routed
+    routed = shard_map.shard_for(user_id)
+    _set_placement(user_id, routed, moving=True)
+    frozen_at = time.monotonic()
+    time.sleep(settle)
+
+    # 2. Copy and verify in one target transaction
+    try:
+        if target_shard != PRIMARY_SHARD:
+            shard_map.ensure_user(target_shard, user_id)
+        copied: Dict[str, int] = {}
+        with source.connect() as src, target.begin() as dst:
+            _skip_notify(dst)
+            for model in MOVED_MODELS:
+                copied[model.__tablename__] = _copy_rows(
+                    src, dst, model, user_id, target_shard, batch_size
+                )
+                missing = _ids(src, model, user_id) - _ids(dst, model, user_id)
+                if missing:
+                    raise RebalanceError(
+                        f"{len(missing)} {model.__tablename__} rows missing on shard {target_shard}"
+                    )
+            _recount(dst, user_id)
+    except Exception:
+        _set_placement(user_id, previous[0] if previous else None)
+        raise
+
+    # 3. Flip; drop the override if the ring already routes the user there
+    ring_target = shard_map.ring.shard_for(user_id)
+    _set_placement(user_id, None if ring_target == target_shard else target_shard)
+    frozen_seconds = time.monotonic() - frozen_at
+
+    # 4. Delete the source rows once no worker reads them any more
+    time.sleep(settle)
+    with source.begin() as src:
+        _skip_notify(src)
+        for model in (*MOVED_MODELS, UserTaskCountersDB):
+            src.execute(delete(model.__table__).where(model.__table__.c.user_id == user_id))
+
+    logger.info(f"Moved user {user_id} from shard {source_shard} to {target_shard}: {copied}")
+    return {
+        "user_id": user_id,
+        "source": source_shard,
+        "target": target_shard,
+        "copied": copied,
+        "write_freeze_s": round(frozen_seconds, 3),
+    }
+
+
+def apply(
+    limit: Optional[int] = None,
+    batch_size: int = COPY_BATCH_SIZE,
+    settle_seconds: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Move every user whose rows are not on their ring shard.
+
+    Users are moved one at a time; a failed move is logged and skipped.
+
+    Args:
+        limit: Stop after this many users
+        batch_size: Rows per copy statement
+        settle_seconds: See move_user
+
+    Returns:
+        One move_user result (or {"user_id", "error"}) per user
+    """
+    results: List[Dict[str, Any]] = []
+    for move in plan()["moves"][:limit]:
+        try:
+            results.append(move_user(
+                move["user_id"], move["source"], move["target"],
+                batch_size=batch_size, settle_seconds=settle_seconds,
+            ))
+        except RebalanceError as e:
+            logger.error(f"Could not move user {move['user_id']}: {e}")
+            results.append({"user_id": move["user_id"], "error": str(e)})
+    return results
+
+
+def unpin() -> int:
+    """Drop placement rows that the configured ring already agrees with."""
+    shard_map = _shard_map()
+    with Session(shard_map.engines[PRIMARY_SHARD]) as session:
+        rows = session.exec(
+            select(UserShardPlacementDB).where(UserShardPlacementDB.moving == False)  # noqa: E712
+        ).scalars().all()
+        redundant = [row for row in rows if shard_map.ring.shard_for(row.user_id) == row.shard_id]
+        for row in redundant:
+            session.delete(row)
+        session.commit()
+    shard_map.invalidate()
+    return len(redundant)
+
+
+def _ring(value: str) -> List[int]:
+    return [int(shard_id) for shard_id in value.split(",") if shard_id.strip()]
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Move users' tasks between shards.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = commands.add_parser("plan", help="List pending moves and stray rows")
+    plan_parser.add_argument("--ring", type=_ring, help="Target ring (default: SHARD_RING)")
+
+    pin_parser = commands.add_parser("pin", help="Pin users a new ring would move")
+    pin_parser.add_argument("--ring", type=_ring, required=True)
+
+    apply_parser = commands.add_parser("apply", help="Move users onto their ring shard")
+    apply_parser.add_argument("--limit", type=int)
+    apply_parser.add_argument("--batch-size", type=int, default=COPY_BATCH_SIZE)
+
+    move_parser = commands.add_parser("move", help="Move one user")
+    move_parser.add_argument("user_id")
+    move_parser.add_argument("--from", dest="source", type=int, required=True)
+    move_parser.add_argument("--to", dest="target", type=int, required=True)
+    move_parser.add_argument("--batch-size", type=int, default=COPY_BATCH_SIZE)
+
+    commands.add_parser("unpin", help="Drop placements the ring already agrees with")
+
+    args = parser.parse_args()
+    if args.command == "plan":
+        result: Any = plan(args.ring)
+    elif args.command == "pin":
+        result = pin(args.ring)
+    elif args.command == "apply":
+        result = apply(limit=args.limit, batch_size=args.batch_size)
+    elif args.command == "move":
+        result = move_user(args.user_id, args.source, args.target, batch_size=args.batch_size)
+    else:
+        result = unpin()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,29 @@ Concrete implementation of TaskRepository interface using SQLModel.
 Provides user-scoped data access with automatic filtering by user_id.
 """
 
-from typing import Optional, List
-from datetime import datetime
-from sqlmodel import Session, select
+import re
+from typing import Optional, List, Tuple
+from datetime import date, datetime
+from sqlalchemy import bindparam, case, delete, insert, inspect, literal_column, update
+from sqlmodel import Session, select, or_, func
 
 from app.application.interfaces.task_repository import TaskRepository
 from app.domain.entities.task import Task
 from app.domain.value_objects.task_status import TaskStatus
 from app.domain.exceptions import TaskNotFoundError
-from app.infrastructure.models import TaskDB
+from app.infrastructure.models import TaskDB, TaskTombstoneDB, UserTaskCountersDB
+
+# Text search configuration of the tasks.search_vector column
+# (Alembic revision 003)
+SEARCH_CONFIG = "english"
+
+# Engines (by URL) whose tasks table has the search_vector column
+_SEARCH_VECTOR_SUPPORT: dict = {}
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so text is matched literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class PostgreSQLTaskRepository(TaskRepository):
@@ -73,6 +87,7 @@ class PostgreSQLTaskRepository(TaskRepository):
 
         # Add to session and flush to get ID
         self.session.add(db_task)
+        self._adjust_counters(1, int(db_task.completed))
         self.session.commit()
         self.session.refresh(db_task)
 
@@ -130,6 +145,141 @@ class PostgreSQLTaskRepository(TaskRepository):
 
         return [self._to_domain(task) for task in db_tasks]
 
+    def find(
+        self,
+        completed: Optional[bool] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        """
+        Get the authenticated user's tasks matching optional filters.
+
+        All filtering happens in SQL so only matching rows leave the
+        database; the status filter uses idx_tasks_user_completed.
+
+        Args:
+            completed: True for completed, False for pending, None for both
+            query: Case-insensitive substring matched against title and description
+            limit: Maximum number of tasks to return (newest first)
+
+        Returns:
+            List of matching Task entities (may be empty)
+
+        Security:
+            - Always filters by user_id
+            - LIKE wildcards in query are escaped and matched literally
+        """
+        statement = select(TaskDB).where(
+            TaskDB.user_id == self.user_id  # Critical: user_id filter
+        )
+
+        if completed is not None:
+            statement = statement.where(TaskDB.completed == completed)
+
+        if query:
+            pattern = f"%{_escape_like(query)}%"
+            statement = statement.where(
+                or_(
+                    TaskDB.title.ilike(pattern, escape="\\"),
+                    TaskDB.description.ilike(pattern, escape="\\"),
+                )
+            )
+
+        statement = statement.order_by(TaskDB.created_at.desc())  # Newest first
+
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        db_tasks = self.session.exec(statement).all()
+
+        return [self._to_domain(task) for task in db_tasks]
+
+    def search(self, text: str, limit: int) -> List[Task]:
+        """
+        Full-text search over the user's tasks, best match first.
+
+        On PostgreSQL with the search_vector column (Alembic revision 003)
+        this is a GIN-indexed tsvector match ranked by ts_rank_cd, where
+        title matches outweigh description matches. Any term may match and
+        terms match as prefixes ("groc" finds "groceries").
+
+        Elsewhere (e.g. SQLite in development) it falls back to an ILIKE
+        match per term, ranked by the number of title and description hits.
+
+        Args:
+            text: Free-text search terms
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Up to limit matching Task entities (may be empty)
+
+        Security:
+            - Always filters by user_id
+            - Terms are reduced to word characters before building the query
+        """
+        terms = re.findall(r"\w+", text.lower())
+        if not terms:
+            return []
+
+        if self._has_search_vector():
+            return self._search_fulltext(terms, limit)
+        return self._search_like(terms, limit)
+
+    def _has_search_vector(self) -> bool:
+        """Check (once per engine) whether tasks.search_vector exists."""
+        bind = self.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return False
+
+        key = str(bind.url)
+        if key not in _SEARCH_VECTOR_SUPPORT:
+            columns = inspect(self.session.connection()).get_columns("tasks")
+            _SEARCH_VECTOR_SUPPORT[key] = any(
+                column["name"] == "search_vector" for column in columns
+            )
+        return _SEARCH_VECTOR_SUPPORT[key]
+
+    def _search_fulltext(self, terms: List[str], limit: int) -> List[Task]:
+        search_vector = literal_column("tasks.search_vector")
+        query = func.to_tsquery(SEARCH_CONFIG, " | ".join(f"{term}:*" for term in terms))
+        rank = func.ts_rank_cd(search_vector, query)
+
+        statement = select(TaskDB).where(
+            TaskDB.user_id == self.user_id,  # Critical: user_id filter
+            search_vector.op("@@")(query),
+        ).order_by(
+            rank.desc(),
+            TaskDB.created_at.desc(),
+        ).limit(limit)
+        db_tasks = self.session.exec(statement).all()
+
+        return [self._to_domain(task) for task in db_tasks]
+
+    def _search_like(self, terms: List[str], limit: int) -> List[Task]:
+        # Crude stemming so "grocery" also finds "groceries"
+        terms = [re.sub(r"(ies|es|s|y)$", "", term) if len(term) > 4 else term for term in terms]
+        patterns = [f"%{_escape_like(term)}%" for term in terms]
+        statement = select(TaskDB).where(
+            TaskDB.user_id == self.user_id,  # Critical: user_id filter
+            or_(*(
+                condition
+                for pattern in patterns
+                for condition in (
+                    TaskDB.title.ilike(pattern, escape="\\"),
+                    TaskDB.description.ilike(pattern, escape="\\"),
+                )
+            )),
+        ).order_by(TaskDB.created_at.desc())
+        db_tasks = self.session.exec(statement).all()
+
+        def score(task: TaskDB) -> int:
+            title = task.title.lower()
+            description = (task.description or "").lower()
+            return sum(2 * (term in title) + (term in description) for term in terms)
+
+        ranked = sorted(db_tasks, key=score, reverse=True)[:limit]
+        return [self._to_domain(task) for task in ranked]
+
     def update(self, task: Task) -> Task:
         """
         Update existing task if it belongs to authenticated user.
@@ -147,16 +297,19 @@ class PostgreSQLTaskRepository(TaskRepository):
             - Verifies task belongs to user before updating
             - Cannot update other users' tasks
         """
-        # Find task (automatically filters by user_id)
+        # Find task (automatically filters by user_id); the row lock keeps
+        # the completed counter exact under concurrent updates
         statement = select(TaskDB).where(
             TaskDB.id == task.id,
             TaskDB.user_id == self.user_id  # Critical: user_id filter
-        )
+        ).with_for_update()
         db_task = self.session.exec(statement).first()
 
         if db_task is None:
             raise TaskNotFoundError(f"Task {task.id} not found")
 
+        was_completed = db_task.completed
+
         # Update fields
         db_task.title = task.title
         db_task.description = task.description
@@ -165,6 +318,7 @@ class PostgreSQLTaskRepository(TaskRepository):
 
         # Commit changes
         self.session.add(db_task)
+        self._adjust_counters(0, int(db_task.completed) - int(was_completed))
         self.session.commit()
         self.session.refresh(db_task)
 
@@ -180,6 +334,10 @@ class PostgreSQLTaskRepository(TaskRepository):
         Returns:
             True if deleted, False if not found or doesn't belong to user
 
+        Note:
+            A tombstone and the counter update are written in the same
+            transaction
+
         Security:
             - Filters by both task_id AND user_id
             - Cannot delete other users' tasks
@@ -187,16 +345,354 @@ class PostgreSQLTaskRepository(TaskRepository):
         statement = select(TaskDB).where(
             TaskDB.id == task_id,
             TaskDB.user_id == self.user_id  # Critical: user_id filter
-        )
+        ).with_for_update()
         db_task = self.session.exec(statement).first()
 
         if db_task is None:
             return False
 
         self.session.delete(db_task)
+        self._record_tombstones([task_id])
+        self._adjust_counters(-1, -int(db_task.completed))
         self.session.commit()
         return True
 
+    def get_many(self, task_ids: List[int]) -> List[Task]:
+        """
+        Get the authenticated user's tasks with the given IDs in one query.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Tasks found (IDs that don't exist or belong to another
+            user are omitted)
+
+        Security:
+            - Filters by both task_id AND user_id
+        """
+        if not task_ids:
+            return []
+
+        statement = select(TaskDB).where(
+            TaskDB.id.in_(task_ids),
+            TaskDB.user_id == self.user_id  # Critical: user_id filter
+        )
+        db_tasks = self.session.exec(statement).all()
+
+        return [self._to_domain(task) for task in db_tasks]
+
+    def complete_many(self, task_ids: List[int]) -> int:
+        """
+        Mark the user's tasks with the given IDs as completed.
+
+        Issues a single set-based UPDATE ... WHERE id IN (...) and commits.
+        Tasks that are already completed are left untouched, so the row
+        count is exactly the change to the completed counter.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Number of tasks that changed from pending to completed
+
+        Security:
+            - Filters by both task_id AND user_id
+        """
+        if not task_ids:
+            return 0
+
+        statement = (
+            update(TaskDB)
+            .where(
+                TaskDB.id.in_(task_ids),
+                TaskDB.user_id == self.user_id,  # Critical: user_id filter
+                TaskDB.completed == False,  # noqa: E712
+            )
+            .values(completed=True, updated_at=datetime.utcnow())
+        )
+        result = self.session.exec(statement)
+        self._adjust_counters(0, result.rowcount)
+        self.session.commit()
+        return result.rowcount
+
+    def update_many(self, tasks: List[Task]) -> List[Task]:
+        """
+        Update several of the user's tasks in one transaction.
+
+        Rows are written with a single executemany UPDATE keyed by id and
+        user_id; callers load the tasks with get_many() first, so every
+        task here is known to belong to the user.
+
+        Args:
+            tasks: Domain Task entities with updated values
+
+        Returns:
+            The updated tasks
+
+        Security:
+            - Filters by both task_id AND user_id
+        """
+        if not tasks:
+            return []
+
+        # Current completion states (locked) give the counter delta
+        previous = self.session.exec(
+            select(TaskDB.id, TaskDB.completed).where(
+                TaskDB.id.in_([task.id for task in tasks]),
+                TaskDB.user_id == self.user_id  # Critical: user_id filter
+            ).with_for_update()
+        ).all()
+        was_completed = dict(previous)
+
+        table = TaskDB.__table__
+        statement = (
+            update(table)
+            .where(
+                table.c.id == bindparam("task_id"),
+                table.c.user_id == self.user_id  # Critical: user_id filter
+            )
+            .values(
+                title=bindparam("new_title"),
+                description=bindparam("new_description"),
+                completed=bindparam("new_completed"),
+                updated_at=bindparam("new_updated_at"),
+            )
+        )
+        now = datetime.utcnow()
+        self.session.connection().execute(statement, [
+            {
+                "task_id": task.id,
+                "new_title": task.title,
+                "new_description": task.description,
+                "new_completed": task.status.is_completed(),
+                "new_updated_at": now,
+            }
+            for task in tasks
+        ])
+        self._adjust_counters(0, sum(
+            int(task.status.is_completed()) - int(was_completed[task.id])
+            for task in tasks
+            if task.id in was_completed
+        ))
+        self.session.commit()
+        return tasks
+
+    def delete_many(self, task_ids: List[int]) -> int:
+        """
+        Delete the user's tasks with the given IDs.
+
+        Issues a single set-based DELETE ... WHERE id IN (...) (with
+        RETURNING where supported) and writes the tombstones and counter
+        update in the same transaction.
+
+        Args:
+            task_ids: Task identifiers
+
+        Returns:
+            Number of rows deleted
+
+        Security:
+            - Filters by both task_id AND user_id
+            - Cannot delete other users' tasks
+        """
+        if not task_ids:
+            return 0
+
+        statement = delete(TaskDB).where(
+            TaskDB.id.in_(task_ids),
+            TaskDB.user_id == self.user_id  # Critical: user_id filter
+        )
+        if self.session.get_bind().dialect.delete_returning:
+            rows = self.session.exec(statement.returning(TaskDB.id, TaskDB.completed)).all()
+        else:
+            rows = self.session.exec(
+                select(TaskDB.id, TaskDB.completed).where(
+                    TaskDB.id.in_(task_ids),
+                    TaskDB.user_id == self.user_id  # Critical: user_id filter
+                ).with_for_update()
+            ).all()
+            self.session.exec(statement)
+
+        self._record_tombstones([task_id for task_id, _ in rows])
+        self._adjust_counters(-len(rows), -sum(int(completed) for _, completed in rows))
+        self.session.commit()
+        return len(rows)
+
+    def changed_since(self, since: datetime) -> List[Task]:
+        """
+        Get the user's tasks created or modified after since.
+
+        Served by idx_tasks_user_updated (Alembic revision 007), so the
+        cost follows the number of changed rows, not the list size.
+
+        Args:
+            since: Exclusive lower bound on updated_at
+
+        Returns:
+            Changed Task entities, oldest change first
+
+        Security:
+            - Always filters by user_id
+        """
+        statement = select(TaskDB).where(
+            TaskDB.user_id == self.user_id,  # Critical: user_id filter
+            TaskDB.updated_at > since,
+        ).order_by(TaskDB.updated_at, TaskDB.id)
+        db_tasks = self.session.exec(statement).all()
+
+        return [self._to_domain(task) for task in db_tasks]
+
+    def deleted_since(self, since: datetime) -> List[Tuple[int, datetime]]:
+        """
+        Get tombstones for the user's tasks deleted after since.
+
+        Args:
+            since: Exclusive lower bound on deleted_at
+
+        Returns:
+            (task ID, deleted_at) pairs, oldest deletion first
+
+        Security:
+            - Always filters by user_id
+        """
+        statement = select(TaskTombstoneDB.task_id, TaskTombstoneDB.deleted_at).where(
+            TaskTombstoneDB.user_id == self.user_id,  # Critical: user_id filter
+            TaskTombstoneDB.deleted_at > since,
+        ).order_by(TaskTombstoneDB.deleted_at, TaskTombstoneDB.task_id)
+
+        return [(task_id, deleted_at) for task_id, deleted_at in self.session.exec(statement)]
+
+    def count_by_status(self) -> Tuple[int, int]:
+        """
+        Get the user's total and completed task counts.
+
+        A primary-key lookup on user_task_counters, which every mutation
+        in this repository keeps in step inside its own transaction.
+        Users without a counter row (no mutation since Alembic revision
+        009 backfilled the table) are counted from the tasks table.
+
+        Returns:
+            (total, completed)
+
+        Security:
+            - Reads only the authenticated user's counters
+        """
+        counters = self.session.get(UserTaskCountersDB, self.user_id)
+        if counters is not None:
+            return counters.total, counters.completed
+        return self._count_tasks()
+
+    def _count_tasks(self) -> Tuple[int, int]:
+        """Count the user's total and completed tasks from the tasks table."""
+        total, completed = self.session.exec(
+            select(
+                func.count(TaskDB.id),
+                func.coalesce(func.sum(case((TaskDB.completed, 1), else_=0)), 0),
+            ).where(TaskDB.user_id == self.user_id)  # Critical: user_id filter
+        ).one()
+        return total, completed
+
+    def created_per_day(self, since: datetime) -> List[Tuple[date, int]]:
+        """
+        Count the user's tasks created per day (UTC) since a point in time.
+
+        A GROUP BY over an index range scan of idx_tasks_user_created
+        (user_id, created_at); days without tasks are omitted.
+
+        Args:
+            since: Inclusive lower bound on created_at
+
+        Returns:
+            (day, count) pairs in day order
+
+        Security:
+            - Always filters by user_id
+        """
+        day = func.date(TaskDB.created_at)
+        statement = select(day, func.count()).where(
+            TaskDB.user_id == self.user_id,  # Critical: user_id filter
+            TaskDB.created_at >= since,
+        ).group_by(day).order_by(day)
+
+        return [
+            (value if isinstance(value, date) else date.fromisoformat(str(value)), count)
+            for value, count in self.session.exec(statement)
+        ]
+
+    def _adjust_counters(self, total_delta: int, completed_delta: int) -> None:
+        """
+        Apply a change to the user's task counters (caller commits).
+
+        The first change for a user without a counter row seeds it from
+        the tasks table, which at this point already reflects the pending
+        change, so the delta is not applied on top.
+        """
+        if not total_delta and not completed_delta:
+            return
+
+        self.session.flush()
+        table = UserTaskCountersDB.__table__
+        result = self.session.exec(
+            update(table)
+            .where(table.c.user_id == self.user_id)
+            .values(
+                total=table.c.total + total_delta,
+                completed=table.c.completed + completed_delta,
+                updated_at=datetime.utcnow(),
+            )
+        )
+        if result.rowcount:
+            return
+
+        total, completed = self._count_tasks()
+        seed = {
+            "user_id": self.user_id,
+            "total": total,
+            "completed": completed,
+            "updated_at": datetime.utcnow(),
+        }
+        dialect = self.session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            inserted = self.session.exec(
+                dialect_insert(table)
+                .values(**seed)
+                .on_conflict_do_nothing(index_elements=["user_id"])
+            ).rowcount
+            if not inserted:
+                # A concurrent transaction seeded the row first (without
+                # seeing this change): apply the delta to its row instead
+                self._adjust_counters(total_delta, completed_delta)
+        else:
+            self.session.exec(insert(table).values(**seed))
+
+    def _record_tombstones(self, task_ids: List[int]) -> None:
+        """
+        Write tombstones for deleted tasks (caller commits).
+
+        SQLite may hand out the ID of a deleted task again, so the user's
+        older tombstone for the same ID is replaced rather than duplicated.
+        Other users' tombstones for that ID are kept.
+        """
+        if not task_ids:
+            return
+
+        now = datetime.utcnow()
+        self.session.exec(
+            delete(TaskTombstoneDB).where(
+                TaskTombstoneDB.task_id.in_(task_ids),
+                TaskTombstoneDB.user_id == self.user_id,  # Critical: user_id filter
+            )
+        )
+        self.session.connection().execute(insert(TaskTombstoneDB.__table__), [
+            {"task_id": task_id, "user_id": self.user_id, "deleted_at": now}
+            for task_id in task_ids
+        ])
+
     def exists(self, task_id: int) -> bool:
         """
         Check if task exists and belongs to authenticated user.
@@ -240,7 +736,7 @@ class PostgreSQLTaskRepository(TaskRepository):
 
         Maps database representation to domain model:
         - completed (bool) → status (TaskStatus enum)
-        - Includes created_at from database
+        - Includes created_at and updated_at from database
         - Excludes user_id (not part of domain model)
 
         Args:
@@ -260,7 +756,8 @@ class PostgreSQLTaskRepository(TaskRepository):
             title=db_task.title,
             description=db_task.description or "",
             status=status,
-            created_at=db_task.created_at
+            created_at=db_task.created_at,
+            updated_at=db_task.updated_at
         )
 
     def _to_db(self, task: Task) -> TaskDB:
@@ -0,0 +1,120 @@
+"""
+Schema Version Check
+
+Workers no longer run SQLModel.metadata.create_all on boot (one catalog
+query per table, on every worker of a rolling deploy). Migrations are
+applied once by `alembic upgrade head` (Procfile release step) and each
+worker only reads alembic_version, one query per database, and refuses
+to start if any database is behind the migrations it ships with.
+
+The migration graph is read from the revision/down_revision lines of
+alembic/versions, without importing Alembic (about 200 ms of imports).
+A database on a revision this code does not know is newer than the code
+(a rolling deploy whose migration already ran): that only logs a
+warning, since migrations keep the previous release working.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.domain.exceptions import TodoAppException
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+_REVISION = re.compile(r"^revision(?::\s*str)?\s*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision(?:[^=]*)=\s*(.+)$", re.MULTILINE)
+_QUOTED = re.compile(r"['\"](\w+)['\"]")
+
+
+class SchemaVersionError(TodoAppException):
+    """Raised when a database has not been migrated to the code's revision."""
+    pass
+
+
+def read_revisions(directory: Path = MIGRATIONS_DIR) -> Dict[str, Tuple[str, ...]]:
+    """
+    Read revision -> down revisions from the migration scripts.
+
+    Args:
+        directory: Alembic versions directory
+
+    Returns:
+        Each revision id mapped to its parent revision ids
+    """
+    revisions: Dict[str, Tuple[str, ...]] = {}
+    for path in directory.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        down = _DOWN_REVISION.search(source)
+        revisions[revision.group(1)] = tuple(_QUOTED.findall(down.group(1))) if down else ()
+    return revisions
+
+
+def head_revision(revisions: Dict[str, Tuple[str, ...]]) -> str:
+    """Return the single head of the migration graph."""
+    parents = {parent for downs in revisions.values() for parent in downs}
+    heads = sorted(set(revisions) - parents)
+    if len(heads) != 1:
+        raise SchemaVersionError(f"Expected one Alembic head, found {heads or 'none'}")
+    return heads[0]
+
+
+def _ancestors(revisions: Dict[str, Tuple[str, ...]], revision: str) -> set:
+    found, pending = set(), [revision]
+    while pending:
+        for parent in revisions.get(pending.pop(), ()):
+            if parent not in found:
+                found.add(parent)
+                pending.append(parent)
+    return found
+
+
+def current_revision(engine) -> Optional[str]:
+    """Read alembic_version (None if the database was never migrated)."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+
+def check_schema_version(engines: Dict[str, object], directory: Path = MIGRATIONS_DIR) -> str:
+    """
+    Fail fast if any database is behind the migrations in this release.
+
+    Args:
+        engines: Database label -> engine (every shard)
+        directory: Alembic versions directory
+
+    Returns:
+        The head revision every database is at (or past)
+
+    Raises:
+        SchemaVersionError: A database is unmigrated or on an older revision
+    """
+    revisions = read_revisions(directory)
+    head = head_revision(revisions)
+    behind = _ancestors(revisions, head)
+
+    for label, engine in engines.items():
+        version = current_revision(engine)
+        if version == head:
+            continue
+        if version is None or version in behind:
+            raise SchemaVersionError(
+                f"Database {label} is at revision {version or 'none'}, this release needs {head}; "
+                f"run `alembic upgrade head`"
+            )
+        logger.warning(
+            f"Database {label} is at revision {version}, newer than this release ({head})"
+        )
+    return head
@@ -0,0 +1,214 @@
+"""
+User-Based Task Sharding
+
+Every task query is scoped by user_id, so a user's tasks, tombstones and
+counters can live on one of several databases ("shards"). Shard 0 is
+DATABASE_URL; it also holds the users table, the Phase III tables and
+the per-user placement overrides.
+
+A user's shard is found by hashing user_id onto a consistent-hash ring
+of the shard ids in SHARD_RING (RING_VNODES points per shard), so adding
+a shard to the ring only moves about 1/N of the users. Rows in
+user_shard_placement override the ring: the rebalancer
+(app.infrastructure.rebalance) writes them while it moves users, and
+they stay until the ring is changed to match.
+
+Placements are cached per process. At most every
+SHARD_PLACEMENT_REFRESH_SECONDS a worker reads a fingerprint of the
+table (row count, moving count, newest updated_at) and re-reads the rows
+only when it changed. With no shards configured the map has one engine
+and never touches the placement table.
+"""
+
+import bisect
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.domain.exceptions import TodoAppException
+from app.infrastructure.models import UserDB, UserShardPlacementDB
+
+logger = logging.getLogger(__name__)
+
+# Shard holding users, placements and everything that is not sharded
+PRIMARY_SHARD = 0
+
+# Ring points per shard; must be the same in every process
+RING_VNODES = 128
+
+
+class UserMovingError(TodoAppException):
+    """Raised when a user's rows are being moved and writes must wait."""
+    pass
+
+
+def _ring_hash(key: str) -> int:
+    """Stable 64-bit hash (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping user_ids to shard ids.
+
+    Each shard owns RING_VNODES points; a key belongs to the first point
+    clockwise from its hash.
+    """
+
+    def __init__(self, shard_ids: Iterable[int], vnodes: int = RING_VNODES):
+        points: List[Tuple[int, int]] = []
+        for shard_id in sorted(set(shard_ids)):
+            for vnode in range(vnodes):
+                points.append((_ring_hash(f"shard-{shard_id}#{vnode}"), shard_id))
+        if not points:
+            raise ValueError("Shard ring needs at least one shard")
+        points.sort()
+        self.shard_ids = sorted(set(shard_ids))
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard_id for _, shard_id in points]
+
+    def shard_for(self, user_id: str) -> int:
+        """Return the shard id owning user_id."""
+        index = bisect.bisect(self._hashes, _ring_hash(user_id)) % len(self._hashes)
+        return self._shards[index]
+
+
+class ShardMap:
+    """
+    Routes users to shard engines.
+
+    Attributes:
+        engines: Shard id -> engine, shard 0 included
+        ring: Hash ring used for users without a placement row
+    """
+
+    def __init__(
+        self,
+        engines: Dict[int, object],
+        ring_ids: Iterable[int],
+        refresh_seconds: float = 2.0,
+    ):
+        unknown = set(ring_ids) - set(engines)
+        if unknown:
+            raise ValueError(f"SHARD_RING lists unconfigured shards: {sorted(unknown)}")
+        self.engines = engines
+        self.ring = HashRing(ring_ids)
+        self._refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._loaded_at = float("-inf")
+        self._placements: Dict[str, Tuple[int, bool]] = {}
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._known_users: Set[Tuple[int, str]] = set()
+
+    @property
+    def sharded(self) -> bool:
+        """True when more than one database is configured."""
+        return len(self.engines) > 1
+
+    def shard_for(self, user_id: str) -> int:
+        """Return the shard currently holding user_id's tasks."""
+        if not self.sharded:
+            return PRIMARY_SHARD
+        self._refresh()
+        placement = self._placements.get(user_id)
+        return placement[0] if placement is not None else self.ring.shard_for(user_id)
+
+    def is_moving(self, user_id: str) -> bool:
+        """True while the rebalancer is copying user_id's rows."""
+        if not self.sharded:
+            return False
+        self._refresh()
+        placement = self._placements.get(user_id)
+        return placement is not None and placement[1]
+
+    def engine_for(self, user_id: str, for_write: bool = False):
+        """
+        Return the engine holding user_id's tasks.
+
+        Args:
+            user_id: Owner of the tasks to be accessed
+            for_write: The caller will modify the user's rows
+
+        Returns:
+            Engine of the user's shard
+
+        Raises:
+            UserMovingError: If for_write and the user is being rebalanced
+        """
+        shard_id = self.shard_for(user_id)
+        if for_write:
+            if self.is_moving(user_id):
+                raise UserMovingError(f"User {user_id} is being moved to another shard")
+            if shard_id != PRIMARY_SHARD:
+                self.ensure_user(shard_id, user_id)
+        return self.engines[shard_id]
+
+    def ensure_user(self, shard_id: int, user_id: str) -> None:
+        """
+        Copy the user row from shard 0 to a shard, if it is missing.
+
+        Tasks reference user.id, so a shard needs the owner's row before
+        the first insert. Checked once per user and shard per process.
+        """
+        if (shard_id, user_id) in self._known_users:
+            return
+
+        with Session(self.engines[shard_id]) as session:
+            if session.get(UserDB, user_id) is None:
+                with Session(self.engines[PRIMARY_SHARD]) as primary:
+                    user = primary.get(UserDB, user_id)
+                if user is not None:
+                    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+                    session.exec(
+                        dialect.insert(UserDB)
+                        .values(id=user.id, email=user.email, name=user.name)
+                        .on_conflict_do_nothing()
+                    )
+                    session.commit()
+        self._known_users.add((shard_id, user_id))
+
+    def invalidate(self) -> None:
+        """Re-read placements on next use."""
+        self._loaded_at = float("-inf")
+        self._version = None
+
+    def _refresh(self) -> None:
+        if time.monotonic() - self._loaded_at < self._refresh_seconds:
+            return
+        # One request thread reloads; the others keep using the last copy
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            with Session(self.engines[PRIMARY_SHARD]) as session:
+                version = self._placement_version(session)
+                if version != self._version:
+                    rows = session.exec(select(UserShardPlacementDB)).all()
+                    self._placements = {row.user_id: (row.shard_id, row.moving) for row in rows}
+                    self._version = version
+        except Exception:
+            logger.exception("Could not load shard placements, keeping the previous ones")
+        finally:
+            self._loaded_at = time.monotonic()
+            self._lock.release()
+
+    @staticmethod
+    def _placement_version(session: Session) -> Tuple[Any, ...]:
+        """
+        Fingerprint the placement table without loading it.
+
+        Inserts and deletes change the count, freezing and releasing a
+        user change the moving count, and every write sets updated_at.
+        """
+        return tuple(session.exec(
+            select(
+                func.count(),
+                func.coalesce(func.sum(case((UserShardPlacementDB.moving, 1), else_=0)), 0),
+                func.max(UserShardPlacementDB.updated_at),
+            ).select_from(UserShardPlacementDB)
+        ).one())
@@ -0,0 +1,225 @@
+"""
+Slow Query Log
+
+Opt-in (SLOW_QUERY_MS > 0). Statements slower than the threshold on an
+engine from app.database are recorded in a ring buffer, served by
+GET /api/admin/slow-queries:
+
+- The SQL is stored as its shape: bind placeholders and literals are
+  replaced with "?", so no parameter values are kept.
+- A sample of slow statements (at most one per shape every
+  SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS) is planned again on a daemon
+  thread, over a side connection outside the pool, with the original
+  parameters. SELECTs get EXPLAIN (ANALYZE, BUFFERS). Writes and
+  locking reads get a plain EXPLAIN, so nothing is written twice and no
+  row locks are taken.
+  SQLite gets EXPLAIN QUERY PLAN. String literals in plans are
+  redacted.
+- Each plan lists the indexes it uses and the tables it scans
+  sequentially, so a regression (e.g. GET /api/{user_id}/tasks sorting
+  without idx_tasks_user_created) shows up as a changed "indexes" list.
+
+The request never waits for EXPLAIN: when the queue is full the sample
+is dropped.
+"""
+
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import NullPool
+
+from app.instrumentation import statement_shape
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+# "Index Scan using idx", "Bitmap Index Scan on idx", SQLite "USING INDEX idx"
+_PLAN_INDEX = re.compile(r"(?:using|Index Scan on|USING (?:COVERING )?INDEX) (\w+)")
+_PLAN_SEQ_SCAN = re.compile(r"(?:Seq Scan on|^SCAN) (\w+)", re.MULTILINE)
+_PLAN_SORT = re.compile(
+    r"(?:^|->)\s*(?:Incremental )?Sort\b|TEMP B-TREE FOR ORDER BY", re.MULTILINE
+)
+_EXPLAINABLE = re.compile(r"^\s*(?:SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+_LOCKING_READ = re.compile(r"\bFOR (?:UPDATE|NO KEY UPDATE|SHARE|KEY SHARE)\b", re.IGNORECASE)
+
+
+def redact(statement: str) -> str:
+    """Return the statement shape with every parameter and literal as "?"."""
+    return statement_shape(_NUMBER_LITERAL.sub("?", _STRING_LITERAL.sub("?", statement)))
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of slow statements, with sampled EXPLAIN plans.
+
+    Args:
+        threshold_ms: Statements at least this slow are recorded
+        capacity: Entries kept (oldest dropped first)
+        explain_interval_seconds: Minimum time between plans of one shape
+        sample_rate: Fraction of eligible slow statements that are explained
+        explain_timeout_ms: statement_timeout of the EXPLAIN (PostgreSQL)
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        capacity: int = 100,
+        explain_interval_seconds: float = 60.0,
+        sample_rate: float = 1.0,
+        explain_timeout_ms: int = 5000,
+    ):
+        self.threshold_ms = threshold_ms
+        self._explain_interval_seconds = explain_interval_seconds
+        self._sample_rate = sample_rate
+        self._explain_timeout_ms = explain_timeout_ms
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._explained_at: Dict[str, float] = {}
+        self._side_engines: Dict[str, Any] = {}
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=16)
+        self._worker: Optional[threading.Thread] = None
+        self.recorded = 0
+        self.explained = 0
+        self.dropped = 0
+
+    def attach(self, engine) -> None:
+        """Time every statement on the engine."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context: a failed statement never reaches
+        # after_cursor_execute, and conn.info outlives the checkout
+        context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        self._record(conn.engine, statement, parameters, duration_ms, executemany)
+
+    def _record(
+        self, engine, statement: str, parameters: Any, duration_ms: float, executemany: bool
+    ) -> None:
+        shape = redact(statement)
+        entry = {
+            "at": datetime.utcnow().isoformat() + "Z",
+            "database": engine.url.database,
+            "duration_ms": round(duration_ms, 3),
+            "statement": shape,
+            "plan": None,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+            now = time.monotonic()
+            explained_at = self._explained_at.get(shape, float("-inf"))
+            due = (
+                not executemany
+                and _EXPLAINABLE.match(statement) is not None
+                and now - explained_at >= self._explain_interval_seconds
+                and random.random() < self._sample_rate
+            )
+            if due:
+                self._explained_at[shape] = now
+        logger.warning(f"Slow query ({duration_ms:.1f} ms): {shape[:200]}")
+
+        if due:
+            self._start_worker()
+            try:
+                self._queue.put_nowait((engine, statement, parameters, entry))
+            except queue.Full:
+                self.dropped += 1
+
+    def _start_worker(self) -> None:
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="slow-query-explain", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            engine, statement, parameters, entry = self._queue.get()
+            try:
+                entry["plan"] = self.explain(engine, statement, parameters)
+                self.explained += 1
+            except Exception as e:
+                entry["plan"] = {"error": str(e).splitlines()[0][:200]}
+
+    def _side_engine(self, engine):
+        """An engine on the same database whose connections bypass the pool."""
+        key = engine.url.render_as_string(hide_password=False)
+        side = self._side_engines.get(key)
+        if side is None:
+            side = self._side_engines[key] = create_engine(engine.url, poolclass=NullPool)
+        return side
+
+    def explain(self, engine, statement: str, parameters: Any) -> Dict[str, Any]:
+        """
+        Plan a statement again on a side connection, in a rolled-back transaction.
+
+        Returns:
+            text: Plan lines (string literals redacted)
+            analyze: True if the statement was executed (EXPLAIN ANALYZE)
+            indexes: Index names the plan uses
+            seq_scans: Tables the plan reads sequentially
+            sort: True if rows are sorted instead of read in index order
+        """
+        side = self._side_engine(engine)
+        analyze = (
+            statement.lstrip().upper().startswith("SELECT")
+            and not _LOCKING_READ.search(statement)
+        )
+        with side.connect() as connection:
+            transaction = connection.begin()
+            try:
+                if side.dialect.name == "postgresql":
+                    timeout = int(self._explain_timeout_ms)
+                    connection.execute(text(f"SET LOCAL statement_timeout = {timeout}"))
+                    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+                    explain = f"EXPLAIN ({options}) {statement}"
+                    rows = connection.exec_driver_sql(explain, parameters).all()
+                    lines = [row[0] for row in rows]
+                else:
+                    analyze = False
+                    explain = f"EXPLAIN QUERY PLAN {statement}"
+                    rows = connection.exec_driver_sql(explain, parameters).all()
+                    lines = [str(row[-1]) for row in rows]
+            finally:
+                transaction.rollback()
+
+        plan = "\n".join(_STRING_LITERAL.sub("'?'", line) for line in lines)
+        return {
+            "text": plan.splitlines(),
+            "analyze": analyze,
+            "indexes": sorted(set(_PLAN_INDEX.findall(plan))),
+            "seq_scans": sorted(set(_PLAN_SEQ_SCAN.findall(plan))),
+            "sort": bool(_PLAN_SORT.search(plan)),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Entries, newest first, with counters."""
+        with self._lock:
+            entries: List[Dict[str, Any]] = list(self._entries)
+        return {
+            "threshold_ms": self.threshold_ms,
+            "recorded": self.recorded,
+            "explained": self.explained,
+            "dropped": self.dropped,
+            "entries": entries[::-1],
+        }
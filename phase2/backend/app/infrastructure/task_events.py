@@ -0,0 +1,255 @@
+"""
+Task Change Events (Postgres LISTEN/NOTIFY)
+
+A trigger on tasks (Alembic revision 008) sends a NOTIFY on the
+task_changes channel for every insert, update and delete. Each worker
+process holds ONE listening connection per task shard, shared by all of
+its Server-Sent Events subscribers, and fans notifications out to
+per-subscriber queues keyed by user_id.
+
+The listeners start with the first subscriber and reconnect with
+backoff if a connection drops. Notifications sent while one was
+disconnected are lost, so every subscriber then gets a "resync" event
+(clients catch up with GET /api/{user_id}/tasks/changes). A subscriber
+that falls too far behind is treated the same way.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel written by the notify_task_change() trigger function
+TASK_CHANGES_CHANNEL = "task_changes"
+
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Listener reconnect backoff (seconds)
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
+RESYNC_EVENT: Dict[str, Any] = {"event": "resync", "data": {}}
+
+
+def _to_event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a trigger payload to the SSE event sent to clients."""
+    if payload["op"] == "DELETE":
+        return {"event": "delete", "data": {"id": payload["id"], "deleted_at": payload["at"]}}
+    return {"event": "upsert", "data": payload["task"]}
+
+
+class TaskEventHub:
+    """
+    Per-process fan-out of task change notifications.
+
+    All methods must be called from the event loop thread; the listener
+    connections are driven by loop.add_reader, so no thread is involved.
+
+    Attributes:
+        notifications: Notifications received since start
+        delivered: Events put on subscriber queues
+        overflows: Subscribers told to resync because their queue was full
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._connections: Dict[int, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connect_tasks: Dict[int, asyncio.Task] = {}
+        self._closed = False
+        self.notifications = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions in this process."""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """
+        Register a subscriber for one user's task changes.
+
+        Starts the shared listeners if they are not running yet.
+
+        Args:
+            user_id: User whose changes are delivered
+
+        Returns:
+            Queue receiving {"event", "data"} dicts
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """Remove a subscriber registered with subscribe()."""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def dispatch(self, raw_payload: str) -> None:
+        """
+        Deliver one NOTIFY payload to the owning user's subscribers.
+
+        Args:
+            raw_payload: JSON written by notify_task_change()
+        """
+        self.notifications += 1
+        try:
+            payload = json.loads(raw_payload)
+            queues = self._subscribers.get(payload["user_id"])
+            if not queues:
+                return
+            event = _to_event(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed task notification: {raw_payload[:200]}")
+            return
+
+        for queue in queues:
+            self._put(queue, event)
+
+    def _put(self, queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog, tell it to catch up via /changes
+            self.overflows += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+
+    def _resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, RESYNC_EVENT)
+
+    def _ensure_listener(self) -> None:
+        if self._closed:
+            return
+        from app.database import shard_map
+
+        self._loop = asyncio.get_running_loop()
+        for shard_id in shard_map.engines:
+            if shard_id in self._connections:
+                continue
+            task = self._connect_tasks.get(shard_id)
+            if task is not None and not task.done():
+                continue
+            self._connect_tasks[shard_id] = self._loop.create_task(self._connect(shard_id))
+
+    async def _connect(self, shard_id: int, resync: bool = False) -> None:
+        """Open one shard's listening connection, retrying with backoff."""
+        delay = RECONNECT_MIN_DELAY
+        while not self._closed:
+            try:
+                connection = await asyncio.to_thread(_open_listen_connection, shard_id)
+            except Exception:
+                logger.exception(
+                    f"Task event listener connect failed (shard {shard_id}), retrying in {delay:g}s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+
+            if self._closed:
+                connection.close()
+                return
+            self._connections[shard_id] = connection
+            self._loop.add_reader(connection.fileno(), self._on_readable, shard_id)
+            logger.info(
+                f"Listening for task changes on '{TASK_CHANGES_CHANNEL}' (shard {shard_id})"
+            )
+            if resync:
+                self._resync_all()
+            return
+
+    def _on_readable(self, shard_id: int) -> None:
+        """Drain notifications from one shard's listener connection."""
+        connection = self._connections[shard_id]
+        try:
+            connection.poll()
+        except Exception:
+            logger.exception(
+                f"Task event listener connection lost (shard {shard_id}), reconnecting"
+            )
+            self._drop_connection(shard_id)
+            self._connect_tasks[shard_id] = self._loop.create_task(
+                self._connect(shard_id, resync=True)
+            )
+            return
+
+        while connection.notifies:
+            self.dispatch(connection.notifies.pop(0).payload)
+
+    def _drop_connection(self, shard_id: int) -> None:
+        connection = self._connections.pop(shard_id, None)
+        if connection is None:
+            return
+        try:
+            self._loop.remove_reader(connection.fileno())
+        except Exception:
+            pass
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Stop listening (called on application shutdown)."""
+        self._closed = True
+        for task in self._connect_tasks.values():
+            if not task.done():
+                task.cancel()
+        for shard_id in list(self._connections):
+            self._drop_connection(shard_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return listener state and counters."""
+        from app.database import shard_map
+
+        return {
+            "listening": len(self._connections) == len(shard_map.engines),
+            "users": len(self._subscribers),
+            "subscribers": self.subscriber_count,
+            "notifications": self.notifications,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+def _open_listen_connection(shard_id: int) -> Any:
+    """
+    Open a dedicated autocommit psycopg2 connection to a shard and LISTEN on it.
+
+    The connection is detached from the engine pool: it lives as long as
+    the listener does.
+    """
+    from app.database import shard_map
+
+    pooled = shard_map.engines[shard_id].raw_connection()
+    pooled.detach()
+    connection = pooled.driver_connection
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {TASK_CHANGES_CHANNEL}")
+    return connection
+
+
+def live_events_supported() -> bool:
+    """True when every task shard can push change notifications (PostgreSQL)."""
+    from app.database import shard_map
+
+    return all(engine.dialect.name == "postgresql" for engine in shard_map.engines.values())
+
+
+task_events = TaskEventHub()
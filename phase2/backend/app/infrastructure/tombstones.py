@@ -0,0 +1,103 @@
+"""
+Task Tombstone Purging
+
+Deletion tombstones (task_tombstones) only need to outlive the oldest
+sync token a client may still present. Tombstones older than the
+retention window are deleted in batches; clients with older tokens are
+sent a full resync by GET /api/{user_id}/tasks/changes instead.
+
+Runs in-process every tombstone_purge_interval_seconds (see app.main),
+or from cron:
+    python -m app.infrastructure.tombstones --retention-days 30
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, tuple_
+from sqlmodel import Session, select
+
+from app.infrastructure.models import TaskTombstoneDB
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per statement, so a large backlog never holds long locks
+PURGE_BATCH_SIZE = 5000
+
+
+def purge_tombstones(
+    retention_days: int,
+    batch_size: int = PURGE_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Delete tombstones older than the retention window, on every shard.
+
+    Args:
+        retention_days: Tombstones deleted more than this many days ago are purged
+        batch_size: Maximum rows deleted per transaction
+        now: Current time (defaults to utcnow)
+
+    Returns:
+        Number of tombstones deleted
+    """
+    from app.database import shard_map
+
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    purged = 0
+
+    for shard_engine in shard_map.engines.values():
+        with Session(shard_engine) as session:
+            while True:
+                batch = select(TaskTombstoneDB.task_id, TaskTombstoneDB.user_id).where(
+                    TaskTombstoneDB.deleted_at < cutoff
+                ).limit(batch_size)
+                result = session.exec(
+                    delete(TaskTombstoneDB).where(
+                        tuple_(TaskTombstoneDB.task_id, TaskTombstoneDB.user_id).in_(batch)
+                    )
+                )
+                session.commit()
+                purged += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+
+    if purged:
+        logger.info(f"Purged {purged} task tombstones older than {cutoff.isoformat()}")
+    return purged
+
+
+async def purge_tombstones_periodically(interval_seconds: float, retention_days: int) -> None:
+    """
+    Run purge_tombstones every interval_seconds, off the event loop.
+
+    Errors are logged and the next run is attempted as scheduled.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(purge_tombstones, retention_days)
+        except Exception:
+            logger.exception("Task tombstone purge failed")
+
+
+def main() -> None:
+    from app.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Purge expired task deletion tombstones.")
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=get_settings().tombstone_retention_days,
+    )
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(purge_tombstones(args.retention_days, batch_size=args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Per-Request Instrumentation
+
+Counts the SQL statements each request runs and how long they take,
+plus time spent verifying the JWT and serializing the response:
+
+- SQLAlchemy cursor events on every engine in app.database add to the
+  RequestStats of the request being served (a ContextVar; FastAPI copies
+  it into the threadpool that runs sync endpoints and dependencies).
+- get_current_user adds its time with timed("auth").
+- Routes built with InstrumentedRoute mark when the endpoint returned;
+  serialization is the time from there to the response start.
+- RequestStatsMiddleware (pure ASGI) opens the stats, writes the
+  Server-Timing header and folds the request into per-route aggregates
+  served by GET /api/request-stats (and into app.metrics for /metrics).
+
+A request that runs more than SQL_WARN_STATEMENTS statements, or the
+same statement shape SQL_WARN_REPEATS times (N+1), is logged as a
+warning. Statement shapes come from SQLAlchemy's parameterized SQL, with
+IN lists collapsed.
+"""
+
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app import metrics
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Placeholders of every DBAPI paramstyle SQLAlchemy emits
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+|\$\d+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats with different IN-list sizes match."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    return " ".join(_IN_LIST.sub("(?)", shape).split())
+
+
+class RequestStats:
+    """Timings and SQL statements of one request."""
+
+    __slots__ = ("statements", "db_ms", "timings", "shapes", "endpoint_done")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_ms = 0.0
+        self.timings: Dict[str, float] = {}
+        self.shapes: Counter = Counter()
+        self.endpoint_done: Optional[float] = None
+
+    def add_timing(self, name: str, ms: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+
+    def server_timing(self, serialize_ms: Optional[float]) -> str:
+        """Format the Server-Timing header value."""
+        parts = [f'db;dur={self.db_ms:.3f};desc="{self.statements} statements"']
+        for name, ms in self.timings.items():
+            parts.append(f"{name};dur={ms:.3f}")
+        if serialize_ms is not None:
+            parts.append(f"serialize;dur={serialize_ms:.3f}")
+        return ", ".join(parts)
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Return the stats of the request being served, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's Server-Timing."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_timing(name, (time.perf_counter() - started) * 1000)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not conn.info: a failed statement never
+    # reaches after_cursor_execute, and conn.info outlives the checkout
+    if _current_stats.get() is not None:
+        context._request_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    started = getattr(context, "_request_stats_started", None)
+    if started is not None:
+        stats.db_ms += (time.perf_counter() - started) * 1000
+    stats.statements += 1
+    stats.shapes[statement] += 1
+
+
+def instrument_engine(engine) -> None:
+    """Attach the statement counting hooks to an engine."""
+    if not settings.request_stats_enabled:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteStats:
+    """Aggregates for one route (event loop thread only, so no lock)."""
+
+    __slots__ = (
+        "requests", "statements", "max_statements", "db_ms", "serialize_ms",
+        "timings", "statement_warnings", "repeat_warnings",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.max_statements = 0
+        self.db_ms = 0.0
+        self.serialize_ms = 0.0
+        self.timings: Dict[str, float] = {}
+        self.statement_warnings = 0
+        self.repeat_warnings = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        requests = self.requests or 1
+        return {
+            "requests": self.requests,
+            "statements_per_request": round(self.statements / requests, 2),
+            "max_statements": self.max_statements,
+            "db_ms_per_request": round(self.db_ms / requests, 3),
+            "serialize_ms_per_request": round(self.serialize_ms / requests, 3),
+            **{
+                f"{name}_ms_per_request": round(ms / requests, 3)
+                for name, ms in self.timings.items()
+            },
+            "too_many_statements": self.statement_warnings,
+            "repeated_statements": self.repeat_warnings,
+        }
+
+
+class RequestStatsRegistry:
+    """Per-process aggregates, keyed by "METHOD /route/{template}"."""
+
+    def __init__(self):
+        self.routes: Dict[str, RouteStats] = {}
+
+    def record(self, route: str, stats: RequestStats, serialize_ms: Optional[float]) -> None:
+        aggregate = self.routes.get(route)
+        if aggregate is None:
+            aggregate = self.routes[route] = RouteStats()
+        aggregate.requests += 1
+        aggregate.statements += stats.statements
+        aggregate.max_statements = max(aggregate.max_statements, stats.statements)
+        aggregate.db_ms += stats.db_ms
+        aggregate.serialize_ms += serialize_ms or 0.0
+        for name, ms in stats.timings.items():
+            aggregate.timings[name] = aggregate.timings.get(name, 0.0) + ms
+
+        if stats.statements > settings.sql_warn_statements:
+            aggregate.statement_warnings += 1
+            logger.warning(
+                f"{route} ran {stats.statements} SQL statements "
+                f"(limit {settings.sql_warn_statements}, {stats.db_ms:.1f} ms)"
+            )
+        if stats.shapes:
+            shape, count = stats.shapes.most_common(1)[0]
+            if count < settings.sql_warn_repeats:
+                # Same statement with different IN-list sizes counts as one shape
+                shapes = Counter()
+                for statement, repeats in stats.shapes.items():
+                    shapes[statement_shape(statement)] += repeats
+                shape, count = shapes.most_common(1)[0]
+            if count >= settings.sql_warn_repeats:
+                aggregate.repeat_warnings += 1
+                logger.warning(
+                    f"{route} repeated one statement {count} times (possible N+1): "
+                    f"{statement_shape(shape)[:200]}"
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "routes": {route: stats.snapshot() for route, stats in sorted(self.routes.items())},
+            "limits": {
+                "statements": settings.sql_warn_statements,
+                "repeats": settings.sql_warn_repeats,
+            },
+        }
+
+
+REQUEST_STATS = RequestStatsRegistry()
+
+
+class RequestStatsMiddleware:
+    """
+    ASGI middleware opening RequestStats for each HTTP request.
+
+    Adds the Server-Timing header when the response starts and records
+    the request in REQUEST_STATS and, with METRICS_ENABLED, in the
+    Prometheus metrics (app.metrics) once the last body chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+        if settings.metrics_enabled:
+            metrics.HTTP_IN_FLIGHT.inc()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                if settings.request_stats_enabled:
+                    now = time.perf_counter()
+                    serialize_ms = None
+                    if stats.endpoint_done is not None:
+                        serialize_ms = (now - stats.endpoint_done) * 1000
+                    server_timing = stats.server_timing(serialize_ms).encode("latin-1")
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing))
+                    message = {**message, "headers": headers}
+                    REQUEST_STATS.record(_route_label(scope), stats, serialize_ms)
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            if settings.metrics_enabled:
+                metrics.HTTP_IN_FLIGHT.inc(amount=-1)
+                metrics.record_request(
+                    scope["method"],
+                    _route_path(scope),
+                    response["status"],
+                    time.perf_counter() - started,
+                    response["size"],
+                    stats.timings.get("auth"),
+                )
+
+
+def _route_path(scope) -> str:
+    """
+    Path template of the matched route ("unmatched" if none).
+
+    FastAPI puts the route as declared on its APIRouter in the scope, so
+    routers carry their own prefix (APIRouter(prefix=...)) rather than
+    getting one from include_router.
+    """
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def _route_label(scope) -> str:
+    path = _route_path(scope)
+    return f"{scope['method']} {path}" if scope.get("route") is not None else path
+
+
+def _mark_endpoint_done(endpoint: Callable) -> Callable:
+    """Wrap an endpoint so the stats note when it returned (signature kept)."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats = _current_stats.get()
+                if stats is not None:
+                    stats.endpoint_done = time.perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                stats = _current_stats.get()
+                if stats is not None:
+                    stats.endpoint_done = time.perf_counter()
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute whose endpoint end is recorded, to time serialization."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
@@ -3,12 +3,26 @@ FastAPI Application Entry Point
 Main application factory and configuration
 """
 
+import asyncio
+import logging
+import time
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.database import create_db_and_tables
-from app.presentation.routers import user, tasks
+from app.database import (
+    PRIMARY_UNTIL_HEADER,
+    check_schema,
+    create_db_and_tables,
+    warm_up_pools,
+)
+from app.infrastructure.task_events import task_events
+from app.infrastructure.tombstones import purge_tombstones_periodically
+from app.instrumentation import RequestStatsMiddleware
+from app.presentation.routers import user, tasks, metrics, admin
+
 
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
@@ -34,17 +48,55 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Read-your-writes window for clients that cannot send cookies,
+        # and per-request timings for browser devtools
+        expose_headers=[PRIMARY_UNTIL_HEADER, "Server-Timing"],
     )
 
+    # Per-request SQL statement count, Server-Timing and Prometheus
+    # metrics (outermost, so serialization and CORS are measured too)
+    if settings.request_stats_enabled or settings.metrics_enabled:
+        app.add_middleware(RequestStatsMiddleware)
+
     # Register routers
     app.include_router(user.router)
     app.include_router(tasks.router)
+    app.include_router(metrics.router)
+    app.include_router(admin.router)
 
     # Event handlers
     @app.on_event("startup")
     async def startup_event():
-        """Initialize database on startup."""
-        create_db_and_tables()
+        """Check the database schema and warm the connection pools."""
+        started = time.perf_counter()
+        if settings.pool_warm_up_connections > 0:
+            opened = warm_up_pools(settings.pool_warm_up_connections)
+            logger.info(f"Opened {opened} pooled database connections")
+
+        if settings.startup_schema == "check":
+            # One alembic_version read per database instead of create_all
+            head = check_schema()
+            logger.info(f"Database schema at revision {head}")
+        elif settings.startup_schema == "create_all":
+            create_db_and_tables()
+        elif settings.startup_schema != "skip":
+            raise ValueError(f"Unknown STARTUP_SCHEMA {settings.startup_schema!r}")
+        logger.info(f"Database startup took {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        # Expire delta-sync tombstones in the background
+        if settings.tombstone_purge_interval_seconds > 0:
+            # Keep a reference so the task is not garbage collected
+            app.state.tombstone_purge_task = asyncio.get_running_loop().create_task(
+                purge_tombstones_periodically(
+                    settings.tombstone_purge_interval_seconds,
+                    settings.tombstone_retention_days,
+                )
+            )
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Close the task change listener connection."""
+        await task_events.close()
 
     # Root endpoint (public)
     @app.get("/")
@@ -0,0 +1,387 @@
+"""
+Prometheus Metrics
+
+Counters, gauges and histograms served by GET /metrics in the Prometheus
+text format (version 0.0.4), without a client library:
+
+- http_requests_total{method,route,status}
+- http_request_duration_seconds{method,route} (histogram)
+- http_response_size_bytes{method,route} (histogram)
+- http_requests_in_flight
+- jwt_verification_seconds (histogram, time in get_current_user's decode)
+- db_pool_connections{engine,state} and db_pool_size{engine}
+
+Request metrics are written by RequestStatsMiddleware on the event loop
+thread only, so updates take no lock. Pool gauges are sampled when
+/metrics is scraped and at most once a second by the middleware; the
+/metrics endpoint is async so it renders on the event loop too. Never
+call render() or sample_pools() from a worker thread.
+
+Multi-worker servers (gunicorn -w N): set PROMETHEUS_MULTIPROC_DIR to a
+directory shared by the workers. Each worker then writes its values
+to its own memory-mapped files there (one writer per file), and
+whichever worker answers /metrics sums the files of all workers:
+
+- {pid}.db: counters and histograms, kept after the worker exits
+- gauge_{pid}.db: gauges, removed by mark_process_dead(pid) when the
+  worker exits (gunicorn's child_exit hook, see gunicorn.conf.py)
+
+Empty the directory before each server start.
+"""
+
+import bisect
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric name, sample suffix, label values)
+SampleKey = Tuple[str, str, Tuple[str, ...]]
+
+_USED = struct.Struct("i")
+_VALUE = struct.Struct("d")
+_HEADER_SIZE = 8
+_INITIAL_FILE_SIZE = 1 << 16
+
+
+class _MemoryValues:
+    """Values of this process, in a dict."""
+
+    def __init__(self):
+        self.values: Dict[SampleKey, float] = {}
+
+    def inc(self, key: SampleKey, amount: float) -> None:
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, key: SampleKey, value: float) -> None:
+        self.values[key] = value
+
+
+def _read_entries(data: bytes) -> Iterator[Tuple[str, float, int]]:
+    """Yield (key, value, value offset) for each entry of a values file."""
+    used = _USED.unpack_from(data, 0)[0]
+    position = _HEADER_SIZE
+    while position < used:
+        length = _USED.unpack_from(data, position)[0]
+        key = data[position + 4:position + 4 + length].decode("utf-8")
+        position += 4 + length
+        position += -position % 8  # Values are 8-byte aligned
+        yield key, _VALUE.unpack_from(data, position)[0], position
+        position += 8
+
+
+class _MmapValues(_MemoryValues):
+    """
+    Values of this process, mirrored to a memory-mapped file.
+
+    Entries are appended (length, key, padding, double) and the used size
+    in the header is bumped only after an entry is complete, so readers
+    in other processes never see a partial key.
+    """
+
+    def __init__(self, path: str, fresh: bool = False):
+        super().__init__()
+        self._offsets: Dict[SampleKey, int] = {}
+        self._file = open(path, "w+b" if fresh else "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(_INITIAL_FILE_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._used = _USED.unpack_from(self._map, 0)[0] or _HEADER_SIZE
+        # A reused pid continues the counters of the process that had it
+        for key, value, offset in _read_entries(self._map):
+            name, suffix, labels = json.loads(key)
+            sample = (name, suffix, tuple(labels))
+            self._offsets[sample] = offset
+            self.values[sample] = value
+
+    def inc(self, key: SampleKey, amount: float) -> None:
+        value = self.values.get(key, 0.0) + amount
+        self.set(key, value)
+
+    def set(self, key: SampleKey, value: float) -> None:
+        self.values[key] = value
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = self._offsets[key] = self._append(key)
+        _VALUE.pack_into(self._map, offset, value)
+
+    def _append(self, key: SampleKey) -> int:
+        encoded = json.dumps([key[0], key[1], list(key[2])], separators=(",", ":"))
+        encoded = encoded.encode("utf-8")
+        value_offset = self._used + 4 + len(encoded)
+        value_offset += -value_offset % 8
+        end = value_offset + 8
+        if end > self._capacity:
+            while end > self._capacity:
+                self._capacity *= 2
+            self._map.close()
+            self._file.truncate(self._capacity)
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        _USED.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + 4:self._used + 4 + len(encoded)] = encoded
+        _VALUE.pack_into(self._map, value_offset, 0.0)
+        self._used = end
+        _USED.pack_into(self._map, 0, self._used)
+        return value_offset
+
+
+_stores: Dict[str, _MemoryValues] = {}
+_stores_pid: Optional[int] = None
+
+
+def _file_name(kind: str, pid: int) -> str:
+    return f"gauge_{pid}.db" if kind == "gauge" else f"{pid}.db"
+
+
+def _values(kind: str = "counter") -> _MemoryValues:
+    """Return this process's gauge or counter store (reopened after a fork)."""
+    global _stores_pid
+    pid = os.getpid()
+    if _stores_pid != pid:
+        _stores.clear()
+        _stores_pid = pid
+    store = _stores.get(kind)
+    if store is None:
+        directory = settings.prometheus_multiproc_dir
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, _file_name(kind, pid))
+            # Gauges describe this process only, never a previous one with the pid
+            store = _MmapValues(path, fresh=kind == "gauge")
+        else:
+            store = _MemoryValues()
+        _stores[kind] = store
+    return store
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Tuple[str, ...]) -> str:
+    if not values:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """A named metric with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def render(self, samples: List[Tuple[str, Tuple[str, ...], float]]) -> Iterator[str]:
+        for suffix, labels, value in sorted(samples):
+            yield f"{self.name}{suffix}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        _values().inc((self.name, "", labels), amount)
+
+
+class Gauge(Metric):
+    """Gauge; summed over running workers in multiprocess mode."""
+
+    kind = "gauge"
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        _values(self.kind).inc((self.name, "", labels), amount)
+
+    def set(self, labels: Tuple[str, ...], value: float) -> None:
+        _values(self.kind).set((self.name, "", labels), value)
+
+
+class Histogram(Metric):
+    """
+    Histogram with fixed buckets.
+
+    Each observation adds to one bucket and the sum; cumulative bucket
+    counts and _count are computed when rendering.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float]
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._bounds = tuple(_number(bound) for bound in self.buckets) + ("+Inf",)
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        values = _values()
+        bound = self._bounds[bisect.bisect_left(self.buckets, value)]
+        values.inc((self.name, "_bucket", labels + (bound,)), 1.0)
+        values.inc((self.name, "_sum", labels), value)
+
+    def render(self, samples: List[Tuple[str, Tuple[str, ...], float]]) -> Iterator[str]:
+        per_labels: Dict[Tuple[str, ...], Dict[str, float]] = defaultdict(dict)
+        sums: Dict[Tuple[str, ...], float] = {}
+        for suffix, labels, value in samples:
+            if suffix == "_bucket":
+                per_labels[labels[:-1]][labels[-1]] = value
+            else:
+                sums[labels] = value
+        names = self.labelnames + ("le",)
+        for labels in sorted(per_labels):
+            counts = per_labels[labels]
+            total = 0.0
+            for bound in self._bounds:
+                total += counts.get(bound, 0.0)
+                yield f"{self.name}_bucket{_labels(names, labels + (bound,))} {_number(total)}"
+            label_text = _labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_number(sums.get(labels, 0.0))}"
+            yield f"{self.name}_count{label_text} {_number(total)}"
+
+
+REGISTRY: Dict[str, Metric] = {}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000)
+AUTH_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size.",
+    ("method", "route"), SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served.")
+JWT_VERIFICATION = Histogram(
+    "jwt_verification_seconds", "Time spent verifying the JWT in get_current_user.",
+    (), AUTH_BUCKETS,
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections", "Pooled connections by state (checked_out, idle, overflow).",
+    ("engine", "state"),
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size.", ("engine",))
+
+_POOL_SAMPLE_SECONDS = 1.0
+_pools_sampled_at = float("-inf")
+
+
+def sample_pools() -> None:
+    """Copy the connection pool counters of every engine into gauges."""
+    global _pools_sampled_at
+    from app.database import replica_engine, shard_map
+
+    engines = {
+        f"shard{shard_id}" if shard_id else "primary": engine
+        for shard_id, engine in shard_map.engines.items()
+    }
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+    for name, engine in engines.items():
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue  # e.g. SingletonThreadPool of in-memory SQLite
+        DB_POOL_SIZE.set((name,), pool.size())
+        DB_POOL_CONNECTIONS.set((name, "checked_out"), pool.checkedout())
+        DB_POOL_CONNECTIONS.set((name, "idle"), pool.checkedin())
+        DB_POOL_CONNECTIONS.set((name, "overflow"), max(pool.overflow(), 0))
+    _pools_sampled_at = time.monotonic()
+
+
+def record_request(
+    method: str, route: str, status: int, seconds: float, size: int, auth_ms: Optional[float]
+) -> None:
+    """Record a finished request (event loop thread only)."""
+    HTTP_REQUESTS.inc((method, route, str(status)))
+    HTTP_DURATION.observe(seconds, (method, route))
+    HTTP_RESPONSE_SIZE.observe(size, (method, route))
+    if auth_ms is not None:
+        JWT_VERIFICATION.observe(auth_ms / 1000)
+    if time.monotonic() - _pools_sampled_at >= _POOL_SAMPLE_SECONDS:
+        sample_pools()
+
+
+def mark_process_dead(pid: int, directory: Optional[str] = None) -> None:
+    """
+    Drop the gauges of an exited worker (multiprocess mode).
+
+    Called from gunicorn's child_exit hook in the master process. Its
+    counters and histograms stay, so totals never go backwards.
+
+    Args:
+        pid: Process id of the exited worker
+        directory: Defaults to PROMETHEUS_MULTIPROC_DIR
+    """
+    directory = directory or settings.prometheus_multiproc_dir
+    if not directory:
+        return
+    try:
+        os.remove(os.path.join(directory, _file_name("gauge", pid)))
+    except FileNotFoundError:
+        pass
+
+
+def _collect() -> Dict[SampleKey, float]:
+    """Sum the values of every worker (or return this process's values)."""
+    directory = settings.prometheus_multiproc_dir
+    if not directory:
+        merged: Dict[SampleKey, float] = {}
+        for kind in ("counter", "gauge"):
+            merged.update(_values(kind).values)
+        return merged
+
+    merged = defaultdict(float)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except OSError:
+            continue  # Removed by mark_process_dead since the glob
+        if len(data) < _HEADER_SIZE:
+            continue
+        for key, value, _ in _read_entries(data):
+            name, suffix, labels = json.loads(key)
+            if name in REGISTRY:
+                merged[(name, suffix, tuple(labels))] += value
+    return merged
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text format."""
+    sample_pools()
+    samples: Dict[str, List[Tuple[str, Tuple[str, ...], float]]] = defaultdict(list)
+    for (name, suffix, labels), value in _collect().items():
+        samples[name].append((suffix, labels, value))
+
+    lines: List[str] = []
+    for metric in REGISTRY.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render(samples.get(metric.name, [])))
+    return "\n".join(lines) + "\n"
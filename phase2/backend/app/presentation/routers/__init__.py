@@ -3,6 +3,6 @@ Presentation Layer - API Routers
 Exports all API routers for registration in main.py
 """
 
-from app.presentation.routers import user, tasks
+from app.presentation.routers import user, tasks, metrics, admin
 
-__all__ = ["user", "tasks"]
+__all__ = ["user", "tasks", "metrics", "admin"]
@@ -0,0 +1,55 @@
+"""
+Admin API Router
+
+Operator endpoints, enabled by setting ADMIN_TOKEN. Requests must send
+it in the X-Admin-Token header (user JWTs are not accepted).
+"""
+
+import hmac
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.config import get_settings
+from app.database import slow_query_log
+
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Check the X-Admin-Token header against ADMIN_TOKEN.
+
+    Raises:
+        HTTPException 404: ADMIN_TOKEN is not set (admin endpoints disabled)
+        HTTPException 401: Header missing or wrong
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_admin_token)])
+def get_slow_queries() -> Dict[str, Any]:
+    """
+    Get the slow query log of this worker process, newest first.
+
+    Each entry has the statement shape (parameters redacted), its
+    duration and, for sampled entries, the EXPLAIN plan with the indexes
+    it uses, its sequential scans and whether it sorts.
+
+    Returns:
+        enabled: False unless SLOW_QUERY_MS > 0
+        threshold_ms, recorded, explained, dropped: Log settings and counters
+        entries: Slow statements (at most SLOW_QUERY_LOG_SIZE)
+
+    Raises:
+        HTTPException 401/404: See require_admin_token
+    """
+    if slow_query_log is None:
+        return {"enabled": False, "entries": []}
+    return {"enabled": True, **slow_query_log.snapshot()}
@@ -0,0 +1,58 @@
+"""
+Metrics API Router
+
+Exposes the per-route request aggregates collected by
+app.instrumentation (SQL statements, DB time, auth and serialization)
+and the Prometheus scrape endpoint (app.metrics).
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Response, status
+
+from app import metrics
+from app.config import get_settings
+from app.instrumentation import REQUEST_STATS
+
+
+settings = get_settings()
+
+# No prefix: /metrics sits at the root, where Prometheus scrapes by default
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/api/request-stats")
+async def get_request_stats() -> Dict[str, Any]:
+    """
+    Get per-route request aggregates for this worker process.
+
+    Public, like /health: the response holds route templates and timings
+    only, never user ids or SQL parameters.
+
+    Returns:
+        routes: "METHOD /route/{template}" -> requests, statements and
+            DB/auth/serialize milliseconds per request, the most
+            statements one request ran and how many requests were
+            flagged for too many or repeated statements
+        limits: The warning thresholds (SQL_WARN_STATEMENTS, SQL_WARN_REPEATS)
+    """
+    return REQUEST_STATS.snapshot()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Get Prometheus metrics of all workers (text format 0.0.4).
+
+    Public, like /api/request-stats; keep it off the public ingress or
+    behind the load balancer's allow list.
+
+    Async on purpose: rendering samples the pool gauges, and the metric
+    stores may only be written from the event loop thread (app.metrics).
+
+    Raises:
+        HTTPException 404: METRICS_ENABLED is false
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -5,15 +5,24 @@ Implements RESTful endpoints for task management.
 All endpoints require JWT authentication and enforce user-scoped access.
 """
 
+import asyncio
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 
 from app.auth import get_current_user
+from app.config import get_settings
 from app.database import get_session
 from app.domain.exceptions import TaskNotFoundError, TaskValidationError
 from app.domain.value_objects.task_status import TaskStatus
 from app.infrastructure.models import TaskDB
+from app.infrastructure.task_events import live_events_supported, task_events
+from app.instrumentation import InstrumentedRoute
 from app.infrastructure.repositories.postgresql_task_repository import (
     PostgreSQLTaskRepository,
 )
@@ -23,14 +32,30 @@ from app.application.use_cases.update_task import UpdateTaskUseCase
 from app.application.use_cases.delete_task import DeleteTaskUseCase
 from app.application.use_cases.complete_task import CompleteTaskUseCase
 from app.application.use_cases.uncomplete_task import UncompleteTaskUseCase
+from app.application.use_cases.get_task_changes import GetTaskChangesUseCase
+from app.application.use_cases.get_task_stats import GetTaskStatsUseCase
 from app.presentation.schemas.task import (
     TaskCreateRequest,
     TaskUpdateRequest,
     TaskResponse,
+    TaskTombstoneResponse,
+    TaskChangesResponse,
+    DayCountResponse,
+    TaskStatsResponse,
 )
 
 
-router = APIRouter(prefix="/api", tags=["tasks"])
+router = APIRouter(prefix="/api", tags=["tasks"], route_class=InstrumentedRoute)
+
+# Sync tokens trail the server clock by this much, so a write stamped just
+# before a sync but committed just after it is still picked up next time
+# (clients upsert by id, so re-sent rows are harmless)
+SYNC_TOKEN_OVERLAP = timedelta(seconds=5)
+
+# Server-Sent Events: comment sent when idle (keeps proxies from closing
+# the stream) and the reconnect delay suggested to clients
+SSE_HEARTBEAT_SECONDS = 15.0
+SSE_RETRY_MS = 5000
 
 
 def _verify_user_access(url_user_id: str, authenticated_user_id: str) -> None:
@@ -177,6 +202,217 @@ def create_task(
     return _task_to_response(task)
 
 
+def _encode_sync_token(moment: datetime) -> str:
+    """Encode a sync position as an opaque URL-safe token."""
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip("=")
+
+
+def _decode_sync_token(token: str) -> datetime:
+    """
+    Decode a token produced by _encode_sync_token.
+
+    Raises:
+        HTTPException 400: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+
+@router.get("/{user_id}/tasks/changes", response_model=TaskChangesResponse)
+def get_task_changes(
+    user_id: str,
+    authenticated_user_id: str = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    since: Optional[str] = Query(
+        default=None,
+        description="next_token from the previous sync (omit for a first sync)",
+    ),
+) -> TaskChangesResponse:
+    """
+    Delta sync: tasks changed and deleted since the last sync.
+
+    Changes are read through idx_tasks_user_updated and deletions from
+    task_tombstones, so the payload grows with churn rather than with
+    the size of the list.
+
+    Query Parameters:
+    - since (optional): Opaque token returned as next_token by the
+      previous call
+
+    Security:
+    - Requires valid JWT token
+    - URL user_id must match token user_id
+    - Only returns tasks and tombstones belonging to authenticated user
+
+    Returns:
+        Changed tasks (oldest change first), deleted task IDs, the token
+        for the next sync, and full_resync=true when the token was missing
+        or older than the tombstone retention window (tasks is then the
+        complete list)
+
+    Raises:
+        HTTPException 400: Malformed sync token
+        HTTPException 401: Invalid or missing JWT token
+        HTTPException 403: URL user_id doesn't match token user_id
+    """
+    # Verify user authorization
+    _verify_user_access(user_id, authenticated_user_id)
+
+    since_at = _decode_sync_token(since) if since else None
+    now = datetime.utcnow()
+    horizon = now - timedelta(days=get_settings().tombstone_retention_days)
+
+    # Create user-scoped repository
+    repo = PostgreSQLTaskRepository(session, authenticated_user_id)
+
+    # Execute use case
+    use_case = GetTaskChangesUseCase(repo)
+    tasks, deleted, full_resync = use_case.execute(since=since_at, horizon=horizon)
+
+    next_at = now - SYNC_TOKEN_OVERLAP
+    if since_at is not None and not full_resync:
+        next_at = max(next_at, since_at)
+
+    return TaskChangesResponse(
+        tasks=[_task_to_response(task) for task in tasks],
+        deleted=[
+            TaskTombstoneResponse(id=task_id, deleted_at=deleted_at)
+            for task_id, deleted_at in deleted
+        ],
+        next_token=_encode_sync_token(next_at),
+        full_resync=full_resync,
+    )
+
+
+@router.get("/{user_id}/tasks/stats", response_model=TaskStatsResponse)
+def get_task_stats(
+    user_id: str,
+    authenticated_user_id: str = Depends(get_current_user),
+    session: Session = Depends(get_session),
+    days: int = Query(
+        default=30,
+        ge=1,
+        le=365,
+        description="Days covered by the created-per-day histogram (ending today, UTC)",
+    ),
+) -> TaskStatsResponse:
+    """
+    Summarize the user's tasks without returning them.
+
+    Status counts come from the user_task_counters row (one primary-key
+    lookup, whatever the list size); the histogram is a GROUP BY over
+    the (user_id, created_at) index for the requested days only.
+
+    Query Parameters:
+    - days (optional): Histogram length, 1-365 (default 30)
+
+    Security:
+    - Requires valid JWT token
+    - URL user_id must match token user_id
+    - Only counts tasks belonging to authenticated user
+
+    Returns:
+        total, pending and completed counts, completion_rate and
+        created_per_day
+
+    Raises:
+        HTTPException 401: Invalid or missing JWT token
+        HTTPException 403: URL user_id doesn't match token user_id
+    """
+    # Verify user authorization
+    _verify_user_access(user_id, authenticated_user_id)
+
+    # Create user-scoped repository
+    repo = PostgreSQLTaskRepository(session, authenticated_user_id)
+
+    # Execute use case
+    use_case = GetTaskStatsUseCase(repo)
+    stats = use_case.execute(days=days, today=datetime.utcnow().date())
+
+    return TaskStatsResponse(
+        total=stats["total"],
+        pending=stats["pending"],
+        completed=stats["completed"],
+        completion_rate=stats["completion_rate"],
+        created_per_day=[
+            DayCountResponse(day=day, count=count)
+            for day, count in stats["created_per_day"]
+        ],
+    )
+
+
+@router.get(
+    "/{user_id}/tasks/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_task_events(
+    user_id: str,
+    request: Request,
+    authenticated_user_id: str = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Push the user's task changes as Server-Sent Events.
+
+    Events:
+    - upsert: a task was created or modified (data is the task)
+    - delete: a task was deleted (data is {id, deleted_at})
+    - resync: events may have been missed; fetch /tasks/changes
+
+    Clients sync once with /tasks/changes after connecting, then apply
+    events as they arrive instead of polling. Notifications come from a
+    Postgres trigger and are fanned out over one LISTEN connection per
+    worker (app.infrastructure.task_events).
+
+    Security:
+    - Requires valid JWT token (Authorization header, so use a
+      fetch-based SSE client rather than EventSource)
+    - URL user_id must match token user_id
+    - Only the authenticated user's changes are delivered
+
+    Raises:
+        HTTPException 401: Invalid or missing JWT token
+        HTTPException 403: URL user_id doesn't match token user_id
+        HTTPException 503: Database cannot push notifications (not PostgreSQL)
+    """
+    # Verify user authorization
+    _verify_user_access(user_id, authenticated_user_id)
+
+    if not live_events_supported():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live task events require PostgreSQL; poll /tasks/changes instead",
+        )
+
+    async def event_stream():
+        queue = task_events.subscribe(authenticated_user_id)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            task_events.unsubscribe(authenticated_user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{user_id}/tasks/{task_id}", response_model=TaskResponse)
 def get_task(
     user_id: str,
@@ -7,9 +7,10 @@ Demonstrates JWT authentication pattern for protected endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from app.auth import get_current_user
+from app.instrumentation import InstrumentedRoute
 
 
-router = APIRouter(prefix="/api", tags=["user"])
+router = APIRouter(prefix="/api", tags=["user"], route_class=InstrumentedRoute)
 
 
 class UserInfoResponse(BaseModel):
@@ -7,10 +7,18 @@ from app.presentation.schemas.task import (
     TaskCreateRequest,
     TaskUpdateRequest,
     TaskResponse,
+    TaskTombstoneResponse,
+    TaskChangesResponse,
+    DayCountResponse,
+    TaskStatsResponse,
 )
 
 __all__ = [
     "TaskCreateRequest",
     "TaskUpdateRequest",
     "TaskResponse",
+    "TaskTombstoneResponse",
+    "TaskChangesResponse",
+    "DayCountResponse",
+    "TaskStatsResponse",
 ]
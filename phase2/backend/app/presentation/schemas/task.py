@@ -5,8 +5,8 @@ Pydantic models for API request validation and response serialization.
 Maps between API JSON and domain entities.
 """
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -142,3 +142,74 @@ class TaskResponse(BaseModel):
                 "updated_at": "2026-01-03T11:15:00Z",
             }
         }
+
+
+class TaskTombstoneResponse(BaseModel):
+    """
+    Response schema for a deleted task in a delta sync.
+    """
+
+    id: int = Field(
+        ..., description="ID of the deleted task", examples=[41]
+    )
+    deleted_at: datetime = Field(
+        ..., description="Deletion timestamp (ISO 8601)", examples=["2026-01-03T11:20:00Z"]
+    )
+
+
+class TaskChangesResponse(BaseModel):
+    """
+    Response schema for GET /api/{user_id}/tasks/changes.
+
+    Clients apply `deleted` first, then upsert `tasks` by id, and store
+    `next_token` for the next call. When `full_resync` is true, `tasks`
+    is the complete list and replaces the local copy.
+    """
+
+    tasks: List[TaskResponse] = Field(
+        ..., description="Tasks created or modified since the token"
+    )
+    deleted: List[TaskTombstoneResponse] = Field(
+        ..., description="Tasks deleted since the token"
+    )
+    next_token: str = Field(
+        ..., description="Opaque token to pass as `since` on the next sync"
+    )
+    full_resync: bool = Field(
+        ..., description="True when `tasks` is the full list (no token, or token too old)"
+    )
+
+
+class DayCountResponse(BaseModel):
+    """
+    Response schema for one histogram bucket.
+    """
+
+    day: date = Field(
+        ..., description="Day (UTC)", examples=["2026-01-03"]
+    )
+    count: int = Field(
+        ..., description="Tasks in the bucket", examples=[4]
+    )
+
+
+class TaskStatsResponse(BaseModel):
+    """
+    Response schema for GET /api/{user_id}/tasks/stats.
+    """
+
+    total: int = Field(
+        ..., description="Number of tasks", examples=[12]
+    )
+    pending: int = Field(
+        ..., description="Number of pending tasks", examples=[7]
+    )
+    completed: int = Field(
+        ..., description="Number of completed tasks", examples=[5]
+    )
+    completion_rate: float = Field(
+        ..., description="completed / total (0 when there are no tasks)", examples=[0.4167]
+    )
+    created_per_day: List[DayCountResponse] = Field(
+        ..., description="Tasks created per day, oldest day first, zeros included"
+    )
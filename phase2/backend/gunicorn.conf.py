@@ -0,0 +1,13 @@
+"""
+Gunicorn Configuration
+
+Loaded automatically by `gunicorn app.main:app -k uvicorn.workers.UvicornWorker`
+when started from phase2/backend.
+"""
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's Prometheus gauges (PROMETHEUS_MULTIPROC_DIR)."""
+    from app.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
@@ -0,0 +1,13 @@
+"""
+Pytest Configuration
+
+Unit tests run without a database server: DATABASE_URL points at a
+SQLite file in the temp directory, so importing app.database only
+builds engines (nothing is created unless a test connects).
+"""
+
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/todo_unit_tests.db"
+os.environ["DATABASE_SHARDS"] = ""
@@ -0,0 +1,81 @@
+"""
+Integration test for the hash-partitioned tasks table (Alembic revision
+011): every PostgreSQLTaskRepository statement must plan to one
+partition under EXPLAIN.
+
+Needs a scratch PostgreSQL database, which the test migrates:
+
+    TEST_POSTGRES_URL=postgresql://localhost/todo_test pytest tests/integration
+
+Skipped when TEST_POSTGRES_URL is unset or psycopg2 is not installed.
+"""
+
+import importlib
+import os
+from pathlib import Path
+
+import pytest
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+BACKEND = Path(__file__).resolve().parents[2]
+PARTITIONS = 4
+USER_ID = "partition-pruning-test"
+
+
+@pytest.fixture(scope="module")
+def engine():
+    pytest.importorskip("psycopg2")
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, text
+    from app.infrastructure.models import UserDB
+
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as connection:
+        # Better Auth's tables: revision 001 references users, the app user
+        connection.execute(text("CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY)"))
+        UserDB.__table__.create(connection, checkfirst=True)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("DATABASE_URL", POSTGRES_URL)
+        monkeypatch.setenv("TASK_PARTITIONS", str(PARTITIONS))
+        config = Config()
+        config.set_main_option("script_location", str(BACKEND / "alembic"))
+        command.upgrade(config, "head")
+
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO users (id) VALUES (:id) ON CONFLICT DO NOTHING"), {"id": USER_ID}
+        )
+        connection.execute(
+            text(
+                'INSERT INTO "user" (id, email, name) VALUES (:id, :email, :id) '
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"id": USER_ID, "email": f"{USER_ID}@example.com"},
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_tasks_is_hash_partitioned(engine):
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        partitions = connection.execute(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = 'tasks'::regclass")
+        ).scalar()
+
+    assert partitions == PARTITIONS
+
+
+def test_every_repository_statement_reads_one_partition(engine):
+    partition_pruning = importlib.import_module("phase-3.backend.benchmarks.partition_pruning")
+
+    results = partition_pruning.check_pruning(engine, USER_ID)
+
+    assert results
+    assert [r for r in results if not r["pruned"]] == []
@@ -0,0 +1,46 @@
+"""
+Unit tests for the Phase III context window builder
+(phase-3/backend/agent/context.py).
+"""
+
+import importlib
+from types import SimpleNamespace
+
+context = importlib.import_module("phase-3.backend.agent.context")
+ContextBuilder = context.ContextBuilder
+
+# One word plus the turn overhead: 5 tokens per message
+MESSAGE_TOKENS = 5
+
+
+def history(count):
+    return [SimpleNamespace(id=i, role="user", content=f"m{i}") for i in range(1, count + 1)]
+
+
+def builder(messages_that_fit, min_evicted=6):
+    return ContextBuilder(
+        token_budget=messages_that_fit * MESSAGE_TOKENS,
+        summary_reserve=0,
+        min_evicted=min_evicted,
+    )
+
+
+def test_everything_fits():
+    window = builder(10).build(history(8))
+
+    assert [m["id"] for m in window.messages] == list(range(1, 9))
+    assert window.evicted == []
+
+
+def test_too_few_evictions_stay_in_the_window():
+    window = builder(10).build(history(15))
+
+    assert [m["id"] for m in window.messages] == list(range(1, 16))
+    assert window.evicted == []
+
+
+def test_a_full_batch_is_evicted():
+    window = builder(10).build(history(16))
+
+    assert [m.id for m in window.evicted] == list(range(1, 7))
+    assert [m["id"] for m in window.messages] == list(range(7, 17))
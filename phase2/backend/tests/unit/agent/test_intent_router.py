@@ -0,0 +1,76 @@
+"""
+Unit tests for the Phase III fast-path intent router
+(phase-3/backend/agent/intent_router.py): every executed intent gets a
+templated reply, errors included.
+"""
+
+import importlib
+
+import pytest
+
+intent_router = importlib.import_module("phase-3.backend.agent.intent_router")
+IntentRouter = intent_router.IntentRouter
+
+
+@pytest.fixture
+def router():
+    return IntentRouter()
+
+
+class TestMatch:
+    @pytest.mark.parametrize(
+        "message, tool, arguments",
+        [
+            ("show my pending tasks", "list_tasks", {"status": "pending", "compact": True}),
+            ("Please complete task 12.", "complete_task", {"task_id": 12}),
+            ("delete #45", "delete_task", {"task_id": 45}),
+            ("add task buy milk", "add_task", {"title": "Buy milk"}),
+        ],
+    )
+    def test_commands(self, router, message, tool, arguments):
+        intent = router.match(message)
+
+        assert intent.tool == tool
+        assert dict(intent.arguments) == arguments
+
+    @pytest.mark.parametrize("message", ["add task milk and eggs", "what should I do today?"])
+    def test_anything_else_goes_to_the_model(self, router, message):
+        assert router.match(message) is None
+
+
+class TestRender:
+    def test_success(self, router):
+        intent = router.match("delete 7")
+
+        reply = router.render(intent, {"task_id": 7, "status": "deleted", "title": "Milk"})
+
+        assert reply == "Done! I've removed 'Milk' (#7) from your list."
+
+    def test_not_found(self, router):
+        intent = router.match("complete 7")
+
+        reply = router.render(intent, {"error": "not_found", "task_id": 7})
+
+        assert reply.startswith("I couldn't find task #7")
+
+    def test_validation_error_explains_itself(self, router):
+        intent = router.match("add task x")
+        result = {"error": "validation", "message": "Title is too short"}
+
+        assert router.render(intent, result) == "I couldn't add that task: Title is too short."
+
+    @pytest.mark.parametrize(
+        "result",
+        [
+            {"error": "internal", "message": "Failed to delete task", "task_id": 7},
+            {"error": "tool_execution_failed"},
+            {"task_id": 7},
+            None,
+        ],
+    )
+    def test_other_failures_still_get_a_reply(self, router, result):
+        intent = router.match("delete 7")
+
+        reply = router.render(intent, result)
+
+        assert reply == "Sorry, I couldn't delete task #7 just now. Please try again."
@@ -0,0 +1,134 @@
+"""
+Unit tests for Phase III model admission control
+(phase-3/backend/agent/admission.py): the token bucket, Retry-After
+parsing and the retry backoff.
+"""
+
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+admission = importlib.import_module("phase-3.backend.agent.admission")
+TokenBucket = admission.TokenBucket
+retry_after_seconds = admission.retry_after_seconds
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sdk_error(headers=None, code=None):
+    """An exception shaped like a google-genai APIError."""
+    error = Exception("model error")
+    error.code = code
+    error.response = SimpleNamespace(headers=headers) if headers is not None else None
+    return error
+
+
+class TestTokenBucket:
+    def test_burst_is_available_immediately(self):
+        bucket = TokenBucket(rate=2.0, burst=3, clock=FakeClock())
+
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_reservations_past_the_burst_wait_in_arrival_order(self):
+        bucket = TokenBucket(rate=2.0, burst=1, clock=FakeClock())
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits == [0.0, pytest.approx(0.5), pytest.approx(1.0), pytest.approx(1.5)]
+
+    def test_tokens_refill_at_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+
+        clock.now += 0.5
+
+        assert bucket.available == pytest.approx(1.0)
+        assert bucket.reserve() == 0.0
+
+    def test_refill_is_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10.0, burst=2, clock=clock)
+
+        clock.now += 60
+
+        assert bucket.available == pytest.approx(2.0)
+
+    def test_release_returns_a_token_up_to_burst(self):
+        bucket = TokenBucket(rate=1.0, burst=1, clock=FakeClock())
+        bucket.reserve()
+        assert bucket.reserve() == pytest.approx(1.0)
+
+        bucket.release()
+        assert bucket.available == pytest.approx(0.0)
+        bucket.release()
+        bucket.release()
+        assert bucket.available == pytest.approx(1.0)
+
+
+class TestRetryAfter:
+    def test_seconds_header(self):
+        assert retry_after_seconds(sdk_error({"Retry-After": "7"})) == 7.0
+
+    def test_fractional_seconds(self):
+        assert retry_after_seconds(sdk_error({"Retry-After": "0.25"})) == 0.25
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            sdk_error(),
+            sdk_error({}),
+            sdk_error({"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}),
+            sdk_error({"Retry-After": ""}),
+            ValueError("not an SDK error"),
+        ],
+    )
+    def test_missing_or_unparseable_header_is_none(self, error):
+        assert retry_after_seconds(error) is None
+
+    @pytest.mark.parametrize("code", [408, 429, 500, 502, 503, 504])
+    def test_retryable_status_codes(self, code):
+        assert admission.is_retryable(sdk_error(code=code))
+
+    @pytest.mark.parametrize("code", [400, 401, 403, 404])
+    def test_client_errors_are_not_retried(self, code):
+        assert not admission.is_retryable(sdk_error(code=code))
+
+
+class TestBackoff:
+    def make_admission(self):
+        return admission.ModelAdmission(
+            rate_per_second=10.0, burst=10, retry_base_seconds=0.5, retry_max_seconds=8.0
+        )
+
+    def test_backoff_is_at_least_retry_after(self, monkeypatch):
+        monkeypatch.setattr(admission.random, "random", lambda: 0.0)
+
+        delay = self.make_admission()._backoff(0, sdk_error({"Retry-After": "3"}))
+
+        assert delay == 3.0
+
+    def test_retry_after_is_capped_at_retry_max(self, monkeypatch):
+        monkeypatch.setattr(admission.random, "random", lambda: 0.0)
+
+        delay = self.make_admission()._backoff(0, sdk_error({"Retry-After": "120"}))
+
+        assert delay == 8.0
+
+    def test_full_jitter_grows_exponentially_up_to_retry_max(self, monkeypatch):
+        monkeypatch.setattr(admission.random, "random", lambda: 1.0)
+        model_admission = self.make_admission()
+
+        delays = [model_admission._backoff(attempt, sdk_error()) for attempt in range(6)]
+
+        assert delays == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0]
@@ -0,0 +1,32 @@
+"""
+Unit tests for the Phase III response cache key
+(phase-3/backend/agent/response_cache.py): a repeated question hits
+until the tasks or the conversation summary change.
+"""
+
+import importlib
+
+response_cache = importlib.import_module("phase-3.backend.agent.response_cache")
+ResponseCache = response_cache.ResponseCache
+
+VERSION = (3, "2026-10-19T12:00:00")
+
+
+def key(message="What's on my list?", user_id="alice", summary=None, version=VERSION):
+    return ResponseCache.make_key(user_id, message, summary, version)
+
+
+def test_repeated_question_in_a_conversation_hits():
+    cache = ResponseCache()
+    cache.put(key(), "alice", "You have 3 tasks.", [])
+
+    # Other turns in between do not take part in the key
+    assert cache.get(key("  what's on my LIST ")).response == "You have 3 tasks."
+    assert cache.snapshot()["hit_rate"] == 1.0
+
+
+def test_key_changes_with_user_tasks_and_summary():
+    assert key(user_id="bob") != key()
+    assert key(version=(4, "2026-10-19T12:01:00")) != key()
+    assert key(summary="User is planning a trip.") != key()
+    assert key("What's done?") != key()
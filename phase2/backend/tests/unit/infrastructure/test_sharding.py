@@ -0,0 +1,139 @@
+"""
+Unit tests for user-based task sharding (app.infrastructure.sharding):
+consistent-hash placement and placement overrides.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, update
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.infrastructure.models import UserShardPlacementDB
+from app.infrastructure.sharding import PRIMARY_SHARD, HashRing, ShardMap, UserMovingError
+
+USERS = [f"user-{i}" for i in range(5000)]
+
+
+class TestHashRing:
+    def test_placement_is_deterministic(self):
+        first, second = HashRing([0, 1, 2]), HashRing([2, 1, 0, 1])
+
+        assert [first.shard_for(user) for user in USERS] == [
+            second.shard_for(user) for user in USERS
+        ]
+
+    def test_every_user_lands_on_a_ring_shard(self):
+        ring = HashRing([0, 3, 7])
+
+        assert {ring.shard_for(user) for user in USERS} == {0, 3, 7}
+
+    def test_users_are_spread_evenly(self):
+        counts = Counter(HashRing([0, 1, 2, 3]).shard_for(user) for user in USERS)
+
+        # 128 points per shard keep every shard within 25% of its share
+        for shard_id in range(4):
+            assert counts[shard_id] == pytest.approx(len(USERS) / 4, rel=0.25)
+
+    def test_adding_a_shard_only_moves_users_to_it(self):
+        before, after = HashRing([0, 1, 2]), HashRing([0, 1, 2, 3])
+
+        moved = [user for user in USERS if before.shard_for(user) != after.shard_for(user)]
+
+        assert {after.shard_for(user) for user in moved} == {3}
+        assert len(moved) == pytest.approx(len(USERS) / 4, rel=0.25)
+
+    def test_empty_ring_is_rejected(self):
+        with pytest.raises(ValueError):
+            HashRing([])
+
+
+class TestShardMap:
+    @pytest.fixture
+    def engines(self, tmp_path):
+        engines = {
+            shard_id: create_engine(f"sqlite:///{tmp_path}/shard{shard_id}.db")
+            for shard_id in (0, 1, 2)
+        }
+        SQLModel.metadata.create_all(engines[0], tables=[UserShardPlacementDB.__table__])
+        yield engines
+        for engine in engines.values():
+            engine.dispose()
+
+    def add_placement(self, engine, user_id, shard_id, moving=False):
+        with Session(engine) as session:
+            session.add(
+                UserShardPlacementDB(
+                    user_id=user_id,
+                    shard_id=shard_id,
+                    moving=moving,
+                    updated_at=datetime.utcnow(),
+                )
+            )
+            session.commit()
+
+    def test_single_database_is_never_sharded(self):
+        shard_map = ShardMap({0: object()}, [0])
+
+        assert not shard_map.sharded
+        assert shard_map.shard_for("anyone") == PRIMARY_SHARD
+        assert not shard_map.is_moving("anyone")
+
+    def test_ring_must_only_list_configured_shards(self):
+        with pytest.raises(ValueError):
+            ShardMap({0: object(), 1: object()}, [0, 1, 2])
+
+    def test_users_without_placement_follow_the_ring(self, engines):
+        shard_map = ShardMap(engines, [0, 1, 2])
+
+        assert [shard_map.shard_for(user) for user in USERS[:200]] == [
+            shard_map.ring.shard_for(user) for user in USERS[:200]
+        ]
+
+    def test_placement_overrides_the_ring(self, engines):
+        user = next(user for user in USERS if HashRing([0, 1]).shard_for(user) == 0)
+        self.add_placement(engines[0], user, 2)
+
+        shard_map = ShardMap(engines, [0, 1])
+
+        assert shard_map.shard_for(user) == 2
+        assert shard_map.engine_for(user) is engines[2]
+
+    def test_moving_user_cannot_write(self, engines):
+        self.add_placement(engines[0], "user-moving", 1, moving=True)
+        shard_map = ShardMap(engines, [0, 1, 2])
+
+        assert shard_map.is_moving("user-moving")
+        assert shard_map.engine_for("user-moving") is engines[1]
+        with pytest.raises(UserMovingError):
+            shard_map.engine_for("user-moving", for_write=True)
+
+    def test_unchanged_placements_are_not_reloaded(self, engines):
+        self.add_placement(engines[0], "user-pinned", 2)
+        shard_map = ShardMap(engines, [0, 1], refresh_seconds=0)
+        statements = []
+        event.listen(
+            engines[0], "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        for _ in range(3):
+            assert shard_map.shard_for("user-pinned") == 2
+
+        assert len(statements) == 4
+        assert sum("user_shard_placement.user_id" in s for s in statements) == 1
+
+    def test_changed_placements_are_reloaded(self, engines):
+        self.add_placement(engines[0], "user-pinned", 2)
+        shard_map = ShardMap(engines, [0, 1], refresh_seconds=0)
+        assert not shard_map.is_moving("user-pinned")
+
+        # Frozen without touching updated_at: the moving count still changes
+        with Session(engines[0]) as session:
+            session.exec(update(UserShardPlacementDB).values(moving=True))
+            session.commit()
+        assert shard_map.is_moving("user-pinned")
+
+        self.add_placement(engines[0], "user-new", 2)
+        assert shard_map.shard_for("user-new") == 2
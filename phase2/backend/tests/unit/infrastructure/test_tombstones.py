@@ -0,0 +1,72 @@
+"""
+Unit tests for task deletion tombstones: written per user by
+PostgreSQLTaskRepository, purged by app.infrastructure.tombstones.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.domain.entities.task import Task
+from app.infrastructure import tombstones
+from app.infrastructure.models import TaskTombstoneDB, UserDB
+from app.infrastructure.repositories.postgresql_task_repository import (
+    PostgreSQLTaskRepository,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/tasks.db")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for user_id in ("alice", "bob"):
+            session.add(UserDB(id=user_id, email=f"{user_id}@example.com", name=user_id))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def add_and_delete(engine, user_id):
+    with Session(engine) as session:
+        repository = PostgreSQLTaskRepository(session, user_id)
+        task = repository.add(Task(id=0, title="Reused ID"))
+        repository.delete(task.id)
+        return task.id
+
+
+def tombstones_of(engine):
+    with Session(engine) as session:
+        rows = session.exec(select(TaskTombstoneDB.task_id, TaskTombstoneDB.user_id)).all()
+    return sorted(rows)
+
+
+def test_delete_keeps_other_users_tombstone_for_a_reused_id(engine):
+    alice_task = add_and_delete(engine, "alice")
+    # SQLite hands the freed ID to the next insert
+    bob_task = add_and_delete(engine, "bob")
+
+    assert bob_task == alice_task
+    assert tombstones_of(engine) == [(alice_task, "alice"), (alice_task, "bob")]
+
+
+def test_delete_replaces_the_users_own_tombstone(engine):
+    first = add_and_delete(engine, "alice")
+    second = add_and_delete(engine, "alice")
+
+    assert second == first
+    assert tombstones_of(engine) == [(first, "alice")]
+
+
+def test_purge_only_removes_expired_tombstones(engine, monkeypatch):
+    now = datetime.utcnow()
+    expired = now - timedelta(days=40)
+    with Session(engine) as session:
+        session.add(TaskTombstoneDB(task_id=1, user_id="alice", deleted_at=expired))
+        session.add(TaskTombstoneDB(task_id=1, user_id="bob", deleted_at=now))
+        session.commit()
+    monkeypatch.setattr("app.database.shard_map.engines", {0: engine})
+
+    assert tombstones.purge_tombstones(30, now=now) == 1
+    assert tombstones_of(engine) == [(1, "bob")]
@@ -0,0 +1,63 @@
+"""
+Unit tests for the tasks partitioning migration
+(alembic/versions/20261019_1000_partition_tasks.py): partition and
+partition index names, and the INDEXES mapping.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+BACKEND = Path(__file__).resolve().parents[3]
+MIGRATION = BACKEND / "alembic" / "versions" / "20261019_1000_partition_tasks.py"
+
+# PostgreSQL identifiers are truncated past 63 bytes
+MAX_IDENTIFIER = 63
+
+spec = importlib.util.spec_from_file_location("partition_tasks", MIGRATION)
+partition_tasks = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(partition_tasks)
+
+
+class TestNames:
+    def test_partition_name(self):
+        assert partition_tasks.partition_name(0) == "tasks_p0"
+        assert partition_tasks.partition_name(15) == "tasks_p15"
+
+    def test_partition_index_name(self):
+        name = partition_tasks.partition_index_name("idx_tasks_user_created", 3)
+
+        assert name == "idx_tasks_p3_user_created"
+
+    @pytest.mark.parametrize("partitions", [1, 16, 256])
+    def test_partition_index_names_are_unique_and_fit(self, partitions):
+        names = [
+            partition_tasks.partition_index_name(name, remainder)
+            for remainder in range(partitions)
+            for name in partition_tasks.INDEXES
+        ]
+
+        assert len(set(names)) == len(names)
+        assert not set(names) & set(partition_tasks.INDEXES)
+        assert max(len(f"{name}_p") for name in partition_tasks.INDEXES) <= MAX_IDENTIFIER
+        assert max(len(name) for name in names) <= MAX_IDENTIFIER
+
+
+class TestIndexes:
+    def test_indexes_cover_the_migrated_tasks_indexes(self, tmp_path, monkeypatch):
+        url = f"sqlite:///{tmp_path}/migrated.db"
+        monkeypatch.setenv("DATABASE_URL", url)
+        config = Config()
+        config.set_main_option("script_location", str(BACKEND / "alembic"))
+
+        command.upgrade(config, "head")
+
+        engine = create_engine(url)
+        migrated = {index["name"] for index in inspect(engine).get_indexes("tasks")}
+        engine.dispose()
+        # idx_tasks_search (revision 003) is PostgreSQL only
+        assert migrated == set(partition_tasks.INDEXES) - {"idx_tasks_search"}
@@ -0,0 +1,108 @@
+"""
+Unit tests for Phase III chat history hydration
+(phase-3/backend/repositories/message_repository.py): get_history reads
+only the newest messages it needs, live rows first, then archive blocks.
+"""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.infrastructure.models import UserDB
+
+message_repository = importlib.import_module("phase-3.backend.repositories.message_repository")
+codec = importlib.import_module("phase-3.backend.retention.codec")
+ConversationDB = importlib.import_module("phase-3.backend.models.conversation").ConversationDB
+MessageDB = importlib.import_module("phase-3.backend.models.message").MessageDB
+MessageArchiveDB = importlib.import_module(
+    "phase-3.backend.models.message_archive"
+).MessageArchiveDB
+
+START = datetime(2026, 1, 1)
+MESSAGES = 300
+ARCHIVED = 250
+BLOCK = 50
+
+
+def message(message_id):
+    return {
+        "id": message_id,
+        "role": "user" if message_id % 2 else "assistant",
+        "content": f"message {message_id}",
+        "tool_calls": None,
+        "created_at": START + timedelta(minutes=message_id),
+    }
+
+
+@pytest.fixture
+def session(tmp_path):
+    """A conversation with messages 1-250 archived in blocks of 50 and 251-300 live."""
+    engine = create_engine(f"sqlite:///{tmp_path}/chat.db")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(UserDB(id="alice", email="alice@example.com", name="Alice"))
+        session.add(ConversationDB(id=1, user_id="alice", archived_through_id=ARCHIVED))
+        for first in range(1, ARCHIVED + 1, BLOCK):
+            block = [message(i) for i in range(first, first + BLOCK)]
+            payload, raw_bytes = codec.encode_messages(block)
+            session.add(
+                MessageArchiveDB(
+                    conversation_id=1,
+                    user_id="alice",
+                    first_message_id=first,
+                    last_message_id=first + BLOCK - 1,
+                    message_count=BLOCK,
+                    payload=payload,
+                    raw_bytes=raw_bytes,
+                )
+            )
+        for i in range(ARCHIVED + 1, MESSAGES + 1):
+            session.add(MessageDB(conversation_id=1, user_id="alice", **message(i)))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def decoded_blocks(monkeypatch):
+    """Count archive blocks decoded by the repository."""
+    decoded = []
+
+    def decode(payload):
+        messages = codec.decode_messages(payload)
+        decoded.append(messages[0]["id"])
+        return messages
+
+    monkeypatch.setattr(message_repository, "decode_messages", decode)
+    return decoded
+
+
+def history_ids(session, **kwargs):
+    repository = message_repository.MessageRepository(session, "alice")
+    return [m.id for m in repository.get_history(1, archived_through_id=ARCHIVED, **kwargs)]
+
+
+def test_without_limit_everything_is_returned_in_order(session):
+    assert history_ids(session) == list(range(1, MESSAGES + 1))
+
+
+def test_limit_within_live_rows_reads_no_archive(session, decoded_blocks):
+    assert history_ids(session, limit=20) == list(range(281, 301))
+    assert decoded_blocks == []
+
+
+def test_limit_reaches_only_the_newest_archive_blocks(session, decoded_blocks):
+    assert history_ids(session, limit=120) == list(range(181, 301))
+    assert decoded_blocks == [201, 151]
+
+
+def test_after_id_stops_the_archive_read(session, decoded_blocks):
+    assert history_ids(session, after_id=230, limit=200) == list(range(231, 301))
+    assert decoded_blocks == [201]
+
+
+def test_summarized_archive_is_not_read(session, decoded_blocks):
+    assert history_ids(session, after_id=ARCHIVED, limit=200) == list(range(251, 301))
+    assert decoded_blocks == []
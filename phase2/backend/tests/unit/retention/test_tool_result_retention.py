@@ -0,0 +1,124 @@
+"""
+Unit tests for the retention of stored Phase III tool results
+(phase-3/backend/retention/archiver.py): old references are resolved
+by the prune pass and unreferenced results are collected.
+"""
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.infrastructure.models import UserDB
+
+archiver = importlib.import_module("phase-3.backend.retention.archiver")
+tool_results = importlib.import_module("phase-3.backend.repositories.tool_result_repository")
+ConversationDB = importlib.import_module("phase-3.backend.models.conversation").ConversationDB
+MessageDB = importlib.import_module("phase-3.backend.models.message").MessageDB
+ToolResultDB = importlib.import_module("phase-3.backend.models.tool_result").ToolResultDB
+
+NOW = datetime(2026, 10, 19, 12, 0)
+OLD = NOW - timedelta(days=10)
+
+
+def task_list(count, title="Task"):
+    return {"tasks": [{"id": i, "title": f"{title} {i}", "completed": False} for i in range(count)]}
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/chat.db")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(UserDB(id="alice", email="alice@example.com", name="Alice"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def add_turn(session, conversation_id, results, created_at):
+    """Store one assistant message whose tool calls returned results."""
+    tool_calls = tool_results.ToolResultRepository(session, "alice").compact(
+        [{"tool": "list_tasks", "arguments": {}, "result": result} for result in results]
+    )
+    message = MessageDB(
+        conversation_id=conversation_id,
+        user_id="alice",
+        role="assistant",
+        content="Here you go",
+        tool_calls=tool_calls,
+        created_at=created_at,
+    )
+    session.add(message)
+    session.commit()
+    return message.id, [call["result"].get("ref") for call in tool_calls]
+
+
+def stored_refs(session):
+    hashes = session.exec(select(ToolResultDB.content_hash)).all()
+    return {tool_results.REF_PREFIX + content_hash for content_hash in hashes}
+
+
+def age_all_results(session):
+    session.exec(update(ToolResultDB).values(created_at=OLD))
+    session.commit()
+
+
+@pytest.fixture
+def conversation_id(session):
+    conversation = ConversationDB(user_id="alice")
+    session.add(conversation)
+    session.commit()
+    return conversation.id
+
+
+def run(session):
+    return archiver.MessageArchiver(session, archive_after_days=30, prune_after_days=7).run(NOW)
+
+
+def test_old_references_are_resolved_then_collected(session, conversation_id):
+    # Stored in tool_result: one above TOOL_RESULT_MAX_BYTES, one below
+    large, small = task_list(80), task_list(12)
+    message_id, refs = add_turn(session, conversation_id, [large, small], OLD)
+    age_all_results(session)
+
+    report = run(session)
+
+    session.expire_all()
+    calls = session.get(MessageDB, message_id).tool_calls
+    assert calls[0]["result"]["pruned"] is True
+    assert calls[0]["result"]["summary"]["tasks"]["count"] == 80
+    assert calls[1]["result"] == small
+    assert report.results_collected == 2
+    assert not stored_refs(session) & set(refs)
+
+
+def test_recently_referenced_results_are_kept(session, conversation_id):
+    _, (ref,) = add_turn(session, conversation_id, [task_list(40)], NOW)
+    age_all_results(session)
+
+    run(session)
+
+    assert ref in stored_refs(session)
+
+
+def test_recent_unreferenced_results_are_kept(session, conversation_id):
+    _, (ref,) = add_turn(session, conversation_id, [task_list(40)], NOW)
+    session.exec(update(MessageDB).values(tool_calls=None))
+    session.exec(update(ToolResultDB).values(created_at=NOW - timedelta(days=1)))
+    session.commit()
+
+    assert run(session).results_collected == 0
+    assert ref in stored_refs(session)
+
+
+def test_reuse_refreshes_created_at(session, conversation_id):
+    add_turn(session, conversation_id, [task_list(40)], OLD)
+    age_all_results(session)
+
+    add_turn(session, conversation_id, [task_list(40)], NOW)
+
+    (created_at,) = session.exec(select(ToolResultDB.created_at)).all()
+    assert created_at > OLD